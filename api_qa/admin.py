@@ -1,15 +1,154 @@
+from typing import Optional
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.paginator import Paginator
+from django.db import connections
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
 from .models import Answer, Question
+from .search import search
+
+
+def estimated_count(queryset) -> Optional[int]:
+    """
+    Возвращает оценку числа строк таблицы из статистики PostgreSQL.
+
+    ``pg_class.reltuples`` обновляется VACUUM/ANALYZE и читается мгновенно,
+    в отличие от ``COUNT(*)``, который на PostgreSQL сканирует всю таблицу.
+    Для других СУБД и таблиц без собранной статистики возвращает None.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class LargeTablePaginator(Paginator):
+    """
+    Пагинатор changelist без точного ``COUNT(*)`` по большой таблице.
+
+    Без фильтров число строк берется из статистики, если таблица больше
+    QA_ADMIN_ESTIMATE_THRESHOLD. С фильтрами или поиском подсчет
+    ограничивается QA_ADMIN_COUNT_LIMIT строками.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate: Optional[int] = estimated_count(queryset)
+            if (
+                estimate is not None
+                and estimate >= settings.QA_ADMIN_ESTIMATE_THRESHOLD
+            ):
+                return estimate
+            return queryset.count()
+        return queryset.order_by()[: settings.QA_ADMIN_COUNT_LIMIT].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Базовая админка для таблиц с миллионами строк."""
+
+    paginator = LargeTablePaginator
+    # Иначе changelist выполняет еще один COUNT(*) по всей таблице.
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет через полнотекстовый индекс вместо LIKE по всей таблице."""
+        if not search_term:
+            return queryset, False
+        return search(queryset, search_term), False
+
+
+class QuestionIdFilter(admin.SimpleListFilter):
+    """
+    Фильтр ответов по id вопроса с полем ввода.
+
+    Стандартный фильтр по внешнему ключу выводит все вопросы списком;
+    здесь загружается только выбранный вопрос.
+    """
+
+    title = "вопросу"
+    parameter_name = "question"
+    template = "admin/api_qa/input_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.hidden_params = [
+            (name, value)
+            for name, value in request.GET.items()
+            if name not in (self.parameter_name, "p", "e")
+        ]
+
+    def lookups(self, request, model_admin):
+        question_id = self.value()
+        if not question_id or not question_id.isdigit():
+            return []
+        question = Question.objects.filter(pk=question_id).only("id", "text").first()
+        if question is None:
+            return []
+        return [(question_id, f"#{question.id}: {question.text[:40]}")]
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        question_id = self.value()
+        if not question_id:
+            return queryset
+        if not question_id.isdigit():
+            raise IncorrectLookupParameters(f"Некорректный id вопроса: {question_id}")
+        return queryset.filter(question_id=question_id)
+
+
+class CappedAnswerFormSet(BaseInlineFormSet):
+    """Formset inline, выводящий только последние QA_ADMIN_INLINE_ANSWERS ответов."""
+
+    def __init__(self, *args, **kwargs):
+        self._capped_queryset = None
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if self._capped_queryset is None:
+            # Answer.__str__ выводит вопрос: без select_related каждая строка
+            # inline загружала бы его отдельным запросом.
+            self._capped_queryset = (
+                super()
+                .get_queryset()
+                .select_related("question_id")[: settings.QA_ADMIN_INLINE_ANSWERS]
+            )
+        return self._capped_queryset
 
 
 class AnswerInline(admin.TabularInline):
-    """Inline для отображения ответов в админке вопроса."""
+    """
+    Inline для отображения последних ответов в админке вопроса.
+
+    Inline не разбивается на страницы и показывает не больше
+    QA_ADMIN_INLINE_ANSWERS ответов; все ответы вопроса открывает ссылка
+    QuestionAdmin.answers_link на список ответов с фильтром по вопросу.
+    """
 
     model = Answer
+    formset = CappedAnswerFormSet
+    ordering = ["-created_at", "-id"]
     extra = 0
     max_num = 0
-    can_add = False
+    verbose_name_plural = "Последние ответы"
     readonly_fields = ["user_id_short", "text_short", "created_at"]
 
     def user_id_short(self, obj):
@@ -22,17 +161,22 @@ class AnswerInline(admin.TabularInline):
 
     text_short.short_description = "Текст"
 
+    def has_add_permission(self, request, obj=None):
+        return False
+
     def has_change_permission(self, request, obj=None):
         return False
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(LargeTableAdmin):
     """Админка для модели Question."""
 
     list_display = ["id", "text_short", "answers_count", "created_at"]
     list_filter = ["created_at"]
     search_fields = ["text"]
+    sortable_by = ["id", "created_at"]
+    readonly_fields = ["answers_link"]
     inlines = [AnswerInline]
 
     def text_short(self, obj):
@@ -40,19 +184,34 @@ class QuestionAdmin(admin.ModelAdmin):
 
     text_short.short_description = "Текст вопроса"
 
-    def answers_count(self, obj):
-        return obj.answers.count()
+    def answers_link(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse("admin:api_qa_answer_changelist")
+        return format_html(
+            '<a href="{}?{}={}">Все ответы ({})</a>',
+            url,
+            QuestionIdFilter.parameter_name,
+            obj.pk,
+            obj.answers_count,
+        )
 
-    answers_count.short_description = "Ответы"
+    answers_link.short_description = "Ответы"
 
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(LargeTableAdmin):
     """Админка для модели Answer."""
 
     list_display = ["id", "question_id", "user_id_short", "text_short", "created_at"]
-    list_filter = ["created_at", "question_id"]
+    list_filter = ["created_at", QuestionIdFilter]
+    list_select_related = ["question_id"]
+    raw_id_fields = ["question_id"]
     search_fields = ["text"]
+    # Сортировка только по первичному ключу: ORDER BY created_at по всей
+    # таблице ответов требует полной сортировки.
+    ordering = ["-id"]
+    sortable_by = ["id"]
 
     def has_add_permission(self, request):
         return False
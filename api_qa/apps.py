@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.backends.signals import connection_created
 
 
 class ApiQaConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api_qa"
+
+    def ready(self) -> None:
+        from .checks import check_shared_cache
+        from .metrics import install_query_timer
+
+        checks.register(check_shared_cache, checks.Tags.caches)
+
+        connection_created.connect(
+            install_query_timer, dispatch_uid="api_qa.install_query_timer"
+        )
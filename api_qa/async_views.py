@@ -0,0 +1,443 @@
+"""
+Асинхронные версии основных эндпоинтов для запуска под ASGI сервером.
+
+DRF не поддерживает async views, поэтому здесь используются классы Django
+``View`` с async обработчиками и async ORM (``aget``, ``acreate``,
+``acount``, async итерация). Разбор тела запроса, валидация, формат ошибок
+и JSON ответов берутся из DRF и api_qa.fast, поэтому URL и ответы
+совпадают с синхронными views из views.py. Какие views подключаются к
+URL, определяет настройка QA_ASYNC_VIEWS (см. urls.py). Поток новых
+ответов AnswerStreamView есть только в async варианте.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+from django.db.models import Max, QuerySet
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import Serializer
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from . import conditional, events, fast, purge
+from .cache import ainvalidate_question, question_detail_cache, question_list_version
+from .models import Answer, Question
+from .pagination import (
+    AnswerCursorPagination,
+    AsyncPageNumberPagination,
+    KeysetPagination,
+    QuestionCursorPagination,
+    SearchCursorPagination,
+    get_search_query,
+    is_cursor_requested,
+)
+from .search import search
+from .serializers import (
+    AnswerCreateSerializer,
+    AnswerSerializer,
+    QuestionDetailSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+SSE_CONTENT_TYPE: str = "text/event-stream"
+
+
+class AsyncAPIView(View):
+    """
+    Базовый async view с форматом запросов, ответов и ошибок DRF.
+
+    Запрос оборачивается в ``rest_framework.request.Request`` (query_params,
+    data) с парсерами из REST_FRAMEWORK, ответы рендерятся первым
+    рендерером REST_FRAMEWORK (JSON), исключения DRF и Http404
+    превращаются в ответы стандартным exception_handler.
+    """
+
+    @property
+    def parser_classes(self) -> List[type]:
+        return list(api_settings.DEFAULT_PARSER_CLASSES)
+
+    @property
+    def renderer(self) -> JSONRenderer:
+        renderer: JSONRenderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return renderer
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Any:
+        # Как и APIView: аутентификации по сессии здесь нет, CSRF не нужен.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> Awaitable[HttpResponseBase]:
+        # View.dispatch синхронный: для async обработчиков он возвращает
+        # корутину, которую ждет обработчик запросов Django.
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        drf_request: Request = Request(
+            request, parsers=[parser() for parser in self.parser_classes]
+        )
+        drf_request.accepted_renderer = renderer = self.renderer
+        drf_request.accepted_media_type = renderer.media_type
+        try:
+            return await super().dispatch(drf_request, *args, **kwargs)
+        except (APIException, Http404, PermissionDenied) as exc:
+            # Исключения, которые exception_handler DRF превращает в ответ.
+            response = exception_handler(exc, {"view": self, "request": drf_request})
+            rendered: HttpResponse = self.respond(response.data, response.status_code)
+            for header in ("WWW-Authenticate", "Retry-After"):
+                if header in response:
+                    rendered[header] = response[header]
+            return rendered
+
+    def respond(
+        self,
+        data: Any = None,
+        status_code: int = status.HTTP_200_OK,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HttpResponse:
+        """Рендерит данные в JSON так же, как rest_framework.response.Response."""
+
+        renderer: JSONRenderer = self.renderer
+        content: bytes = b"" if data is None else renderer.render(data)
+        return HttpResponse(
+            content,
+            status=status_code,
+            content_type=renderer.media_type,
+            headers=headers,
+        )
+
+    @staticmethod
+    def validate(serializer: Serializer) -> Dict[str, Any]:
+        """Валидирует данные запроса (без обращений к БД) и возвращает их."""
+
+        serializer.is_valid(raise_exception=True)
+        return dict(serializer.validated_data)
+
+
+class QuestionListCreateView(AsyncAPIView):
+    """Async view для получения списка вопросов и создания нового вопроса."""
+
+    async def get(self, request: Request) -> HttpResponseBase:
+        """Возвращает страницу вопросов; пагинация как у синхронного view."""
+
+        current: Optional[conditional.Validators] = conditional.validators(
+            request, await question_list_version.aget()
+        )
+        cached: Optional[HttpResponseBase] = conditional.not_modified(request, current)
+        if cached is not None:
+            return cached
+        queryset: QuerySet = Question.objects.all()
+        paginator: KeysetPagination | AsyncPageNumberPagination
+        query: str = get_search_query(request)
+        if query:
+            queryset = search(queryset, query)
+            paginator = SearchCursorPagination()
+        elif is_cursor_requested(request):
+            paginator = QuestionCursorPagination()
+        else:
+            paginator = AsyncPageNumberPagination()
+
+        rows: QuerySet = queryset.values(
+            *fast.value_fields(fast.QUESTION_LIST_FIELDS, paginator)
+        )
+        page: Optional[List[Dict[str, Any]]] = await paginator.apaginate_queryset(
+            rows, request
+        )
+        response: HttpResponse
+        if page is None:
+            # Пагинация отключена (PAGE_SIZE не задан), как в FastListMixin.
+            response = self.respond(
+                [fast.question_list_item(row) async for row in rows]
+            )
+        else:
+            items: List[Dict[str, Any]] = [fast.question_list_item(row) for row in page]
+            response = self.respond(paginator.get_paginated_response(items).data)
+        conditional.patch_headers(response, current)
+        return response
+
+    async def post(self, request: Request) -> HttpResponse:
+        """Создает новый вопрос."""
+
+        data: Dict[str, Any] = self.validate(
+            QuestionDetailSerializer(data=request.data)
+        )
+        question: Question = await Question.objects.acreate(**data)
+        await question_list_version.abump()
+        logger.info("Created question #%s: %s...", question.id, question.text[:50])
+        row: Dict[str, Any] = {
+            field: getattr(question, field) for field in fast.QUESTION_DETAIL_FIELDS
+        }
+        return self.respond(
+            await fast.aquestion_detail(row, request), status.HTTP_201_CREATED
+        )
+
+
+class QuestionDetailView(AsyncAPIView):
+    """Async view для получения вопроса (с кэшем) и его удаления."""
+
+    async def get(self, request: Request, pk: int) -> HttpResponseBase:
+        """Возвращает вопрос и первые ответы, используя кэш ответов."""
+
+        version: str = await question_detail_cache.aversion(pk)
+        cache_key: str = question_detail_cache.make_key(pk, version, request)
+        cached: Optional[HttpResponse] = await question_detail_cache.aget(cache_key)
+        if cached is not None:
+            cached["X-Cache"] = "HIT"
+            logger.info("Retrieved question #%s from cache", pk)
+            return cached
+
+        row: Dict[str, Any] = await aget_object_or_404(
+            Question.objects.values(*fast.QUESTION_DETAIL_FIELDS), pk=pk
+        )
+        response: HttpResponse = self.respond(
+            await fast.aquestion_detail(row, request), headers={"X-Cache": "MISS"}
+        )
+        logger.info("Retrieved question #%s", pk)
+        await question_detail_cache.aset(cache_key, response)
+        return response
+
+    async def delete(self, request: Request, pk: int) -> HttpResponse:
+        """Удаляет вопрос вместе с ответами (большие вопросы — в фоне, 202)."""
+
+        question: Question = await aget_object_or_404(Question, pk=pk)
+        if purge.is_large(question):
+            purge.schedule(pk)
+            logger.info(
+                "Scheduled purge of question #%s with %s answers",
+                pk,
+                question.answers_count,
+            )
+            return HttpResponse(status=status.HTTP_202_ACCEPTED)
+        await question.adelete()
+        await ainvalidate_question(pk)
+        logger.info("Deleted question #%s with all its answers", pk)
+        return self.respond(status_code=status.HTTP_204_NO_CONTENT)
+
+
+class AnswerCreateView(AsyncAPIView):
+    """Async view для списка ответов на вопрос и создания нового ответа."""
+
+    async def get(self, request: Request, question_id: int) -> HttpResponse:
+        """Возвращает страницу ответов на вопрос в порядке создания."""
+
+        if not await Question.objects.filter(id=question_id).aexists():
+            raise Http404
+        paginator: AnswerCursorPagination = AnswerCursorPagination()
+        rows: QuerySet = Answer.objects.filter(question_id=question_id).values(
+            *fast.value_fields(fast.ANSWER_FIELDS, paginator)
+        )
+        page: List[Dict[str, Any]] = await paginator.apaginate_queryset(rows, request)
+        return self.respond(
+            paginator.get_paginated_response(fast.answer_items(page)).data
+        )
+
+    async def post(self, request: Request, question_id: int) -> HttpResponse:
+        """Создает новый ответ (одной командой при QA_SINGLE_QUERY_WRITES)."""
+
+        if settings.QA_SINGLE_QUERY_WRITES:
+            return await self._create_single_query(request, question_id)
+        question: Question = await aget_object_or_404(Question, id=question_id)
+        data: Dict[str, Any] = self.validate(AnswerCreateSerializer(data=request.data))
+        answer: Answer = await Answer.objects.acreate(
+            question_id=question, user_id=data["user_id"], text=data["text"]
+        )
+        await ainvalidate_question(question.id)
+        await events.apublish(question.id, answer.id)
+
+        logger.info(
+            "User %s created answer #%s for question #%s",
+            answer.user_id,
+            answer.id,
+            question_id,
+        )
+        return self.respond(AnswerSerializer(answer).data, status.HTTP_201_CREATED)
+
+    async def _create_single_query(
+        self, request: Request, question_id: int
+    ) -> HttpResponse:
+        data: Dict[str, Any] = self.validate(AnswerCreateSerializer(data=request.data))
+        try:
+            row: Optional[Dict[str, Any]] = await sync_to_async(
+                Answer.objects.create_for_question
+            )(question_id, data["user_id"], data["text"])
+        except IntegrityError:
+            row = None
+        if row is None:
+            raise Http404
+        await ainvalidate_question(question_id)
+        await events.apublish(question_id, row["id"])
+
+        logger.info(
+            "User %s created answer #%s for question #%s",
+            row["user_id"],
+            row["id"],
+            question_id,
+        )
+        return self.respond(
+            fast.answer_item(row, fast.current_timezone()), status.HTTP_201_CREATED
+        )
+
+
+class AnswerDetailView(AsyncAPIView):
+    """Async view для получения и удаления конкретного ответа."""
+
+    async def get(self, request: Request, pk: int) -> HttpResponse:
+        """Возвращает ответ."""
+
+        row: Dict[str, Any] = await aget_object_or_404(
+            Answer.objects.values(*fast.ANSWER_FIELDS), pk=pk
+        )
+        logger.info("Retrieved answer #%s", row["id"])
+        return self.respond(fast.answer_item(row, fast.current_timezone()))
+
+    async def delete(self, request: Request, pk: int) -> HttpResponse:
+        """Удаляет ответ."""
+
+        answer: Answer = await aget_object_or_404(Answer, pk=pk)
+        await answer.adelete()
+        await ainvalidate_question(answer.question_id_id)
+        logger.info("Deleted answer #%s", pk)
+        return self.respond(status_code=status.HTTP_204_NO_CONTENT)
+
+
+class AnswerStreamView(AsyncAPIView):
+    """
+    Поток server-sent events с новыми ответами на вопрос.
+
+    Под ASGI соединение остается открытым: новые ответы приходят из
+    api_qa.events, при простое раз в QA_STREAM_KEEPALIVE секунд
+    отправляется комментарий, через QA_STREAM_MAX_AGE секунд поток
+    закрывается и клиент переподключается. Первый кадр задает ``retry``
+    и ``id`` последнего ответа, поэтому при переподключении клиент
+    присылает ``Last-Event-ID`` (или ``?last_event_id=``) и получает
+    пропущенные ответы, не больше QA_STREAM_BACKLOG за раз. Под WSGI
+    воркер не держится: отдаются только пропущенные ответы, и клиент
+    опрашивает поток с интервалом ``retry``.
+    """
+
+    async def get(self, request: Request, question_id: int) -> HttpResponseBase:
+        """Открывает поток ответов на вопрос."""
+
+        if not await Question.objects.filter(id=question_id).aexists():
+            raise Http404
+        last_id: Optional[int] = get_last_event_id(request)
+        response: HttpResponseBase
+        # Атрибут scope есть только у ASGIRequest (Request DRF его проксирует).
+        if hasattr(request, "scope"):
+            response = StreamingHttpResponse(
+                self.stream(question_id, last_id), content_type=SSE_CONTENT_TYPE
+            )
+        else:
+            cursor, backlog, _ = await self.backlog(question_id, last_id)
+            response = HttpResponse(
+                b"".join([self.opening(cursor), *(data for _, data in backlog)]),
+                content_type=SSE_CONTENT_TYPE,
+            )
+        response["Cache-Control"] = "no-cache"
+        # nginx не должен буферизовать поток.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(
+        self, question_id: int, last_id: Optional[int]
+    ) -> AsyncIterator[bytes]:
+        # Подписка до чтения пропущенных ответов: ответ, созданный между
+        # ними, придет из подписки, а повтор отсекается по sent.
+        subscription: events.Subscription = events.subscribe(question_id)
+        try:
+            cursor, backlog, complete = await self.backlog(question_id, last_id)
+            yield self.opening(cursor)
+            for _, data in backlog:
+                yield data
+            if not complete:
+                return
+            sent: Set[int] = {answer_id for answer_id, _ in backlog}
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            deadline: float = loop.time() + settings.QA_STREAM_MAX_AGE
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event: Optional[events.Event] = await subscription.get(
+                        min(settings.QA_STREAM_KEEPALIVE, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                answer_id, data = event
+                if answer_id not in sent:
+                    yield data
+        finally:
+            subscription.close()
+
+    @staticmethod
+    async def backlog(
+        question_id: int, last_id: Optional[int]
+    ) -> Tuple[int, List[events.Event], bool]:
+        """
+        Возвращает id для первого кадра, события пропущенных ответов и флаг
+        того, что пропущенные ответы прочитаны полностью.
+
+        Без last_id пропущенных ответов нет, а курсор — последний ответ
+        вопроса. Чтение идет с primary: реплика может еще не содержать
+        ответы, уведомления о которых уже разосланы.
+        """
+
+        answers: QuerySet = Answer.objects.using(DEFAULT_DB_ALIAS).filter(
+            question_id=question_id
+        )
+        if last_id is None:
+            totals: Dict[str, Any] = await answers.aaggregate(last=Max("id"))
+            return totals["last"] or 0, [], True
+        limit: int = settings.QA_STREAM_BACKLOG
+        rows: List[Dict[str, Any]] = [
+            row
+            async for row in answers.filter(id__gt=last_id)
+            .order_by("id")
+            .values(*fast.ANSWER_FIELDS)[:limit]
+        ]
+        tz: Optional[datetime.tzinfo] = fast.current_timezone()
+        backlog: List[events.Event] = [
+            (row["id"], events.frame(fast.answer_item(row, tz))) for row in rows
+        ]
+        cursor: int = rows[-1]["id"] if rows else last_id
+        return cursor, backlog, len(rows) < limit
+
+    @staticmethod
+    def opening(cursor: int) -> bytes:
+        return b"retry: %d\nid: %d\n\n" % (settings.QA_STREAM_RETRY, cursor)
+
+
+def get_last_event_id(request: Request) -> Optional[int]:
+    """Возвращает id последнего полученного клиентом ответа или None."""
+
+    value: str = request.headers.get("Last-Event-ID") or request.query_params.get(
+        "last_event_id", ""
+    )
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return None
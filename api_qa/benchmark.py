@@ -0,0 +1,472 @@
+"""
+Воспроизводимый бенчмарк эндпоинтов API (команда bench_api).
+
+Набор данных заданного размера создается фабриками factory-boy с
+фиксированным seed. Каждый маршрут из api_qa/urls.py прогоняется
+сценарием (SCENARIOS): внутри процесса через django.test.Client или
+через локальный HTTP сервер (ThreadedWSGIServer в потоке). По каждому
+сценарию считаются перцентили задержки, запросы в секунду и число SQL
+запросов на запрос (из заголовка X-Query-Count). Результаты — JSON,
+два результата сравниваются функцией compare.
+"""
+
+import http.client
+import itertools
+import json
+import platform
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.settings import api_settings
+
+from .models import Answer, Question
+
+#: Префикс текста вопросов бенчмарка: по нему данные удаляются после замеров.
+PREFIX: str = "[bench] "
+HOST: str = "127.0.0.1"
+ADMIN_USERNAME: str = "bench_api_admin"
+
+
+@dataclass
+class Dataset:
+    """Созданные для бенчмарка объекты."""
+
+    questions: List[int]
+    answers: List[int]
+    word: str
+    users: List[str] = field(default_factory=list)
+    # Отдельные объекты для DELETE: каждый удаляется одним запросом.
+    doomed_questions: List[int] = field(default_factory=list)
+    doomed_answers: List[int] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    """
+    Сценарий нагрузки на один маршрут.
+
+    ``path`` и ``body`` получают набор данных и номер запроса, ``auth`` —
+    нужен ли запросу вход администратора.
+    """
+
+    name: str
+    route: str
+    method: str
+    path: Callable[[Dataset, int], str]
+    body: Optional[Callable[[Dataset, int], Any]] = None
+    auth: bool = False
+
+
+def _question(data: Dataset, index: int) -> int:
+    return data.questions[index % len(data.questions)]
+
+
+def _page(data: Dataset, index: int) -> int:
+    pages: int = max(1, min(10, len(data.questions) // api_settings.PAGE_SIZE))
+    return index % pages + 1
+
+
+def _bulk_items(data: Dataset, index: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "question_id": _question(data, index + offset),
+            "user_id": "00000000-0000-4000-8000-000000000001",
+            "text": f"Bulk answer {offset}",
+        }
+        for offset in range(10)
+    ]
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "question-list",
+        "question-list",
+        "GET",
+        lambda data, i: reverse("question-list") + f"?page={_page(data, i)}",
+    ),
+    Scenario(
+        "question-list:cursor",
+        "question-list",
+        "GET",
+        lambda data, i: reverse("question-list") + "?pagination=cursor",
+    ),
+    Scenario(
+        "question-list:search",
+        "question-list",
+        "GET",
+        lambda data, i: reverse("question-list") + f"?q={data.word}",
+    ),
+    Scenario(
+        "question-trending",
+        "question-trending",
+        "GET",
+        lambda data, i: reverse("question-trending"),
+    ),
+    Scenario(
+        "question-create",
+        "question-list",
+        "POST",
+        lambda data, i: reverse("question-list"),
+        lambda data, i: {"text": f"{PREFIX}question {i}"},
+    ),
+    Scenario(
+        "question-detail",
+        "question-detail",
+        "GET",
+        lambda data, i: reverse("question-detail", args=[_question(data, i)]),
+    ),
+    Scenario(
+        "question-delete",
+        "question-detail",
+        "DELETE",
+        lambda data, i: reverse("question-detail", args=[data.doomed_questions[i]]),
+    ),
+    Scenario(
+        "answer-list",
+        "answer-create",
+        "GET",
+        lambda data, i: reverse("answer-create", args=[_question(data, i)]),
+    ),
+    Scenario(
+        "answer-create",
+        "answer-create",
+        "POST",
+        lambda data, i: reverse("answer-create", args=[_question(data, i)]),
+        lambda data, i: {
+            "user_id": "00000000-0000-4000-8000-000000000001",
+            "text": f"Answer {i}",
+        },
+    ),
+    Scenario(
+        "answer-stream:catchup",
+        "answer-stream",
+        "GET",
+        lambda data, i: reverse("answer-stream", args=[_question(data, i)])
+        + "?last_event_id=0",
+    ),
+    Scenario(
+        "answer-bulk-create",
+        "answer-bulk-create",
+        "POST",
+        lambda data, i: reverse("answer-bulk-create", args=[_question(data, i)]),
+        lambda data, i: [
+            {key: value for key, value in item.items() if key != "question_id"}
+            for item in _bulk_items(data, i)
+        ],
+    ),
+    Scenario(
+        "answer-bulk-create-any",
+        "answer-bulk-create-any",
+        "POST",
+        lambda data, i: reverse("answer-bulk-create-any"),
+        _bulk_items,
+    ),
+    Scenario(
+        "answer-search",
+        "answer-search",
+        "GET",
+        lambda data, i: reverse("answer-search") + f"?q={data.word}",
+    ),
+    Scenario(
+        "user-answers",
+        "user-answers",
+        "GET",
+        lambda data, i: reverse("user-answers", args=[data.users[i % len(data.users)]]),
+    ),
+    Scenario(
+        "question-export",
+        "question-export",
+        "GET",
+        lambda data, i: reverse("question-export"),
+        auth=True,
+    ),
+    Scenario(
+        "answer-detail",
+        "answer-detail",
+        "GET",
+        lambda data, i: reverse(
+            "answer-detail", args=[data.answers[i % len(data.answers)]]
+        ),
+    ),
+    Scenario(
+        "answer-delete",
+        "answer-detail",
+        "DELETE",
+        lambda data, i: reverse("answer-detail", args=[data.doomed_answers[i]]),
+    ),
+    Scenario("health", "health", "GET", lambda data, i: reverse("health")),
+    Scenario("ready", "ready", "GET", lambda data, i: reverse("ready")),
+    Scenario("metrics", "metrics", "GET", lambda data, i: reverse("metrics")),
+    Scenario(
+        "db-pool", "db-pool", "GET", lambda data, i: reverse("db-pool"), auth=True
+    ),
+]
+
+
+def _batches(objects: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while batch := list(itertools.islice(objects, size)):
+        yield batch
+
+
+def seed(
+    factories: ModuleType,
+    questions: int,
+    answers: int,
+    doomed: int,
+    seed_value: int,
+) -> Dataset:
+    """
+    Создает ``questions`` вопросов по ``answers`` ответов и объекты для DELETE.
+
+    Для DELETE создаются ``doomed`` вопросов (с ответами) и ``doomed``
+    ответов к основным вопросам. Объекты строятся фабриками модуля
+    ``factories`` (api_qa.tests.factories, factory-boy — dev зависимость)
+    и сохраняются пакетами по 1000 строк.
+    """
+
+    def build_questions() -> Iterator[Question]:
+        for _ in range(questions + doomed):
+            question: Question = factories.QuestionFactory.build()
+            question.text = PREFIX + question.text
+            yield question
+
+    def build_answers() -> Iterator[Answer]:
+        for question in created[:questions]:
+            yield from factories.AnswerFactory.build_batch(
+                answers, question_id=question
+            )
+        for index in range(doomed):
+            yield factories.AnswerFactory.build(question_id=created[index % questions])
+        for question in created[questions:]:
+            yield from factories.AnswerFactory.build_batch(
+                answers, question_id=question
+            )
+
+    factories.reseed(seed_value)
+    created: List[Question] = []
+    for batch in _batches(build_questions(), 1000):
+        created.extend(Question.objects.bulk_create(batch))
+    answer_ids: List[int] = []
+    users: List[str] = []
+    for batch in _batches(build_answers(), 1000):
+        for answer in Answer.objects.bulk_create(batch):
+            answer_ids.append(answer.id)
+            users.append(str(answer.user_id))
+
+    main: int = questions * answers
+    return Dataset(
+        questions=[question.id for question in created[:questions]],
+        answers=answer_ids[:main],
+        word=created[0].text[len(PREFIX) :].split()[0].strip(".?").lower(),
+        users=users[:main],
+        doomed_questions=[question.id for question in created[questions:]],
+        doomed_answers=answer_ids[main : main + doomed],
+    )
+
+
+def cleanup() -> None:
+    """Удаляет данные бенчмарка (вопросы с PREFIX, ответы каскадно)."""
+
+    Question.objects.filter(text__startswith=PREFIX).delete()
+    get_user_model().objects.filter(username=ADMIN_USERNAME).delete()
+
+
+#: Результат одного запроса: статус, секунды, число SQL запросов.
+Sample = Tuple[int, float, Optional[int]]
+
+
+class InProcessDriver:
+    """Запросы через django.test.Client без сети."""
+
+    def __init__(self, session: str) -> None:
+        self.session: str = session
+
+    def __call__(self, scenario: Scenario, path: str, body: Any) -> Sample:
+        client: Client = Client(HTTP_HOST=HOST)
+        if scenario.auth:
+            client.cookies[settings.SESSION_COOKIE_NAME] = self.session
+        started: float = time.perf_counter()
+        response = client.generic(
+            scenario.method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+        )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        elapsed: float = time.perf_counter() - started
+        count: Optional[str] = response.get("X-Query-Count")
+        return response.status_code, elapsed, int(count) if count else None
+
+
+class HttpDriver:
+    """Запросы по HTTP к локальному серверу в этом же процессе."""
+
+    def __init__(self, session: str) -> None:
+        self.session: str = session
+        self.server: ThreadedWSGIServer = ThreadedWSGIServer(
+            (HOST, 0), QuietHandler, allow_reuse_address=False
+        )
+        self.server.set_app(WSGIHandler())
+        self.thread: threading.Thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __call__(self, scenario: Scenario, path: str, body: Any) -> Sample:
+        headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if scenario.auth:
+            headers["Cookie"] = f"{settings.SESSION_COOKIE_NAME}={self.session}"
+        payload: Optional[bytes] = json.dumps(body).encode() if body else None
+        port: int = self.server.server_address[1]
+        started: float = time.perf_counter()
+        client: http.client.HTTPConnection = http.client.HTTPConnection(HOST, port)
+        try:
+            client.request(scenario.method, path, payload, headers)
+            response: http.client.HTTPResponse = client.getresponse()
+            response.read()
+        finally:
+            client.close()
+        elapsed: float = time.perf_counter() - started
+        count: Optional[str] = response.getheader("X-Query-Count")
+        return response.status, elapsed, int(count) if count else None
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Обработчик запросов сервера без вывода каждого запроса в консоль."""
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+def admin_session() -> str:
+    """Создает администратора бенчмарка и возвращает ключ его сессии."""
+
+    admin: Any = get_user_model().objects.create_superuser(ADMIN_USERNAME, "", None)
+    client: Client = Client()
+    client.force_login(admin)
+    session: str = client.cookies[settings.SESSION_COOKIE_NAME].value
+    return session
+
+
+def run_scenario(
+    driver: Callable[[Scenario, str, Any], Sample],
+    scenario: Scenario,
+    data: Dataset,
+    numbers: range,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Выполняет запросы сценария с номерами ``numbers`` и возвращает статистику.
+
+    Номер запроса выбирает объект набора данных, поэтому прогревочные и
+    замеряемые запросы получают разные номера (DELETE удаляет объект).
+    """
+
+    def call(number: int) -> Sample:
+        body: Any = scenario.body(data, number) if scenario.body else None
+        return driver(scenario, scenario.path(data, number), body)
+
+    samples: List[Sample]
+    requests: int = len(numbers)
+    started: float = time.perf_counter()
+    if concurrency == 1:
+        # Один клиент — в текущем потоке, с тем же соединением с БД.
+        samples = [call(number) for number in numbers]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(call, numbers))
+    elapsed: float = time.perf_counter() - started
+
+    latencies: List[float] = [sample[1] * 1000 for sample in samples]
+    queries: List[int] = [sample[2] for sample in samples if sample[2] is not None]
+    return {
+        "route": scenario.route,
+        "method": scenario.method,
+        "requests": requests,
+        "errors": sum(1 for sample in samples if sample[0] >= 400),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "queries": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def environment() -> Dict[str, Any]:
+    """Описание окружения, в котором получен результат."""
+
+    return {
+        "time": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "cache": settings.CACHES["default"]["BACKEND"],
+        "async_views": settings.QA_ASYNC_VIEWS,
+        "fast_serialization": settings.QA_FAST_SERIALIZATION,
+    }
+
+
+#: Результат сравнения одного сценария: режим, сценарий, метрика, было, стало.
+Regression = Tuple[str, str, str, float, float]
+
+
+def compare(
+    base: Dict[str, Any], new: Dict[str, Any], threshold: float
+) -> Tuple[List[Tuple[str, str, Dict[str, Any], Dict[str, Any]]], List[Regression]]:
+    """
+    Сравнивает два результата bench_api.
+
+    Регрессия — рост p95 или падение rps больше чем на ``threshold``
+    процентов либо любой рост числа SQL запросов. Возвращает пары
+    результатов сценариев, которые есть в обоих запусках, и регрессии.
+    """
+
+    pairs: List[Tuple[str, str, Dict[str, Any], Dict[str, Any]]] = []
+    regressions: List[Regression] = []
+    limit: float = threshold / 100
+    for mode, scenarios in new["results"].items():
+        for name, after in scenarios.items():
+            before: Optional[Dict[str, Any]] = base["results"].get(mode, {}).get(name)
+            if before is None:
+                continue
+            pairs.append((mode, name, before, after))
+            if after["p95_ms"] > before["p95_ms"] * (1 + limit):
+                regressions.append(
+                    (mode, name, "p95_ms", before["p95_ms"], after["p95_ms"])
+                )
+            if after["rps"] < before["rps"] * (1 - limit):
+                regressions.append((mode, name, "rps", before["rps"], after["rps"]))
+            if (
+                before["queries"] is not None
+                and after["queries"] is not None
+                and after["queries"] > before["queries"]
+            ):
+                regressions.append(
+                    (mode, name, "queries", before["queries"], after["queries"])
+                )
+    return pairs, regressions
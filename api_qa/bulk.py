@@ -0,0 +1,301 @@
+"""
+Потоковая запись больших объемов вопросов и ответов.
+
+На PostgreSQL строки пачки передаются через ``COPY FROM STDIN`` (psycopg 3)
+во временную таблицу, откуда переносятся одним ``INSERT ... SELECT``. На
+остальных бэкендах используется ``executemany`` по пачкам. Оба варианта
+записывают поле created_at как есть, в отличие от bulk_create, где
+``auto_now_add`` перезаписывает переданное значение.
+"""
+
+import datetime
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Sequence, Set
+
+from django.core.management.color import no_style
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils import timezone
+
+from . import trending
+from .models import Answer, Question
+
+QuestionRow = Dict[str, Any]
+AnswerRow = Dict[str, Any]
+
+
+class BulkWriter:
+    """Построчная вставка пачками через executemany (любой бэкенд)."""
+
+    def __init__(self, using: str = "default") -> None:
+        self.using: str = using
+        self.connection: BaseDatabaseWrapper = connections[using]
+
+    def write_questions(self, rows: Sequence[QuestionRow]) -> int:
+        """
+        Вставляет вопросы и возвращает число вставленных строк.
+
+        Вопросы с уже существующим id пропускаются, поэтому повторный
+        импорт того же файла не создает дублей.
+        """
+
+        now: datetime.datetime = timezone.now()
+        with_id: List[Sequence[Any]] = []
+        without_id: List[Sequence[Any]] = []
+        for row in rows:
+            values: List[Any] = [
+                self._prep(Question, "text", row["text"]),
+                self._prep(Question, "created_at", row.get("created_at") or now),
+            ]
+            if row.get("id") is not None:
+                with_id.append([row["id"], *values])
+            else:
+                without_id.append(values)
+
+        table: str = self._table(Question)
+        inserted: int = 0
+        with self.connection.cursor() as cursor:
+            if with_id:
+                cursor.executemany(
+                    f"INSERT INTO {table} (id, text, created_at, answers_count) "
+                    "VALUES (%s, %s, %s, 0) ON CONFLICT (id) DO NOTHING",
+                    with_id,
+                )
+                # Для executemany rowcount — суммарное число вставленных строк.
+                inserted += max(cursor.rowcount, 0)
+            if without_id:
+                cursor.executemany(
+                    f"INSERT INTO {table} (text, created_at, answers_count) "
+                    "VALUES (%s, %s, 0)",
+                    without_id,
+                )
+                inserted += len(without_id)
+        return inserted
+
+    def write_answers(self, rows: Sequence[AnswerRow]) -> int:
+        """
+        Вставляет ответы и возвращает число вставленных строк.
+
+        Ответы на несуществующие вопросы отбрасываются; существование
+        вопросов пачки проверяется одним запросом. Счетчики answers_count
+        вопросов увеличиваются в той же транзакции.
+        """
+
+        existing: Set[int] = self._existing(rows)
+        now: datetime.datetime = timezone.now()
+        params: List[Sequence[Any]] = [
+            [
+                row["question_id"],
+                self._prep(Answer, "user_id", row["user_id"]),
+                self._prep(Answer, "text", row["text"]),
+                self._prep(Answer, "created_at", row.get("created_at") or now),
+            ]
+            for row in rows
+            if row["question_id"] in existing
+        ]
+        if params:
+            with self.connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {self._table(Answer)} "
+                    f"({self._question_column()}, user_id, text, created_at) "
+                    "VALUES (%s, %s, %s, %s)",
+                    params,
+                )
+            Question.objects.using(self.using).add_answers(
+                Counter(values[0] for values in params)
+            )
+            self._add_trending(rows, existing, now)
+        return len(params)
+
+    def reset_sequences(self) -> None:
+        """Сдвигает последовательности id после вставки явных id."""
+
+        statements: List[str] = self.connection.ops.sequence_reset_sql(
+            no_style(), [Question, Answer]
+        )
+        if statements:
+            with self.connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _existing(self, rows: Sequence[AnswerRow]) -> Set[int]:
+        referenced: Set[int] = {row["question_id"] for row in rows}
+        return set(
+            Question.objects.using(self.using)
+            .filter(id__in=referenced)
+            .order_by()
+            .values_list("id", flat=True)
+        )
+
+    def _add_trending(
+        self, rows: Sequence[AnswerRow], existing: Set[int], now: datetime.datetime
+    ) -> None:
+        created: Dict[int, List[datetime.datetime]] = defaultdict(list)
+        for row in rows:
+            if row["question_id"] in existing:
+                created[row["question_id"]].append(row.get("created_at") or now)
+        trending.add(created, self.using)
+
+    def _prep(self, model: Any, name: str, value: Any) -> Any:
+        return model._meta.get_field(name).get_db_prep_save(value, self.connection)
+
+    def _table(self, model: Any) -> str:
+        table: str = self.connection.ops.quote_name(model._meta.db_table)
+        return table
+
+    def _question_column(self) -> str:
+        column: str = self.connection.ops.quote_name(
+            Answer._meta.get_field("question_id").column
+        )
+        return column
+
+
+class PostgresCopyWriter(BulkWriter):
+    """Вставка пачками через COPY FROM STDIN во временные таблицы."""
+
+    question_stage: ClassVar[str] = "qa_stage_question"
+    answer_stage: ClassVar[str] = "qa_stage_answer"
+
+    def __init__(self, using: str = "default") -> None:
+        super().__init__(using)
+        self._staged: bool = False
+
+    def write_questions(self, rows: Sequence[QuestionRow]) -> int:
+        self._ensure_stage()
+        table: str = self._table(Question)
+        with self.connection.cursor() as cursor:
+            with cursor.copy(
+                f"COPY {self.question_stage} (id, text, created_at) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row((row.get("id"), row["text"], row.get("created_at")))
+            cursor.execute(
+                f"INSERT INTO {table} (id, text, created_at, answers_count) "
+                "SELECT COALESCE(s.id, nextval(pg_get_serial_sequence(%s, 'id'))), "
+                "s.text, COALESCE(s.created_at, now()), 0 "
+                f"FROM {self.question_stage} s ON CONFLICT (id) DO NOTHING",
+                [Question._meta.db_table],
+            )
+            inserted: int = cursor.rowcount
+            cursor.execute(f"TRUNCATE {self.question_stage}")
+        return inserted
+
+    def write_answers(self, rows: Sequence[AnswerRow]) -> int:
+        self._ensure_stage()
+        now: datetime.datetime = timezone.now()
+        with self.connection.cursor() as cursor:
+            with cursor.copy(
+                f"COPY {self.answer_stage} (question_id, user_id, text, created_at) "
+                "FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row(
+                        (
+                            row["question_id"],
+                            row["user_id"],
+                            row["text"],
+                            row.get("created_at"),
+                        )
+                    )
+            # Ссылки на вопросы разрешаются соединением, а не построчно.
+            cursor.execute(
+                f"INSERT INTO {self._table(Answer)} "
+                f"({self._question_column()}, user_id, text, created_at) "
+                "SELECT s.question_id, s.user_id, s.text, "
+                "COALESCE(s.created_at, now()) "
+                f"FROM {self.answer_stage} s "
+                f"JOIN {self._table(Question)} q ON q.id = s.question_id",
+            )
+            inserted: int = cursor.rowcount
+            cursor.execute(
+                f"UPDATE {self._table(Question)} q "
+                "SET answers_count = q.answers_count + s.total "
+                "FROM (SELECT question_id, COUNT(*) AS total "
+                f"FROM {self.answer_stage} GROUP BY question_id) s "
+                "WHERE q.id = s.question_id"
+            )
+            cursor.execute(f"TRUNCATE {self.answer_stage}")
+        # Счета trending суммируются в Python (log-sum-exp по пачке) для
+        # ответов на существующие вопросы, как и при вставке выше.
+        self._add_trending(rows, self._existing(rows), now)
+        return inserted
+
+    def _ensure_stage(self) -> None:
+        if self._staged:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self.question_stage} "
+                "(id bigint, text text NOT NULL, created_at timestamptz)"
+            )
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self.answer_stage} "
+                "(question_id bigint NOT NULL, user_id uuid NOT NULL, "
+                "text text NOT NULL, created_at timestamptz)"
+            )
+        self._staged = True
+
+
+def get_writer(using: str = "default") -> BulkWriter:
+    """Возвращает самый быстрый писатель для бэкенда базы данных."""
+
+    if connections[using].vendor == "postgresql":
+        return PostgresCopyWriter(using)
+    return BulkWriter(using)
+
+
+def parse_question(record: Dict[str, Any]) -> QuestionRow:
+    """Проверяет и нормализует запись вопроса из файла импорта."""
+
+    text: str = str(record.get("text") or "").strip()
+    if not text:
+        raise ValueError("пустой текст вопроса")
+    raw_id: Any = record.get("id")
+    return {
+        "id": int(raw_id) if raw_id not in (None, "") else None,
+        "text": text,
+        "created_at": _parse_datetime(record.get("created_at")),
+    }
+
+
+def parse_answer(record: Dict[str, Any]) -> AnswerRow:
+    """Проверяет и нормализует запись ответа из файла импорта."""
+
+    text: str = str(record.get("text") or "").strip()
+    if not text:
+        raise ValueError("пустой текст ответа")
+    question_id: Any = record.get("question_id")
+    if question_id in (None, ""):
+        raise ValueError("не указан question_id")
+    return {
+        "question_id": int(question_id),
+        "user_id": uuid.UUID(str(record.get("user_id"))),
+        "text": text,
+        "created_at": _parse_datetime(record.get("created_at")),
+    }
+
+
+def _parse_datetime(value: Any) -> Optional[datetime.datetime]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime.datetime):
+        parsed: datetime.datetime = value
+    else:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+    return parsed
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    """Разбивает поток на списки не длиннее size."""
+
+    chunk: List[Any] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,245 @@
+import hashlib
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.http import HttpResponse
+from rest_framework.request import Request
+
+from . import routers
+
+
+class VersionedResponseCache:
+    """
+    Кэш отрендеренных ответов с версией на каждый объект.
+
+    Ключ ответа строится из id объекта и его текущей версии, поэтому
+    инвалидация сводится к замене версии (bump): старые записи больше не
+    читаются и вытесняются бэкендом по таймауту. Версия — случайный токен,
+    а не счетчик: если ключ версии будет вытеснен из кэша, новая версия
+    не совпадет ни с одной из старых и устаревший ответ не вернется.
+
+    Бэкенд задается алиасом QA_CACHE_ALIAS из settings.CACHES: в тестах
+    это LocMemCache, в production — любой общий кэш (Redis, Memcached).
+    Счетчики попаданий и промахов считаются в пределах процесса.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace: str = namespace
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.QA_CACHE_ALIAS]
+
+    def _version_key(self, object_id: int) -> str:
+        return f"qa:{self.namespace}:{object_id}:version"
+
+    def version(self, object_id: int) -> str:
+        """Возвращает текущую версию объекта, создавая ее при отсутствии."""
+
+        key: str = self._version_key(object_id)
+        version: Optional[str] = self.cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.cache.add(key, version, timeout=None):
+                # Версию успел создать параллельный запрос.
+                version = self.cache.get(key, version)
+        return version
+
+    def bump(self, object_id: int) -> None:
+        """Инвалидирует все закэшированные ответы объекта."""
+
+        self.cache.set(self._version_key(object_id), uuid.uuid4().hex, timeout=None)
+
+    async def aversion(self, object_id: int) -> str:
+        """Асинхронный вариант version()."""
+
+        key: str = self._version_key(object_id)
+        version: Optional[str] = await self.cache.aget(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not await self.cache.aadd(key, version, timeout=None):
+                version = await self.cache.aget(key, version)
+        return version
+
+    async def abump(self, object_id: int) -> None:
+        """Асинхронный вариант bump()."""
+
+        await self.cache.aset(
+            self._version_key(object_id), uuid.uuid4().hex, timeout=None
+        )
+
+    def make_key(self, object_id: int, version: str, request: Request) -> str:
+        """
+        Строит ключ ответа.
+
+        Помимо версии учитываются формат ответа и адрес хоста, так как
+        в ответ входят абсолютные ссылки (например, answers_next).
+        """
+
+        variant: str = "|".join(
+            [
+                request.accepted_renderer.format,
+                request.scheme or "",
+                request.get_host(),
+            ]
+        )
+        digest: str = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:16]
+        return f"qa:{self.namespace}:{object_id}:{version}:{digest}"
+
+    def get(self, key: str) -> Optional[HttpResponse]:
+        """Возвращает закэшированный ответ или None."""
+
+        return self._response(self.cache.get(key))
+
+    async def aget(self, key: str) -> Optional[HttpResponse]:
+        """Асинхронный вариант get()."""
+
+        return self._response(await self.cache.aget(key))
+
+    def _response(self, entry: Optional[Tuple[bytes, str]]) -> Optional[HttpResponse]:
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        content, content_type = entry
+        return HttpResponse(content, content_type=content_type)
+
+    def timeout(self) -> int:
+        """
+        Время жизни нового ответа в кэше.
+
+        Ответ, прочитанный с реплики, мог быть построен по данным до
+        последней записи (версия уже сменилась, а реплика отстает),
+        поэтому он хранится не дольше QA_DB_REPLICA_CACHE_TIMEOUT.
+        """
+
+        timeout: int = settings.QA_DETAIL_CACHE_TIMEOUT
+        if routers.is_pinned():
+            return timeout
+        replica_timeout: int = settings.QA_DB_REPLICA_CACHE_TIMEOUT
+        return min(timeout, replica_timeout)
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        """Сохраняет отрендеренное тело ответа."""
+
+        self.cache.set(
+            key,
+            (response.content, response["Content-Type"]),
+            timeout=self.timeout(),
+        )
+
+    async def aset(self, key: str, response: HttpResponse) -> None:
+        """Асинхронный вариант set()."""
+
+        await self.cache.aset(
+            key,
+            (response.content, response["Content-Type"]),
+            timeout=self.timeout(),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий и промахов текущего процесса."""
+
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+question_detail_cache: VersionedResponseCache = VersionedResponseCache(
+    "question-detail"
+)
+
+
+class DatasetVersion:
+    """
+    Версия набора объектов (например, списка вопросов) с временем изменения.
+
+    Хранит пару (токен, unix-время последнего изменения). Токен
+    случайный по той же причине, что и в VersionedResponseCache: после
+    вытеснения ключа новая версия не совпадет со старыми. Время служит
+    значением Last-Modified; при вытеснении оно становится текущим, что
+    лишь приводит к лишней полной выдаче ответа. Версия живет
+    QA_DETAIL_CACHE_TIMEOUT секунд: записи в обход API (импорт, админка)
+    ее не меняют, и так устаревание ограничено тем же сроком, что и у
+    кэша ответов.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.key: str = f"qa:{namespace}:stamp"
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.QA_CACHE_ALIAS]
+
+    @staticmethod
+    def timeout() -> int:
+        timeout: int = settings.QA_DETAIL_CACHE_TIMEOUT
+        return timeout
+
+    @staticmethod
+    def _new() -> Tuple[str, float]:
+        return uuid.uuid4().hex, time.time()
+
+    def get(self) -> Tuple[str, float]:
+        """Возвращает текущую версию, создавая ее при отсутствии."""
+
+        stamp: Optional[Tuple[str, float]] = self.cache.get(self.key)
+        if stamp is None:
+            stamp = self._new()
+            if not self.cache.add(self.key, stamp, timeout=self.timeout()):
+                stamp = self.cache.get(self.key, stamp)
+        return stamp
+
+    def bump(self) -> None:
+        """Отмечает изменение набора."""
+
+        self.cache.set(self.key, self._new(), timeout=self.timeout())
+
+    async def aget(self) -> Tuple[str, float]:
+        """Асинхронный вариант get()."""
+
+        stamp: Optional[Tuple[str, float]] = await self.cache.aget(self.key)
+        if stamp is None:
+            stamp = self._new()
+            if not await self.cache.aadd(self.key, stamp, timeout=self.timeout()):
+                stamp = await self.cache.aget(self.key, stamp)
+        return stamp
+
+    async def abump(self) -> None:
+        """Асинхронный вариант bump()."""
+
+        await self.cache.aset(self.key, self._new(), timeout=self.timeout())
+
+
+question_list_version: DatasetVersion = DatasetVersion("question-list")
+
+
+def invalidate_question(question_id: int) -> None:
+    """
+    Инвалидирует кэш вопроса и версию списка вопросов.
+
+    Список содержит answers_count, поэтому меняется при любой записи
+    ответа, а не только при создании и удалении вопросов.
+    """
+
+    question_detail_cache.bump(question_id)
+    question_list_version.bump()
+
+
+async def ainvalidate_question(question_id: int) -> None:
+    """Асинхронный вариант invalidate_question()."""
+
+    await question_detail_cache.abump(question_id)
+    await question_list_version.abump()
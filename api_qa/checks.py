@@ -0,0 +1,37 @@
+"""
+Системные проверки Django для настроек api_qa.
+"""
+
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Error
+
+#: Бэкенды кэша, данные которых видит только один процесс.
+PROCESS_LOCAL_CACHES: tuple[str, ...] = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def check_shared_cache(**kwargs: Any) -> List[CheckMessage]:
+    """
+    Проверяет, что кэш ответов общий для воркеров.
+
+    Версии вопросов и списка хранятся в кэше QA_CACHE_ALIAS: с кэшем
+    процесса запись, обработанная одним воркером, не инвалидирует ответы
+    остальных, и они отдают устаревшие данные.
+    """
+
+    if not settings.QA_CACHE_REQUIRE_SHARED:
+        return []
+    backend: str = settings.CACHES[settings.QA_CACHE_ALIAS]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"Кэш {settings.QA_CACHE_ALIAS!r} ({backend}) не общий для воркеров.",
+            hint="Укажите REDIS_URL или включите DJANGO_DEBUG=1 для разработки.",
+            id="api_qa.E001",
+        )
+    ]
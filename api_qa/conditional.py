@@ -0,0 +1,102 @@
+"""
+Условные GET запросы (ETag, Last-Modified, 304 Not Modified) для списков.
+
+Валидаторы строятся из DatasetVersion без запросов к БД, поэтому ответ
+304 отдается до пагинации и сериализации. Версия хранится в общем кэше
+(QA_CACHE_ALIAS, проверка api_qa.E001), так что все воркеры выдают и
+проверяют одни и те же валидаторы. Заголовок Cache-Control с коротким
+max-age позволяет nginx микрокэшировать страницы списка и перепроверять
+их условными запросами (см. nginx/nginx.conf). Очистки кэша nginx при
+записи нет: другие клиенты видят изменение списка не позже чем через
+QA_LIST_MAX_AGE секунд.
+"""
+
+import hashlib
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponseBase
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+from rest_framework.request import Request
+
+from . import routers
+
+#: ETag и время Last-Modified (None, если его еще нельзя выдать).
+Validators = Tuple[str, Optional[int]]
+
+
+def validators(request: Request, stamp: Tuple[str, float]) -> Optional[Validators]:
+    """
+    Строит валидаторы ответа по версии набора данных.
+
+    ETag учитывает полный путь с параметрами, формат ответа и хост
+    (в ответе абсолютные ссылки next/previous). Если чтение идет с
+    реплики, а версия изменилась недавно, реплика может еще не содержать
+    изменение: тогда валидаторы не выдаются, иначе клиент закрепил бы
+    устаревшую страницу под новым ETag.
+
+    ETag меняется при любой записи (сильный валидатор). Last-Modified
+    имеет точность в секунду: изменение в ту же секунду, что и ответ,
+    не сменило бы его, и запрос с If-Modified-Since получил бы 304 на
+    устаревшую страницу. Поэтому Last-Modified выдается, только когда
+    секунда последнего изменения уже прошла (как в RFC 9110, 8.8.2.2).
+    """
+
+    version, modified = stamp
+    if (
+        settings.QA_DB_REPLICAS
+        and not routers.is_pinned()
+        and time.time() - modified < settings.QA_DB_REPLICA_CACHE_TIMEOUT
+    ):
+        return None
+    variant: str = "|".join(
+        [
+            version,
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            request.scheme or "",
+            request.get_host(),
+        ]
+    )
+    etag: str = f'"{hashlib.sha1(variant.encode("utf-8")).hexdigest()}"'
+    last_modified: Optional[int] = int(modified)
+    if int(time.time()) <= int(modified):
+        last_modified = None
+    return etag, last_modified
+
+
+def not_modified(
+    request: Request, current: Optional[Validators]
+) -> Optional[HttpResponseBase]:
+    """Возвращает ответ 304, если у клиента актуальная версия, иначе None."""
+
+    if current is None:
+        return None
+    etag, last_modified = current
+    # Request DRF проксирует method и META, которые читает Django.
+    response: Optional[HttpResponseBase] = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        patch_headers(response, current)
+    return response
+
+
+def patch_headers(response: HttpResponseBase, current: Optional[Validators]) -> None:
+    """Добавляет валидаторы и заголовки для микрокэша к успешному ответу."""
+
+    if response.status_code not in (200, 304):
+        return
+    if current is not None:
+        etag, last_modified = current
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=settings.QA_LIST_MAX_AGE)
+    patch_vary_headers(response, ["Accept"])
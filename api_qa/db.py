@@ -0,0 +1,28 @@
+"""Инструментация пула соединений PostgreSQL."""
+
+from typing import Any, Dict, Optional
+
+from django.db import connections
+
+
+def pool_stats(alias: str = "default") -> Optional[Dict[str, Any]]:
+    """
+    Возвращает статистику пула соединений psycopg 3 текущего процесса.
+
+    Помимо счетчиков ``psycopg_pool`` (pool_size, pool_available,
+    requests_waiting, requests_wait_ms, ...) содержит ``checked_out`` —
+    число выданных соединений, и ``requests_wait_ms_avg`` — среднее
+    ожидание соединения запросами, которым пришлось встать в очередь.
+    Для баз без пула возвращает None.
+    """
+
+    pool: Any = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    stats: Dict[str, Any] = dict(pool.get_stats())
+    queued: int = stats.get("requests_queued", 0)
+    stats["checked_out"] = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    stats["requests_wait_ms_avg"] = (
+        stats.get("requests_wait_ms", 0) / queued if queued else 0.0
+    )
+    return stats
@@ -0,0 +1,251 @@
+"""
+Публикация новых ответов подписчикам потока SSE.
+
+Ответ публикуется после фиксации транзакции: на PostgreSQL командой
+``NOTIFY`` в канал CHANNEL (уведомление доставляется при COMMIT всем
+процессам), на других БД — напрямую подписчикам этого процесса, что
+достаточно для тестов и разработки с одним процессом.
+
+Каждый ASGI процесс держит одно соединение с ``LISTEN`` и раздает
+уведомления своим подписчикам: строка ответа читается один раз на
+уведомление, а не на каждого подписчика. Подписчик получает готовый
+кадр SSE в очередь asyncio своего event loop. Если очередь переполнена
+(клиент не успевает читать) или соединение LISTEN оборвалось, подписка
+закрывается: клиент переподключается с ``Last-Event-ID`` и дочитывает
+пропущенное из БД.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import psycopg
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from rest_framework.settings import api_settings
+
+from . import fast
+from .models import Answer
+
+logger = logging.getLogger(__name__)
+
+#: Канал LISTEN/NOTIFY, полезная нагрузка — "<question_id>:<answer_id>".
+CHANNEL: str = "qa_answers"
+
+_lock: threading.Lock = threading.Lock()
+_subscribers: Dict[int, Set["Subscription"]] = defaultdict(set)
+
+#: Событие подписки: id ответа и готовый кадр SSE.
+Event = Tuple[int, bytes]
+
+
+class Subscription:
+    """Подписка на новые ответы вопроса в текущем event loop."""
+
+    def __init__(self, question_id: int) -> None:
+        self.question_id: int = question_id
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(
+            maxsize=settings.QA_STREAM_QUEUE_SIZE
+        )
+        self.closed: bool = False
+
+    def put(self, event: Event) -> None:
+        """Кладет событие в очередь; переполнение закрывает подписку."""
+
+        if self.closed:
+            return
+        if self.queue.full():
+            self.close()
+            return
+        self.queue.put_nowait(event)
+
+    def close(self) -> None:
+        """Закрывает подписку; вызывается в потоке ее event loop."""
+
+        if self.closed:
+            return
+        self.closed = True
+        unsubscribe(self)
+        if not self.queue.full():
+            # Будит ожидающий get(); полную очередь читатель и так дочитает.
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """
+        Ждет следующее событие не дольше timeout секунд.
+
+        Returns:
+            Событие или None, если подписка закрыта.
+
+        Raises:
+            asyncio.TimeoutError: за timeout секунд событий не было.
+        """
+
+        if self.closed and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+def subscribe(question_id: int) -> Subscription:
+    """Подписывает текущий event loop на ответы вопроса."""
+
+    subscription: Subscription = Subscription(question_id)
+    with _lock:
+        _subscribers[question_id].add(subscription)
+    if _uses_notify():
+        _listener.ensure()
+    return subscription
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    with _lock:
+        group: Set[Subscription] = _subscribers.get(subscription.question_id, set())
+        group.discard(subscription)
+        if not group:
+            _subscribers.pop(subscription.question_id, None)
+
+
+def subscriber_count() -> int:
+    """Возвращает число подписок текущего процесса."""
+
+    with _lock:
+        return sum(len(group) for group in _subscribers.values())
+
+
+def frame(item: Dict[str, Any]) -> bytes:
+    """Кадр SSE ``answer`` с id ответа для Last-Event-ID."""
+
+    data: bytes = api_settings.DEFAULT_RENDERER_CLASSES[0]().render(item)
+    return b"id: %d\nevent: answer\ndata: %s\n\n" % (item["id"], data)
+
+
+def publish(question_id: int, answer_id: int, using: str = DEFAULT_DB_ALIAS) -> None:
+    """
+    Публикует новый ответ после фиксации текущей транзакции.
+
+    На PostgreSQL выполняет ``NOTIFY`` в том же соединении: внутри
+    транзакции уведомление уходит при COMMIT, при откате — не уходит.
+    """
+
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [CHANNEL, f"{question_id}:{answer_id}"]
+            )
+        return
+    transaction.on_commit(lambda: dispatch(question_id, answer_id), using=using)
+
+
+async def apublish(question_id: int, answer_id: int) -> None:
+    """Асинхронный вариант publish()."""
+
+    await sync_to_async(publish)(question_id, answer_id)
+
+
+def dispatch(question_id: int, answer_id: int) -> None:
+    """
+    Раздает ответ подписчикам процесса; можно вызывать из любого потока.
+
+    Для каждого event loop с подписчиками ответ читается из primary один
+    раз, и кадр раскладывается по очередям в потоке этого loop.
+    """
+
+    with _lock:
+        group: List[Subscription] = list(_subscribers.get(question_id, ()))
+    by_loop: Dict[asyncio.AbstractEventLoop, List[Subscription]] = defaultdict(list)
+    for subscription in group:
+        by_loop[subscription.loop].append(subscription)
+    for loop, subscriptions in by_loop.items():
+        try:
+            asyncio.run_coroutine_threadsafe(_deliver(answer_id, subscriptions), loop)
+        except RuntimeError:
+            # Event loop уже закрыт: подписки больше некому читать.
+            for subscription in subscriptions:
+                unsubscribe(subscription)
+
+
+async def _deliver(answer_id: int, subscriptions: List[Subscription]) -> None:
+    row: Optional[Dict[str, Any]] = (
+        await Answer.objects.using(DEFAULT_DB_ALIAS)
+        .filter(id=answer_id)
+        .values(*fast.ANSWER_FIELDS)
+        .afirst()
+    )
+    if row is None:
+        return
+    event: Event = (answer_id, frame(fast.answer_item(row, fast.current_timezone())))
+    for subscription in subscriptions:
+        subscription.put(event)
+
+
+def close_all() -> None:
+    """Закрывает все подписки процесса: клиенты переподключатся и дочитают."""
+
+    with _lock:
+        subscriptions: List[Subscription] = [
+            subscription for group in _subscribers.values() for subscription in group
+        ]
+    for subscription in subscriptions:
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.close)
+        except RuntimeError:
+            unsubscribe(subscription)
+
+
+def _uses_notify() -> bool:
+    vendor: str = connections[DEFAULT_DB_ALIAS].vendor
+    return vendor == "postgresql"
+
+
+class Listener:
+    """Задача процесса, держащая соединение с LISTEN."""
+
+    def __init__(self) -> None:
+        self.task: Optional["asyncio.Task[None]"] = None
+
+    def ensure(self) -> None:
+        """Запускает задачу в текущем event loop, если она не работает."""
+
+        with _lock:
+            if self.task is None or self.task.done():
+                self.task = asyncio.get_running_loop().create_task(_listen())
+
+
+_listener: Listener = Listener()
+
+
+async def _listen() -> None:
+    """Держит соединение с LISTEN CHANNEL и переподключается при ошибках."""
+
+    database: Dict[str, Any] = settings.DATABASES[DEFAULT_DB_ALIAS]
+    params: Dict[str, Any] = {
+        key: value
+        for key, value in (
+            ("dbname", database["NAME"]),
+            ("user", database.get("USER")),
+            ("password", database.get("PASSWORD")),
+            ("host", database.get("HOST")),
+            ("port", database.get("PORT")),
+        )
+        if value
+    }
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                autocommit=True, **params
+            ) as connection:
+                await connection.execute(f"LISTEN {CHANNEL}")
+                logger.info("Listening for new answers on %s", CHANNEL)
+                async for notify in connection.notifies():
+                    question_id, _, answer_id = notify.payload.partition(":")
+                    dispatch(int(question_id), int(answer_id))
+        except (psycopg.Error, OSError) as exc:
+            logger.warning("LISTEN %s failed: %s", CHANNEL, exc)
+        # Уведомления, пришедшие без соединения, потеряны.
+        close_all()
+        await asyncio.sleep(settings.QA_STREAM_RETRY / 1000)
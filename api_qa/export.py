@@ -0,0 +1,111 @@
+import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Generator, Iterator, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Answer, Question
+
+QUESTION_FIELDS: List[str] = ["id", "text", "created_at"]
+ANSWER_FIELDS: List[str] = ["id", "question_id", "user_id", "text", "created_at"]
+
+
+def parse_bound(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    Разбирает границу диапазона дат для экспорта.
+
+    Принимает дату (``2025-09-24``) или дату со временем в ISO 8601;
+    время без часового пояса считается UTC.
+
+    Raises:
+        ValueError: если значение не является датой.
+    """
+
+    if not value:
+        return None
+    parsed: Optional[datetime.datetime] = parse_datetime(value)
+    if parsed is None:
+        day: Optional[datetime.date] = parse_date(value)
+        if day is None:
+            raise ValueError(f"Некорректная дата: {value}")
+        parsed = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+    return parsed
+
+
+def iter_questions_ndjson(
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    chunk_size: int = 2000,
+) -> Generator[bytes, None, None]:
+    """
+    Построчно выдает вопросы с вложенными ответами в формате NDJSON.
+
+    Вопросы (по id) и ответы (по question_id, created_at, id) читаются
+    двумя серверными курсорами ``iterator(chunk_size=...)`` и сливаются
+    как два отсортированных потока, поэтому в памяти находится только
+    текущий вопрос с его ответами, а не вся таблица. Фильтр
+    ``since <= created_at < until`` применяется к вопросам.
+    """
+
+    questions: QuerySet = Question.objects.order_by("id")
+    if since is not None:
+        questions = questions.filter(created_at__gte=since)
+    if until is not None:
+        questions = questions.filter(created_at__lt=until)
+    answers: QuerySet = Answer.objects.filter(
+        question_id__in=questions.values("id")
+    ).order_by("question_id", "created_at", "id")
+
+    encoder: JSONEncoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    answer_rows: Iterator[Dict[str, Any]] = answers.values(*ANSWER_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+    pending: Optional[Dict[str, Any]] = next(answer_rows, None)
+
+    for question in questions.values(*QUESTION_FIELDS).iterator(chunk_size=chunk_size):
+        nested: List[Dict[str, Any]] = []
+        while pending is not None and pending["question_id"] <= question["id"]:
+            if pending["question_id"] == question["id"]:
+                nested.append(pending)
+            pending = next(answer_rows, None)
+        question["answers"] = nested
+        yield (encoder.encode(question) + "\n").encode("utf-8")
+
+
+async def aiter_questions_ndjson(
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    chunk_size: int = 2000,
+    lines_per_chunk: int = 100,
+) -> AsyncIterator[bytes]:
+    """
+    Асинхронный вариант iter_questions_ndjson для ASGI.
+
+    Синхронный итератор StreamingHttpResponse Django под ASGI читает
+    целиком через ``sync_to_async(list)``, то есть держит всю выгрузку в
+    памяти. Здесь строки забираются пачками по ``lines_per_chunk``, каждая
+    пачка отдельным вызовом ``sync_to_async``. Вызовы идут в одном потоке
+    (thread_sensitive), поэтому серверные курсоры остаются на одном
+    соединении с БД.
+    """
+
+    lines: Generator[bytes, None, None] = iter_questions_ndjson(
+        since, until, chunk_size
+    )
+
+    def read_chunk() -> bytes:
+        return b"".join(islice(lines, lines_per_chunk))
+
+    try:
+        while chunk := await sync_to_async(read_chunk)():
+            yield chunk
+    finally:
+        # Закрытие генератора освобождает курсоры; при обрыве соединения
+        # оно тоже должно выполняться в потоке, где курсоры открыты.
+        await sync_to_async(lines.close)()
@@ -0,0 +1,177 @@
+"""
+Быстрая сериализация для GET эндпоинтов.
+
+Строки выбираются через ``.values()`` и превращаются в обычные словари без
+создания экземпляров моделей и полей DRF на каждую строку. Порядок ключей
+и форматирование значений повторяют сериализаторы из serializers.py,
+поэтому JSON ответа совпадает с ними побайтно; сериализаторы остаются
+эталоном и используются для записи.
+"""
+
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.settings import ISO_8601, api_settings
+
+from .models import Answer
+from .pagination import AnswerCursorPagination, KeysetPagination
+
+QUESTION_LIST_FIELDS: Tuple[str, ...] = ("id", "text", "answers_count")
+QUESTION_DETAIL_FIELDS: Tuple[str, ...] = ("id", "text", "created_at")
+ANSWER_FIELDS: Tuple[str, ...] = ("id", "question_id", "user_id", "text", "created_at")
+
+# Одно поле на процесс: форматирование даты то же, что у сериализаторов.
+_datetime_field: serializers.DateTimeField = serializers.DateTimeField()
+
+
+def is_enabled() -> bool:
+    """Проверяет, включена ли быстрая сериализация (QA_FAST_SERIALIZATION)."""
+
+    return bool(settings.QA_FAST_SERIALIZATION)
+
+
+def current_timezone() -> Optional[datetime.tzinfo]:
+    """
+    Возвращает часовой пояс вывода дат, как DateTimeField.default_timezone.
+
+    Вычисляется один раз на ответ: поиск текущего пояса на каждую строку
+    занимает больше времени, чем само форматирование.
+    """
+
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+def format_datetime(value: Any, tz: Optional[datetime.tzinfo] = None) -> Any:
+    """Форматирует дату так же, как serializers.DateTimeField."""
+
+    if (
+        tz is None
+        or not isinstance(value, datetime.datetime)
+        or timezone.is_naive(value)
+        or api_settings.DATETIME_FORMAT.lower() != ISO_8601
+    ):
+        return _datetime_field.to_representation(value)
+    text: str = value.astimezone(tz).isoformat()
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def value_fields(output: Sequence[str], paginator: Optional[Any] = None) -> List[str]:
+    """
+    Возвращает поля для ``.values()``: поля ответа и поля ключа пагинации.
+
+    Keyset пагинации нужны значения ключа (например, created_at или rank)
+    для построения курсора, даже если они не входят в ответ.
+    """
+
+    fields: List[str] = list(output)
+    if isinstance(paginator, KeysetPagination):
+        for field in paginator.ordering:
+            name: str = field.lstrip("-")
+            if name not in fields:
+                fields.append(name)
+    return fields
+
+
+def question_list_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Повторяет QuestionListSerializer."""
+
+    return {
+        "id": row["id"],
+        "text": row["text"],
+        "answers_count": row["answers_count"],
+    }
+
+
+def answer_item(
+    row: Dict[str, Any], tz: Optional[datetime.tzinfo] = None
+) -> Dict[str, Any]:
+    """Повторяет AnswerSerializer."""
+
+    return {
+        "id": row["id"],
+        "question_id": row["question_id"],
+        "user_id": str(row["user_id"]),
+        "text": row["text"],
+        "created_at": format_datetime(row["created_at"], tz),
+    }
+
+
+def answer_items(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    tz: Optional[datetime.tzinfo] = current_timezone()
+    return [answer_item(row, tz) for row in rows]
+
+
+def answers_preview(
+    question_id: int, request: Optional[Request], values: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Выбирает первые QA_DETAIL_ANSWERS_LIMIT ответов вопроса и ссылку next.
+
+    При ``values=True`` возвращает словари из ``.values()``, иначе —
+    экземпляры Answer для сериализатора.
+    """
+
+    paginator: AnswerCursorPagination = AnswerCursorPagination()
+    queryset = Answer.objects.filter(question_id=question_id)
+    if values:
+        queryset = queryset.values(*ANSWER_FIELDS)
+    answers: List[Any] = paginator.paginate_first_page(
+        queryset, _answers_url(question_id, request), settings.QA_DETAIL_ANSWERS_LIMIT
+    )
+    return answers, paginator.get_next_link()
+
+
+async def aanswers_preview(
+    question_id: int, request: Optional[Request]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Асинхронный вариант answers_preview, всегда возвращает словари."""
+
+    paginator: AnswerCursorPagination = AnswerCursorPagination()
+    answers: List[Dict[str, Any]] = await paginator.apaginate_first_page(
+        Answer.objects.filter(question_id=question_id).values(*ANSWER_FIELDS),
+        _answers_url(question_id, request),
+        settings.QA_DETAIL_ANSWERS_LIMIT,
+    )
+    return answers, paginator.get_next_link()
+
+
+def question_detail(row: Dict[str, Any], request: Optional[Request]) -> Dict[str, Any]:
+    """Повторяет QuestionDetailSerializer."""
+
+    answers, answers_next = answers_preview(row["id"], request, values=True)
+    return _question_detail(row, answers, answers_next)
+
+
+async def aquestion_detail(
+    row: Dict[str, Any], request: Optional[Request]
+) -> Dict[str, Any]:
+    """Асинхронный вариант question_detail."""
+
+    answers, answers_next = await aanswers_preview(row["id"], request)
+    return _question_detail(row, answers, answers_next)
+
+
+def _question_detail(
+    row: Dict[str, Any], answers: List[Dict[str, Any]], answers_next: Optional[str]
+) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "text": row["text"],
+        "created_at": format_datetime(row["created_at"], current_timezone()),
+        "answers": answer_items(answers),
+        "answers_next": answers_next,
+    }
+
+
+def _answers_url(question_id: int, request: Optional[Request]) -> str:
+    url: str = reverse("answer-create", kwargs={"question_id": question_id})
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    return url
@@ -0,0 +1,174 @@
+"""
+Неблокирующее структурированное логирование.
+
+Записи логгера ``api_qa`` попадают в очередь (QueueHandler), а в файл и
+консоль их пишет фоновый поток QueueListener, поэтому медленный диск не
+задерживает обработку запроса. К каждой записи добавляется контекст
+текущего HTTP запроса (id запроса, маршрут, метод), который заполняет
+RequestLogMiddleware; INFO записи маршрутов из QA_LOG_SAMPLE_RATES
+сэмплируются: для запроса один раз решается, попадут ли его INFO записи
+в лог. Файл пишется в формате JSON (JsonFormatter) через WatchedFileHandler:
+его пишут несколько процессов сервера, поэтому ротирует файл внешний
+logrotate, а обработчик каждого процесса сам переоткрывает его.
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+#: Поля записи, которые JsonFormatter выводит, если они заданы.
+FIELDS: Tuple[str, ...] = (
+    "request_id",
+    "route",
+    "method",
+    "path",
+    "status",
+    "duration_ms",
+    "db_queries",
+    "db_time_ms",
+)
+
+
+@dataclass
+class RequestContext:
+    """Контекст HTTP запроса, добавляемый к записям лога."""
+
+    request_id: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    sampled: bool = True
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "qa_log_request", default=None
+)
+
+
+def bind(context: RequestContext) -> Token:
+    """Делает контекст текущим для записей лога этого запроса."""
+
+    return _current_request.set(context)
+
+
+def unbind(token: Token) -> None:
+    _current_request.reset(token)
+
+
+def current() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+def set_route(context: RequestContext, route: Optional[str]) -> None:
+    """Запоминает маршрут запроса и решает, попадут ли его INFO записи в лог."""
+
+    context.route = route
+    rate: float = settings.QA_LOG_SAMPLE_RATES.get(route, 1.0)
+    context.sampled = rate >= 1 or random.random() < rate
+
+
+class RequestContextFilter(logging.Filter):
+    """Добавляет к записи поля контекста текущего запроса."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context: Optional[RequestContext] = current()
+        if context is not None:
+            for field in ("request_id", "route", "method", "path"):
+                if not hasattr(record, field):
+                    setattr(record, field, getattr(context, field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Отбрасывает INFO и DEBUG записи запросов, не выбранных для лога."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        context: Optional[RequestContext] = current()
+        return context is None or context.sampled
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись в одну строку JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in FIELDS:
+            value: Any = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    QueueHandler с собственным фоновым QueueListener.
+
+    ``handlers`` — обработчики, которые пишут записи в фоновом потоке
+    (в LOGGING задаются ссылками ``cfg://handlers.<имя>``). Поток
+    запускается при создании, перезапускается в дочернем процессе после
+    fork (gunicorn --preload) и останавливается при выходе с записью
+    оставшихся в очереди записей.
+    """
+
+    def __init__(self, handlers: List[logging.Handler], maxsize: int = 10000) -> None:
+        self.records: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize)
+        super().__init__(self.records)
+        self.dropped: int = 0
+        # Ссылки cfg:// в списке dictConfig разрешаются при доступе по индексу.
+        self.targets: List[logging.Handler] = [
+            handlers[index] for index in range(len(handlers))
+        ]
+        self.listener: Optional[QueueListener] = None
+        self.start()
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            # Поток слушателя не переживает fork: в дочернем процессе нужен новый.
+            os.register_at_fork(after_in_child=self.start)
+
+    def start(self) -> None:
+        """Запускает фоновый поток записи с новым QueueListener."""
+
+        self.listener = QueueListener(
+            self.records, *self.targets, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Дописывает записи из очереди и останавливает фоновый поток."""
+
+        listener: Optional[QueueListener] = self.listener
+        if listener is None:
+            return
+        self.listener = None
+        # QueueListener.stop() кладет маркер остановки без ожидания, поэтому
+        # сначала ждем, пока поток разберет заполненную очередь.
+        self.records.join()
+        listener.stop()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # При переполнении очереди запись теряется, а запрос не ждет диск.
+            self.dropped += 1
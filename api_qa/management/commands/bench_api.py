@@ -0,0 +1,225 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test.utils import override_settings
+
+from api_qa import benchmark
+
+# Фабрики на factory-boy — dev зависимость: без нее команда сообщает об
+# ошибке при запуске, а не при загрузке списка команд.
+FACTORIES_ERROR: Optional[ImportError] = None
+try:
+    from api_qa.tests import factories
+except ImportError as exc:  # pragma: no cover - зависит от окружения
+    FACTORIES_ERROR = exc
+
+MODES: List[str] = ["inprocess", "http"]
+
+
+class Command(BaseCommand):
+    """Бенчмарк всех эндпоинтов API с JSON отчетом и сравнением запусков."""
+
+    help: str = (
+        "Создает набор данных заданного размера, прогоняет каждый эндпоинт "
+        "api_qa/urls.py внутри процесса и через локальный HTTP сервер и "
+        "выводит p50/p95/p99, запросы в секунду и SQL запросы на запрос "
+        "в JSON. С --compare сравнивает два отчета и ищет регрессии"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--questions", type=int, default=1000, help="Вопросов в наборе данных"
+        )
+        parser.add_argument(
+            "--answers", type=int, default=20, help="Ответов на каждый вопрос"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Запросов на сценарий"
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=10, help="Запросов прогрева на сценарий"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=1, help="Одновременных клиентов"
+        )
+        parser.add_argument(
+            "--mode", choices=MODES, nargs="+", default=MODES, help="Режимы запуска"
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            help="Только эти сценарии (по умолчанию — все)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=1, help="Seed генератора данных"
+        )
+        parser.add_argument("--output", help="Файл для JSON отчета (иначе stdout)")
+        parser.add_argument(
+            "--compare",
+            nargs=2,
+            metavar=("BASE", "NEW"),
+            help="Сравнить два JSON отчета вместо запуска бенчмарка",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Допустимое ухудшение p95 и rps при сравнении, %%",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Данные создаются в рабочей базе (HTTP сервер обращается к ней из
+        других потоков) и удаляются после замеров. Для сравнимости
+        результатов запуски должны использовать одинаковые параметры.
+        """
+        if options["compare"]:
+            base_path, new_path = options["compare"]
+            self._compare(base_path, new_path, options["threshold"])
+            return
+        if min(options["questions"], options["answers"], options["requests"]) < 1:
+            raise CommandError("--questions, --answers и --requests должны быть > 0")
+
+        scenarios: List[benchmark.Scenario] = [
+            scenario
+            for scenario in benchmark.SCENARIOS
+            if not options["scenarios"] or scenario.name in options["scenarios"]
+        ]
+        if FACTORIES_ERROR is not None:
+            raise CommandError(
+                "Для создания данных нужны dev зависимости (factory-boy): "
+                f"{FACTORIES_ERROR}"
+            ) from FACTORIES_ERROR
+        per_mode: int = options["warmup"] + options["requests"]
+        data: benchmark.Dataset = benchmark.seed(
+            factories,
+            options["questions"],
+            options["answers"],
+            per_mode * len(options["mode"]),
+            options["seed"],
+        )
+
+        report: Dict[str, Any] = {
+            "environment": benchmark.environment(),
+            "parameters": {
+                key: options[key]
+                for key in ("questions", "answers", "requests", "concurrency", "seed")
+            },
+            "results": {},
+        }
+        api_logger: logging.Logger = logging.getLogger("api_qa")
+        level: int = api_logger.level
+        # Запись каждого запроса в лог исказила бы замеры.
+        api_logger.setLevel(logging.WARNING)
+        try:
+            session: str = benchmark.admin_session()
+            with override_settings(QA_QUERY_HEADERS=True):
+                for index, mode in enumerate(options["mode"]):
+                    report["results"][mode] = self._run_mode(
+                        mode, session, scenarios, data, options, index * per_mode
+                    )
+        finally:
+            api_logger.setLevel(level)
+            benchmark.cleanup()
+
+        text: str = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            Path(options["output"]).write_text(text + "\n", encoding="utf-8")
+            self._table(report)
+        else:
+            self.stdout.write(text)
+
+    def _run_mode(
+        self,
+        mode: str,
+        session: str,
+        scenarios: List[benchmark.Scenario],
+        data: benchmark.Dataset,
+        options: Dict[str, Any],
+        offset: int,
+    ) -> Dict[str, Dict[str, Any]]:
+        driver: Callable[..., benchmark.Sample]
+        if mode == "http":
+            driver = benchmark.HttpDriver(session)
+        else:
+            driver = benchmark.InProcessDriver(session)
+        results: Dict[str, Dict[str, Any]] = {}
+        try:
+            for scenario in scenarios:
+                if options["warmup"]:
+                    benchmark.run_scenario(
+                        driver,
+                        scenario,
+                        data,
+                        range(offset, offset + options["warmup"]),
+                        1,
+                    )
+                start: int = offset + options["warmup"]
+                results[scenario.name] = benchmark.run_scenario(
+                    driver,
+                    scenario,
+                    data,
+                    range(start, start + options["requests"]),
+                    options["concurrency"],
+                )
+                if results[scenario.name]["errors"]:
+                    self.stderr.write(
+                        f"{mode} {scenario.name}: "
+                        f"{results[scenario.name]['errors']} ошибок"
+                    )
+        finally:
+            if isinstance(driver, benchmark.HttpDriver):
+                driver.close()
+        return results
+
+    def _table(self, report: Dict[str, Any]) -> None:
+        self.stdout.write(
+            f"{'mode':<10} {'scenario':<24} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'queries':>8}"
+        )
+        for mode, scenarios in report["results"].items():
+            for name, result in scenarios.items():
+                queries: Optional[float] = result["queries"]
+                self.stdout.write(
+                    f"{mode:<10} {name:<24} {result['rps']:>9.0f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                    f"{result['p99_ms']:>8.2f} "
+                    f"{'-' if queries is None else f'{queries:.1f}':>8}"
+                )
+
+    def _compare(self, base_path: str, new_path: str, threshold: float) -> None:
+        try:
+            base: Dict[str, Any] = json.loads(Path(base_path).read_text("utf-8"))
+            new: Dict[str, Any] = json.loads(Path(new_path).read_text("utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Не удалось прочитать отчет: {exc}") from exc
+        if base.get("parameters") != new.get("parameters"):
+            self.stderr.write("Внимание: отчеты получены с разными параметрами")
+
+        pairs, regressions = benchmark.compare(base, new, threshold)
+        self.stdout.write(
+            f"{'mode':<10} {'scenario':<24} {'p95 ms':>17} {'req/s':>15} "
+            f"{'queries':>11}"
+        )
+        for mode, name, before, after in pairs:
+            self.stdout.write(
+                f"{mode:<10} {name:<24} "
+                f"{before['p95_ms']:>8.2f}>{after['p95_ms']:<8.2f} "
+                f"{before['rps']:>7.0f}>{after['rps']:<7.0f} "
+                f"{before['queries'] or 0:>5.1f}>{after['queries'] or 0:<5.1f}"
+            )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Регрессий не найдено"))
+            return
+        for mode, name, metric, before_value, after_value in regressions:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"Регрессия {mode} {name}: {metric} {before_value} -> {after_value}"
+                )
+            )
+        raise CommandError(f"Найдено регрессий: {len(regressions)}")
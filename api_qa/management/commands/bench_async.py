@@ -0,0 +1,255 @@
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from api_qa.models import Answer, Question
+from api_qa.urls import build_urlpatterns
+
+BENCH_TEXT: str = "bench_async question"
+HOST: str = "127.0.0.1"
+
+
+class Command(BaseCommand):
+    """Бенчмарк конкурентных запросов: WSGI (sync views) против ASGI (async)."""
+
+    help: str = (
+        "Сравнивает пропускную способность синхронных views под WSGI с "
+        "ограниченным числом sync воркеров и async views под ASGI при "
+        "одинаковом числе одновременных клиентов"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Число запросов на режим"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Число одновременных клиентов",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Число sync воркеров WSGI (как gunicorn --workers)",
+        )
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=[
+                "/questions/",
+                "/questions/{question}/",
+                "/questions/{question}/answers/",
+            ],
+            help="Пути запросов; {question} заменяется id тестового вопроса",
+        )
+        parser.add_argument(
+            "--db-latency",
+            type=float,
+            default=0.0,
+            help="Искусственная задержка каждого SQL запроса, мс "
+            "(имитация сетевой задержки до БД)",
+        )
+        parser.add_argument(
+            "--answers", type=int, default=50, help="Ответов у тестового вопроса"
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Отключить кэш детального ответа вопроса",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Оба режима обрабатывают запросы в этом же процессе, без HTTP
+        сервера: WSGI режим — WSGIHandler в ``--workers`` потоках (каждый
+        поток, как sync воркер gunicorn, обрабатывает один запрос за раз),
+        ASGI режим — ASGIHandler в одном event loop. Тестовые данные
+        создаются перед замерами и удаляются после них.
+        """
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests и --concurrency должны быть больше 0")
+
+        question: Question = Question.objects.create(text=BENCH_TEXT)
+        Answer.objects.bulk_create(
+            Answer(question_id=question, user_id=uuid.uuid4(), text=f"Answer {index}")
+            for index in range(options["answers"])
+        )
+        paths: List[str] = [
+            path.format(question=question.id) for path in options["paths"]
+        ]
+        requests: List[str] = [
+            paths[index % len(paths)] for index in range(options["requests"])
+        ]
+
+        latency: float = options["db_latency"] / 1000
+
+        def delay(execute: Callable[..., Any], *params: Any) -> Any:
+            time.sleep(latency)
+            return execute(*params)
+
+        def add_latency(sender: Any, connection: Any, **kwargs: Any) -> None:
+            # Обертка соединения сохраняется между переподключениями потока.
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        overrides: Dict[str, Any] = {}
+        if options["no_cache"]:
+            overrides["CACHES"] = {
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            }
+        if latency:
+            connection_created.connect(add_latency)
+        try:
+            with override_settings(**overrides):
+                results: Dict[str, Dict[str, float]] = {
+                    "wsgi": self._measure(
+                        False,
+                        lambda: self._run_wsgi(
+                            requests, options["concurrency"], options["workers"]
+                        ),
+                    ),
+                    "asgi": self._measure(
+                        True,
+                        lambda: asyncio.run(
+                            self._run_asgi(requests, options["concurrency"])
+                        ),
+                    ),
+                }
+        finally:
+            connection_created.disconnect(add_latency)
+            question.delete()
+
+        self.stdout.write(
+            f"{'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<6} {result['rps']:>9.0f} {result['p50']:>8.1f} "
+                f"{result['p95']:>8.1f} {result['p99']:>8.1f}"
+            )
+        self.stdout.write(
+            f"asgi/wsgi: {results['asgi']['rps'] / results['wsgi']['rps']:.2f}x "
+            f"({options['concurrency']} клиентов, {options['workers']} WSGI воркеров)"
+        )
+
+    @staticmethod
+    def _measure(use_async: bool, run: Callable[[], List[float]]) -> Dict[str, float]:
+        urlconf: ModuleType = ModuleType(f"bench_urls_{int(use_async)}")
+        urlconf.urlpatterns = build_urlpatterns(use_async)  # type: ignore[attr-defined]
+        with override_settings(ROOT_URLCONF=urlconf):
+            started: float = time.perf_counter()
+            latencies: List[float] = run()
+            elapsed: float = time.perf_counter() - started
+        percentiles: List[float] = statistics.quantiles(
+            [value * 1000 for value in latencies], n=100, method="inclusive"
+        )
+        return {
+            "rps": len(latencies) / elapsed,
+            "p50": percentiles[49],
+            "p95": percentiles[94],
+            "p99": percentiles[98],
+        }
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        return path.split("?", 1) if "?" in path else [path, ""]
+
+    def _run_wsgi(
+        self, requests: List[str], concurrency: int, workers: int
+    ) -> List[float]:
+        handler: WSGIHandler = WSGIHandler()
+        # Клиентов больше, чем воркеров: лишние запросы ждут в очереди,
+        # как в backlog сокета gunicorn.
+        slots: threading.BoundedSemaphore = threading.BoundedSemaphore(workers)
+
+        def call(path: str) -> float:
+            route, query = self._split(path)
+            environ: Dict[str, Any] = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": route,
+                "QUERY_STRING": query,
+                "SERVER_NAME": HOST,
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": HOST,
+                "wsgi.input": BytesIO(),
+                "wsgi.url_scheme": "http",
+            }
+            statuses: List[str] = []
+            started: float = time.perf_counter()
+            with slots:
+                body: Iterator[bytes] = handler(
+                    environ, lambda status, headers: statuses.append(status)
+                )
+                b"".join(body)
+                body.close()  # type: ignore[attr-defined]
+            self._check(path, int(statuses[0].split()[0]))
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            return list(pool.map(call, requests))
+
+    async def _run_asgi(self, requests: List[str], concurrency: int) -> List[float]:
+        handler: ASGIHandler = ASGIHandler()
+        clients: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(path: str) -> float:
+            route, query = self._split(path)
+            scope: Dict[str, Any] = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": route,
+                "raw_path": route.encode(),
+                "query_string": query.encode(),
+                "headers": [(b"host", HOST.encode())],
+                "server": (HOST, 80),
+                "client": ("127.0.0.1", 0),
+            }
+            messages: List[Dict[str, Any]] = [
+                {"type": "http.request", "body": b"", "more_body": False}
+            ]
+            statuses: List[int] = []
+
+            async def receive() -> Dict[str, Any]:
+                if messages:
+                    return messages.pop()
+                # Клиент не отключается; ожидание отменяет сам обработчик.
+                await asyncio.Event().wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            async with clients:
+                started: float = time.perf_counter()
+                await handler(scope, receive, send)
+                elapsed: float = time.perf_counter() - started
+            self._check(path, statuses[0])
+            return elapsed
+
+        return list(await asyncio.gather(*(call(path) for path in requests)))
+
+    @staticmethod
+    def _check(path: str, status_code: int) -> None:
+        if status_code != 200:
+            raise CommandError(f"{path}: неожиданный статус {status_code}")
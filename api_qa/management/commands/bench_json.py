@@ -0,0 +1,104 @@
+import time
+import uuid
+from io import BytesIO
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api_qa import renderers
+from api_qa.models import Answer, Question
+from api_qa.serializers import AnswerSerializer
+
+
+class Command(BaseCommand):
+    """Бенчмарк кодирования и разбора JSON: стандартный json против orjson."""
+
+    help: str = (
+        "Измеряет скорость рендеринга списка ответов в JSON и разбора "
+        "тела запроса классами DRF и api_qa.renderers (orjson), МБ в секунду"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--answers",
+            type=int,
+            nargs="+",
+            default=[20, 1000, 10000],
+            help="Размеры списков ответов",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Число повторов, берется лучшее"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Данные — ответы AnswerSerializer, как в ``results`` списков API;
+        создаются внутри транзакции, которая откатывается после замеров.
+        """
+        if not renderers.is_available():
+            self.stderr.write("orjson не установлен: замеряется запасной путь DRF")
+        self.stdout.write(
+            f"{'answers':>8} {'bytes':>10} {'render json':>12} {'render fast':>12} "
+            f"{'parse json':>11} {'parse fast':>11}"
+        )
+        for answers in options["answers"]:
+            with transaction.atomic():
+                question: Question = Question.objects.create(text="Benchmark")
+                Answer.objects.bulk_create(
+                    (
+                        Answer(
+                            question_id=question,
+                            user_id=uuid.uuid4(),
+                            text=f"Benchmark answer {index} — ответ",
+                        )
+                        for index in range(answers)
+                    ),
+                    batch_size=5000,
+                )
+                data: Dict[str, Any] = {
+                    "results": AnswerSerializer(
+                        Answer.objects.filter(question_id=question), many=True
+                    ).data
+                }
+                transaction.set_rollback(True)
+            self._measure(answers, data, options["repeat"])
+
+    def _measure(self, answers: int, data: Dict[str, Any], repeat: int) -> None:
+        standard: JSONRenderer = JSONRenderer()
+        fast: renderers.FastJSONRenderer = renderers.FastJSONRenderer()
+        body: bytes = standard.render(data)
+        if fast.render(data) != body:
+            self.stderr.write("Результаты рендеринга различаются!")
+
+        megabytes: float = len(body) / 1024 / 1024
+        results: Dict[str, float] = {
+            name: megabytes / self._best(func, repeat)
+            for name, func in (
+                ("render json", lambda: standard.render(data)),
+                ("render fast", lambda: fast.render(data)),
+                ("parse json", lambda: JSONParser().parse(BytesIO(body))),
+                (
+                    "parse fast",
+                    lambda: renderers.FastJSONParser().parse(BytesIO(body)),
+                ),
+            )
+        }
+        self.stdout.write(
+            f"{answers:>8} {len(body):>10} {results['render json']:>12.1f} "
+            f"{results['render fast']:>12.1f} {results['parse json']:>11.1f} "
+            f"{results['parse fast']:>11.1f}"
+        )
+
+    @staticmethod
+    def _best(func: Callable[[], Any], repeat: int) -> float:
+        timings: List[float] = []
+        for _ in range(max(repeat, 1)):
+            started: float = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return max(min(timings), 1e-9)
@@ -0,0 +1,97 @@
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api_qa import fast
+from api_qa.models import Answer, Question
+from api_qa.serializers import AnswerSerializer
+
+
+class Command(BaseCommand):
+    """Бенчмарк сериализации ответов: DRF сериализаторы против .values()."""
+
+    help: str = (
+        "Измеряет скорость выборки и рендеринга ответов в JSON через "
+        "AnswerSerializer и через быстрый путь api_qa.fast (строк в секунду)"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1000, 10000, 100000],
+            help="Размеры выборок",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Число повторов, берется лучшее"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Данные создаются внутри транзакции, которая откатывается после
+        замеров, поэтому база данных не изменяется.
+        """
+        renderer: JSONRenderer = JSONRenderer()
+        self.stdout.write(
+            f"{'rows':>8} {'drf rows/s':>12} {'fast rows/s':>12} {'x':>6}"
+        )
+
+        for rows in options["rows"]:
+            with transaction.atomic():
+                question: Question = Question.objects.create(text="Benchmark")
+                Answer.objects.bulk_create(
+                    (
+                        Answer(
+                            question_id=question,
+                            user_id=uuid.uuid4(),
+                            text=f"Benchmark answer {index}",
+                        )
+                        for index in range(rows)
+                    ),
+                    batch_size=5000,
+                )
+                queryset = Answer.objects.filter(question_id=question).order_by(
+                    "created_at", "id"
+                )
+
+                def drf() -> bytes:
+                    body: bytes = renderer.render(
+                        AnswerSerializer(queryset, many=True).data
+                    )
+                    return body
+
+                def lean() -> bytes:
+                    body: bytes = renderer.render(
+                        fast.answer_items(queryset.values(*fast.ANSWER_FIELDS))
+                    )
+                    return body
+
+                if drf() != lean():
+                    self.stderr.write("Результаты сериализации различаются!")
+
+                results: Dict[str, float] = {
+                    name: rows / self._best(func, options["repeat"])
+                    for name, func in (("drf", drf), ("fast", lean))
+                }
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f"{rows:>8} {results['drf']:>12.0f} {results['fast']:>12.0f} "
+                f"{results['fast'] / results['drf']:>6.1f}"
+            )
+
+    @staticmethod
+    def _best(func: Callable[[], bytes], repeat: int) -> float:
+        timings: List[float] = []
+        for _ in range(max(repeat, 1)):
+            started: float = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return max(min(timings), 1e-9)
@@ -0,0 +1,113 @@
+import statistics
+import time
+import uuid
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from api_qa.metrics import track_queries
+from api_qa.models import Question
+
+BENCH_TEXT: str = "bench_writes question"
+HOST: str = "127.0.0.1"
+#: Режимы: прежний путь через ORM и создание одной командой.
+MODES: Dict[str, bool] = {"orm": False, "single": True}
+
+
+class Command(BaseCommand):
+    """Бенчмарк создания ответов: ORM против одной команды INSERT ... RETURNING."""
+
+    help: str = (
+        "Измеряет пропускную способность POST /questions/<id>/answers/ "
+        "с проверкой вопроса через ORM и с созданием ответа одной командой "
+        "(QA_SINGLE_QUERY_WRITES): записей в секунду, задержки и SQL "
+        "запросы на запись"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Число записей на режим"
+        )
+        parser.add_argument(
+            "--db-latency",
+            type=float,
+            default=0.0,
+            help="Искусственная задержка каждого SQL запроса, мс "
+            "(имитация сетевой задержки до БД)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Запросы выполняются внутри процесса через django.test.Client с
+        фиксацией транзакций, как в рабочем режиме. Тестовый вопрос и
+        созданные ответы удаляются после замеров.
+        """
+        if options["requests"] < 1:
+            raise CommandError("--requests должен быть больше 0")
+
+        latency: float = options["db_latency"] / 1000
+
+        def delay(execute: Callable[..., Any], *params: Any) -> Any:
+            time.sleep(latency)
+            return execute(*params)
+
+        question: Question = Question.objects.create(text=BENCH_TEXT)
+        url: str = reverse("answer-create", args=[question.id])
+        client: Client = Client(HTTP_HOST=HOST)
+        results: Dict[str, Dict[str, float]] = {}
+        try:
+            with ExitStack() as stack:
+                if latency:
+                    stack.enter_context(connection.execute_wrapper(delay))
+                for mode, single in MODES.items():
+                    with override_settings(QA_SINGLE_QUERY_WRITES=single):
+                        results[mode] = self._run(client, url, options["requests"])
+        finally:
+            question.delete()
+
+        self.stdout.write(
+            f"{'mode':<8} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8}"
+        )
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode:<8} {result['rps']:>9.0f} {result['p50']:>8.2f} "
+                f"{result['p95']:>8.2f} {result['queries']:>8.1f}"
+            )
+        self.stdout.write(
+            f"single/orm: {results['single']['rps'] / results['orm']['rps']:.2f}x"
+        )
+
+    @staticmethod
+    def _run(client: Client, url: str, requests: int) -> Dict[str, float]:
+        latencies: List[float] = []
+        queries: int = 0
+        started: float = time.perf_counter()
+        for index in range(requests):
+            body: Dict[str, str] = {
+                "user_id": str(uuid.uuid4()),
+                "text": f"Answer {index}",
+            }
+            request_started: float = time.perf_counter()
+            with track_queries() as stats:
+                response = client.post(url, body, content_type="application/json")
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code != 201:
+                raise CommandError(f"{url}: ответ {response.status_code}")
+            queries += stats.count
+        elapsed: float = time.perf_counter() - started
+        percentiles: List[float] = statistics.quantiles(
+            [value * 1000 for value in latencies], n=100, method="inclusive"
+        )
+        return {
+            "rps": requests / elapsed,
+            "p50": percentiles[49],
+            "p95": percentiles[94],
+            "queries": queries / requests,
+        }
@@ -0,0 +1,57 @@
+import sys
+from typing import Any, BinaryIO
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from api_qa.export import iter_questions_ndjson, parse_bound
+
+
+class Command(BaseCommand):
+    """Команда экспорта вопросов с ответами в NDJSON."""
+
+    help: str = (
+        "Выгружает вопросы с вложенными ответами в формате NDJSON "
+        "с постоянным потреблением памяти"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Файл для выгрузки (по умолчанию — stdout)",
+        )
+        parser.add_argument(
+            "--since", help="Вопросы, созданные не раньше даты (ISO 8601)"
+        )
+        parser.add_argument("--until", help="Вопросы, созданные раньше даты (ISO 8601)")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Размер выборки серверного курсора",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Основной метод выполнения команды."""
+        try:
+            since = parse_bound(options["since"])
+            until = parse_bound(options["until"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        lines = iter_questions_ndjson(since, until, options["chunk_size"])
+        if options["output"] == "-":
+            self._write(sys.stdout.buffer, lines)
+            return
+        with open(options["output"], "wb") as stream:
+            count: int = self._write(stream, lines)
+        self.stderr.write(f"Выгружено вопросов: {count}")
+
+    @staticmethod
+    def _write(stream: BinaryIO, lines: Any) -> int:
+        count: int = 0
+        for line in lines:
+            stream.write(line)
+            count += 1
+        stream.flush()
+        return count
@@ -0,0 +1,193 @@
+import datetime
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from typing import Any, Callable, Iterator, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api_qa import routers, search
+from api_qa.bulk import AnswerRow, BulkWriter, QuestionRow, chunked, get_writer
+from api_qa.models import Answer, Question
+
+SYLLABLES: List[str] = [
+    "ка", "ло", "ми", "ре", "то", "на", "су", "пе", "ви", "да",
+    "го", "зу", "ле", "мо", "ри", "ст", "ва", "ни", "ко", "ту",
+]  # fmt: skip
+
+
+class Command(BaseCommand):
+    """Команда генерации синтетических данных производственного масштаба."""
+
+    help: str = (
+        "Генерирует вопросы и ответы с реалистичным распределением "
+        "(длинный хвост ответов на вопрос, активные пользователи, "
+        "разнесенные даты) потоковыми пачками: COPY на PostgreSQL, "
+        "пакетный INSERT на остальных базах"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--questions", type=int, default=100000, help="Количество вопросов"
+        )
+        parser.add_argument(
+            "--answers", type=int, default=1000000, help="Количество ответов"
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            help="Количество авторов ответов (по умолчанию answers / 20)",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Период дат создания, дней"
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=3.0,
+            help="Неравномерность ответов по вопросам и пользователям "
+            "(1 — равномерно, больше — длиннее хвост)",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Seed генератора")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Количество строк в одной транзакции",
+        )
+        parser.add_argument("--database", default="default", help="Алиас базы данных")
+
+    @routers.use_primary()
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Вопросы получают явные id после текущего максимального, даты
+        создания растут вместе с id. Каждый ответ относится к вопросу и
+        автору, выбранным со степенным распределением (``--skew``), и
+        создан через экспоненциально распределенное время после вопроса.
+        При одинаковых параметрах и ``--seed`` данные совпадают. Строки
+        генерируются потоком и записываются пачками, память не зависит
+        от объема; поисковый индекс SQLite перестраивается один раз в конце.
+        Чтения закреплены за primary: максимальный id берется из базы записи.
+        """
+        if options["questions"] < 1 or options["answers"] < 0:
+            raise CommandError("--questions должен быть > 0, --answers — >= 0")
+        if options["batch_size"] < 1 or options["skew"] < 1:
+            raise CommandError("--batch-size должен быть > 0, --skew — >= 1")
+
+        self.rng: random.Random = random.Random(options["seed"])
+        self.words: List[str] = self._vocabulary(2000)
+        self.questions: int = options["questions"]
+        self.skew: float = options["skew"]
+        self.end: datetime.datetime = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.span: float = datetime.timedelta(days=options["days"]).total_seconds()
+        self.first_id: int = (
+            Question.objects.using(options["database"]).aggregate(top=Max("id"))["top"]
+            or 0
+        ) + 1
+
+        users: int = options["users"] or max(1, options["answers"] // 20)
+        self.users: List[uuid.UUID] = [
+            uuid.UUID(int=self.rng.getrandbits(128), version=4) for _ in range(users)
+        ]
+
+        writer: BulkWriter = get_writer(options["database"])
+        started: float = time.perf_counter()
+        with ExitStack() as stack:
+            for model in (Question, Answer):
+                stack.enter_context(search.deferred_index(model, options["database"]))
+            self._write(
+                "Вопросов",
+                self._questions(),
+                writer.write_questions,
+                options,
+            )
+            writer.reset_sequences()
+            self._write(
+                "Ответов",
+                self._answers(options["answers"]),
+                writer.write_answers,
+                options,
+            )
+        total: int = options["questions"] + options["answers"]
+        elapsed: float = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано строк: {total} за {elapsed:.1f} с "
+                f"({total / elapsed:.0f} строк/с)"
+            )
+        )
+
+    def _write(
+        self,
+        title: str,
+        rows: Iterator[Any],
+        write: Callable[[List[Any]], int],
+        options: Any,
+    ) -> None:
+        started: float = time.perf_counter()
+        written: int = 0
+        for batch in chunked(rows, options["batch_size"]):
+            with transaction.atomic(using=options["database"]):
+                written += write(batch)
+            elapsed: float = time.perf_counter() - started
+            self.stdout.write(
+                f"{title}: {written} ({written / elapsed:.0f} строк/с)",
+                ending="\r",
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{title}: {written} за {elapsed:.1f} с "
+            f"({written / max(elapsed, 1e-9):.0f} строк/с)"
+        )
+
+    def _questions(self) -> Iterator[QuestionRow]:
+        for index in range(self.questions):
+            yield {
+                "id": self.first_id + index,
+                "text": self._sentence(6, 14) + "?",
+                "created_at": self._question_created_at(index),
+            }
+
+    def _answers(self, count: int) -> Iterator[AnswerRow]:
+        for _ in range(count):
+            index: int = self._skewed(self.questions)
+            delay: float = self.rng.expovariate(1 / 259200)  # в среднем 3 дня
+            yield {
+                "question_id": self.first_id + index,
+                "user_id": self.users[self._skewed(len(self.users))],
+                "text": self._sentence(8, 40) + ".",
+                "created_at": min(
+                    self._question_created_at(index)
+                    + datetime.timedelta(seconds=delay),
+                    self.end,
+                ),
+            }
+
+    def _question_created_at(self, index: int) -> datetime.datetime:
+        # Дата растет с номером вопроса; внутри шага — фиксированный сдвиг.
+        offset: float = (index + 0.5) / self.questions * self.span
+        return self.end - datetime.timedelta(seconds=self.span - offset)
+
+    def _skewed(self, size: int) -> int:
+        # Степенное распределение: малые номера выбираются намного чаще.
+        return int(size * self.rng.random() ** self.skew)
+
+    def _sentence(self, shortest: int, longest: int) -> str:
+        words: List[str] = self.rng.choices(
+            self.words, k=self.rng.randint(shortest, longest)
+        )
+        return " ".join(words).capitalize()
+
+    def _vocabulary(self, size: int) -> List[str]:
+        return [
+            "".join(self.rng.choices(SYLLABLES, k=self.rng.randint(1, 4)))
+            for _ in range(size)
+        ]
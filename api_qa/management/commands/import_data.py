@@ -0,0 +1,182 @@
+import csv
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.db.models import F
+
+from api_qa import routers
+from api_qa.bulk import BulkWriter, chunked, get_writer, parse_answer, parse_question
+from api_qa.models import ImportCheckpoint
+
+
+def iter_records(path: Path, fmt: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Читает записи JSONL или CSV построчно, не загружая файл в память.
+
+    Для строк JSONL, которые не удалось разобрать, возвращается None.
+    """
+
+    if fmt == "auto":
+        fmt = "csv" if path.suffix.lower() == ".csv" else "jsonl"
+    with path.open(encoding="utf-8", newline="") as stream:
+        if fmt == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+
+class Command(BaseCommand):
+    """Команда потокового импорта вопросов и ответов из JSONL/CSV."""
+
+    help: str = (
+        "Импортирует вопросы и ответы из файлов JSONL/CSV с постоянным "
+        "потреблением памяти (COPY на PostgreSQL, пачки на SQLite)"
+    )
+
+    #: Сколько отклоненных записей выводить подробно.
+    max_reported_errors: int = 10
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--questions", type=Path, help="Файл с вопросами")
+        parser.add_argument("--answers", type=Path, help="Файл с ответами")
+        parser.add_argument(
+            "--format",
+            choices=["auto", "jsonl", "csv"],
+            default="auto",
+            help="Формат файлов (по умолчанию — по расширению)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество записей в одной транзакции",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Игнорировать сохраненную позицию и импортировать файл заново",
+        )
+        parser.add_argument("--database", default="default", help="Алиас базы данных")
+
+    @routers.use_primary()
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Сначала импортируются вопросы, затем ответы: ответы ссылаются на
+        вопросы по полю question_id, ответы на отсутствующие вопросы
+        отбрасываются. Каждая пачка вставляется в отдельной транзакции
+        вместе с обновлением позиции в ImportCheckpoint, поэтому после
+        прерывания повторный запуск продолжает импорт с последней
+        зафиксированной пачки. Чтения закреплены за primary, чтобы
+        проверка существующих строк не отставала от только что записанных.
+        """
+        if not options["questions"] and not options["answers"]:
+            raise CommandError("Укажите --questions и/или --answers")
+
+        writer: BulkWriter = get_writer(options["database"])
+        if options["questions"]:
+            self.import_file(
+                "questions",
+                options["questions"],
+                parse_question,
+                writer.write_questions,
+                options,
+            )
+            writer.reset_sequences()
+        if options["answers"]:
+            self.import_file(
+                "answers",
+                options["answers"],
+                parse_answer,
+                writer.write_answers,
+                options,
+            )
+
+    def import_file(
+        self,
+        kind: str,
+        path: Path,
+        parse: Callable[[Dict[str, Any]], Dict[str, Any]],
+        write: Callable[[List[Dict[str, Any]]], int],
+        options: Dict[str, Any],
+    ) -> None:
+        """Импортирует один файл пачками с сохранением позиции."""
+
+        if not path.exists():
+            raise CommandError(f"Файл не найден: {path}")
+
+        database: str = options["database"]
+        source: str = f"{kind}:{path.resolve()}"
+        checkpoints = ImportCheckpoint.objects.using(database)
+        if options["restart"]:
+            checkpoints.filter(source=source).delete()
+        checkpoint, _ = checkpoints.get_or_create(source=source)
+        if checkpoint.completed:
+            self.stdout.write(
+                f"{kind}: {path} уже импортирован "
+                f"({checkpoint.rows_imported} записей), --restart для повтора"
+            )
+            return
+        if checkpoint.rows_read:
+            self.stdout.write(
+                f"{kind}: продолжение с записи {checkpoint.rows_read + 1}"
+            )
+
+        records: Iterator[Optional[Dict[str, Any]]] = itertools.islice(
+            iter_records(path, options["format"]), checkpoint.rows_read, None
+        )
+        started: float = time.monotonic()
+        read_total: int = checkpoint.rows_read
+        imported_total: int = checkpoint.rows_imported
+        rejected: int = 0
+
+        for chunk in chunked(records, options["batch_size"]):
+            rows: List[Dict[str, Any]] = []
+            for offset, record in enumerate(chunk):
+                try:
+                    if not isinstance(record, dict):
+                        raise ValueError("некорректная запись")
+                    rows.append(parse(record))
+                except (TypeError, ValueError, AttributeError) as exc:
+                    rejected += 1
+                    if rejected <= self.max_reported_errors:
+                        self.stderr.write(
+                            f"{kind}: запись {read_total + offset + 1} "
+                            f"пропущена: {exc}"
+                        )
+
+            with transaction.atomic(using=database):
+                inserted: int = write(rows) if rows else 0
+                checkpoints.filter(pk=checkpoint.pk).update(
+                    rows_read=F("rows_read") + len(chunk),
+                    rows_imported=F("rows_imported") + inserted,
+                )
+
+            read_total += len(chunk)
+            imported_total += inserted
+            rejected += len(rows) - inserted
+            elapsed: float = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f"{kind}: прочитано {read_total}, импортировано {imported_total}, "
+                f"{(read_total - checkpoint.rows_read) / elapsed:.0f} записей/с"
+            )
+
+        checkpoints.filter(pk=checkpoint.pk).update(completed=True)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{kind}: импорт завершен, импортировано {imported_total}, "
+                f"отклонено {rejected}"
+            )
+        )
@@ -1,8 +1,11 @@
+from pathlib import Path
 from typing import Any
 
 from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
+FIXTURES_DIR: Path = Path(__file__).resolve().parents[2] / "fixtures"
+
 
 class Command(BaseCommand):
     """Команда для загрузки тестовых данных в базу данных."""
@@ -13,11 +16,17 @@ class Command(BaseCommand):
         """
         Основной метод выполнения команды.
 
-        Загружает фикстуры questions.json и answers.json в базу данных.
+        Загружает questions.jsonl и answers.jsonl потоковым импортом
+        import_data; повторный запуск не создает дублей.
         """
         self.stdout.write("Загрузка тестовых данных...")
 
-        call_command("loaddata", "questions.json", app_label="api_qa")
-        call_command("loaddata", "answers.json", app_label="api_qa")
+        call_command(
+            "import_data",
+            questions=FIXTURES_DIR / "questions.jsonl",
+            answers=FIXTURES_DIR / "answers.jsonl",
+            stdout=self.stdout,
+            stderr=self.stderr,
+        )
 
         self.stdout.write(self.style.SUCCESS("Тестовые данные успешно загружены!"))
@@ -0,0 +1,42 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from api_qa import routers, trending
+
+
+class Command(BaseCommand):
+    """Пересчет счетов рейтинга trending с нуля."""
+
+    help: str = (
+        "Пересчитывает счета GET /questions/trending/ по таблице ответов "
+        "для всех окон QA_TRENDING_WINDOWS"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Размер пачки чтения ответов и записи счетов (вопросов)",
+        )
+
+    @routers.use_primary()
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Старые счета удаляются и записываются заново в одной транзакции,
+        поэтому во время пересчета рейтинг отдает прежние значения. Ответы
+        читаются с primary, а не с отстающей реплики.
+        """
+        started: float = time.perf_counter()
+        questions: int = trending.rebuild(max(options["batch_size"], 1))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Пересчитано вопросов: {questions}, окна: "
+                f"{', '.join(trending.windows())} "
+                f"({time.perf_counter() - started:.1f} с)"
+            )
+        )
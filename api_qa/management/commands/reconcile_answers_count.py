@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, Max
+
+from api_qa import routers
+from api_qa.models import Answer, Question
+
+
+class Command(BaseCommand):
+    """Сверка денормализованного answers_count с таблицей ответов."""
+
+    help: str = (
+        "Пересчитывает количество ответов по диапазонам id вопросов и "
+        "исправляет расхождения в Question.answers_count"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Размер диапазона id вопросов на один проход",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только вывести расхождения, не исправляя их",
+        )
+
+    @routers.use_primary()
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод выполнения команды.
+
+        Каждый диапазон id обрабатывается отдельной транзакцией: сначала
+        блокируются строки вопросов диапазона, затем считаются их ответы.
+        Команда не держит блокировки на всю таблицу и может выполняться на
+        работающей базе: запись ответа обновляет answers_count вопроса и
+        ждет конца транзакции, поэтому подсчет не расходится с прочитанными
+        счетчиками. Чтения закреплены
+        за primary: сверка с отстающей репликой записала бы устаревшие счетчики.
+        """
+        batch_size: int = max(options["batch_size"], 1)
+        last_id: int = Question.objects.aggregate(last=Max("id"))["last"] or 0
+        checked: int = 0
+        fixed: int = 0
+
+        for start in range(1, last_id + 1, batch_size):
+            end: int = start + batch_size
+            with transaction.atomic():
+                rows: List[Tuple[int, int, int]] = self._compare(start, end)
+                mismatched = [row for row in rows if row[1] != row[2]]
+                checked += len(rows)
+                for question_id, stored, actual in mismatched:
+                    self.stdout.write(f"Вопрос #{question_id}: {stored} -> {actual}")
+                    if not options["dry_run"]:
+                        Question.objects.filter(id=question_id).update(
+                            answers_count=actual
+                        )
+                fixed += len(mismatched)
+
+        action: str = "Найдено" if options["dry_run"] else "Исправлено"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Проверено вопросов: {checked}. {action} расхождений: {fixed}"
+            )
+        )
+
+    @classmethod
+    def _compare(cls, start: int, end: int) -> List[Tuple[int, int, int]]:
+        # Блокировка до подсчета: иначе ответ, зафиксированный между двумя
+        # запросами, попал бы в answers_count, но не в подсчет, и команда
+        # «исправила» бы верный счетчик на устаревший.
+        stored: List[Tuple[int, int]] = list(
+            Question.objects.select_for_update()
+            .filter(id__gte=start, id__lt=end)
+            .values_list("id", "answers_count")
+        )
+        actual: Dict[int, int] = cls.count_answers(start, end)
+        return [
+            (question_id, count, actual.get(question_id, 0))
+            for question_id, count in stored
+        ]
+
+    @staticmethod
+    def count_answers(start: int, end: int) -> Dict[int, int]:
+        """Считает ответы вопросов с id из ``[start, end)``."""
+        return dict(
+            Answer.objects.filter(question_id__gte=start, question_id__lt=end)
+            .order_by()
+            .values_list("question_id")
+            .annotate(total=Count("id"))
+            .values_list("question_id", "total")
+        )
@@ -0,0 +1,420 @@
+"""
+Метрики запросов в формате Prometheus без внешних зависимостей.
+
+Каждый процесс хранит метрики в памяти (MetricsRegistry). Если задан
+QA_METRICS_DIR, процесс периодически сохраняет снимок своих метрик в файл
+``<pid>.json`` этого каталога, а ``/metrics`` объединяет снимки всех
+процессов: счетчики и гистограммы суммируются, in-flight учитывается только
+для живых процессов. Так ответ не зависит от того, какой воркер gunicorn
+обработал запрос Prometheus. Снимки завершенных процессов при сборе
+переносятся в ``archive.json`` и удаляются, поэтому каталог не растет при
+перезапусках воркеров, а суммы счетчиков не уменьшаются.
+
+Время SQL запросов считается оберткой ``execute_wrapper``, которая ставится
+на каждое соединение и пишет в накопитель текущего запроса (ContextVar,
+поэтому работает и для async views, выполняющих ORM в потоках).
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from .cache import question_detail_cache
+from .db import pool_stats
+
+#: Границы корзин гистограмм длительности, секунды.
+BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+#: Файл QA_METRICS_DIR с суммой снимков завершенных процессов.
+ARCHIVE_NAME: str = "archive.json"
+
+#: Описание метрик: имя -> (тип, справка).
+METRICS: Dict[str, Tuple[str, str]] = {
+    "qa_http_requests_total": ("counter", "HTTP requests by route and status"),
+    "qa_http_request_duration_seconds": (
+        "histogram",
+        "HTTP request latency by route",
+    ),
+    "qa_http_requests_in_flight": ("gauge", "HTTP requests being processed"),
+    "qa_db_queries_total": ("counter", "SQL queries executed by route"),
+    "qa_db_query_duration_seconds": (
+        "histogram",
+        "Total SQL time per request by route",
+    ),
+    "qa_cache_requests_total": ("counter", "Response cache lookups by result"),
+    "qa_db_pool_connections": ("gauge", "Connection pool size by state"),
+    "qa_db_pool_wait_seconds_total": (
+        "counter",
+        "Time requests waited for a pooled connection",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class QueryStats:
+    """Накопитель SQL запросов одного HTTP запроса."""
+
+    count: int = 0
+    duration: float = 0.0
+
+
+_current_queries: ContextVar[Tuple[QueryStats, ...]] = ContextVar(
+    "qa_current_queries", default=()
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Считает SQL запросы и их время внутри блока во всех соединениях.
+
+    Блоки могут быть вложенными: запрос учитывается во всех открытых.
+    """
+
+    stats: QueryStats = QueryStats()
+    token = _current_queries.set(_current_queries.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _current_queries.reset(token)
+
+
+@contextmanager
+def track_request_queries(request: Any) -> Iterator[QueryStats]:
+    """
+    Счетчик SQL запросов HTTP запроса, общий для всех middleware.
+
+    Внешний middleware открывает track_queries() и сохраняет накопитель
+    в ``request.qa_queries``; вложенные получают тот же накопитель, и
+    каждый SQL запрос учитывается один раз.
+    """
+
+    shared: Optional[QueryStats] = getattr(request, "qa_queries", None)
+    if shared is not None:
+        yield shared
+        return
+    with track_queries() as stats:
+        request.qa_queries = stats
+        yield stats
+
+
+def query_timer(
+    execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any
+) -> Any:
+    """execute_wrapper соединения, учитывающий запрос в track_queries()."""
+
+    active: Tuple[QueryStats, ...] = _current_queries.get()
+    if not active:
+        return execute(sql, params, many, context)
+    started: float = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed: float = time.perf_counter() - started
+        for stats in active:
+            stats.count += 1
+            stats.duration += elapsed
+
+
+def install_query_timer(connection: Any, **kwargs: Any) -> None:
+    """Обработчик connection_created: ставит query_timer на соединение."""
+
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+class MetricsRegistry:
+    """Потокобезопасное хранилище метрик процесса."""
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        self._in_flight: int = 0
+        self._flushed_at: float = 0.0
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1) -> None:
+        key: Tuple[str, Labels] = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        """Добавляет наблюдение в гистограмму: корзины, сумма и количество."""
+
+        key: Tuple[str, Labels] = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram: List[float] = self._histograms.setdefault(
+                key, [0.0] * (len(BUCKETS) + 2)
+            )
+            for index, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики процесса в виде JSON-совместимого словаря.
+
+        В снимок также попадают счетчики кэша ответов и состояние пула
+        соединений, которые хранятся в своих объектах.
+        """
+
+        with self._lock:
+            counters: List[List[Any]] = [
+                [name, list(labels), value]
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms: List[List[Any]] = [
+                [name, list(labels), list(values)]
+                for (name, labels), values in self._histograms.items()
+            ]
+            in_flight: int = self._in_flight
+
+        cache: Dict[str, int] = question_detail_cache.stats()
+        for result in ("hits", "misses"):
+            counters.append(
+                [
+                    "qa_cache_requests_total",
+                    [["cache", question_detail_cache.namespace], ["result", result]],
+                    cache[result],
+                ]
+            )
+        gauges: List[List[Any]] = [["qa_http_requests_in_flight", [], in_flight]]
+        for alias in settings.DATABASES:
+            stats: Optional[Dict[str, Any]] = pool_stats(alias)
+            if stats is None:
+                continue
+            for state in ("pool_size", "pool_available", "checked_out"):
+                gauges.append(
+                    [
+                        "qa_db_pool_connections",
+                        [["alias", alias], ["state", state]],
+                        stats.get(state, 0),
+                    ]
+                )
+            counters.append(
+                [
+                    "qa_db_pool_wait_seconds_total",
+                    [["alias", alias]],
+                    stats.get("requests_wait_ms", 0) / 1000,
+                ]
+            )
+        return {
+            "pid": os.getpid(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": gauges,
+        }
+
+    def flush(self, force: bool = False) -> None:
+        """Сохраняет снимок в QA_METRICS_DIR не чаще QA_METRICS_FLUSH_INTERVAL."""
+
+        directory: str = settings.QA_METRICS_DIR
+        if not directory:
+            return
+        now: float = time.monotonic()
+        if not force and now - self._flushed_at < settings.QA_METRICS_FLUSH_INTERVAL:
+            return
+        self._flushed_at = now
+        path: Path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        target: Path = path / f"{os.getpid()}.json"
+        temporary: Path = path / f".{os.getpid()}.json.tmp"
+        temporary.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        os.replace(temporary, target)
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Возвращает снимки всех процессов (или только текущего)."""
+
+        directory: str = settings.QA_METRICS_DIR
+        if not directory:
+            return [self.snapshot()]
+        self.flush(force=True)
+        path: Path = Path(directory)
+        # Блокировка не дает двум воркерам перенести один снимок в архив
+        # дважды или прочитать снимок вместе с архивом, уже включающим его.
+        with open(path / ".lock", "a", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_dead(path)
+            return [
+                snapshot
+                for snapshot in map(_read_snapshot, path.glob("*.json"))
+                if snapshot is not None
+            ]
+
+
+def archive_dead(path: Path) -> None:
+    """
+    Переносит счетчики и гистограммы завершенных процессов в archive.json.
+
+    Вызывается под блокировкой каталога. Gauges завершенных процессов
+    отбрасываются, как и в merge().
+    """
+
+    dead: List[Path] = [
+        snapshot
+        for snapshot in path.glob("*.json")
+        if snapshot.stem.isdigit() and not _is_alive(int(snapshot.stem))
+    ]
+    if not dead:
+        return
+    archive: Path = path / ARCHIVE_NAME
+    merged: Dict[str, Any] = merge(
+        [
+            snapshot
+            for snapshot in map(_read_snapshot, [archive, *dead])
+            if snapshot is not None
+        ]
+    )
+    temporary: Path = path / f".{ARCHIVE_NAME}.tmp"
+    temporary.write_text(
+        json.dumps(
+            {
+                # Gauges в архиве нет, поэтому pid архива не проверяется.
+                "pid": 0,
+                "counters": _entries(merged["counters"]),
+                "histograms": _entries(merged["histograms"]),
+                "gauges": [],
+            }
+        ),
+        encoding="utf-8",
+    )
+    os.replace(temporary, archive)
+    for snapshot in dead:
+        snapshot.unlink(missing_ok=True)
+
+
+def _read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        snapshot: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return snapshot
+
+
+def _entries(values: Dict[Tuple[str, Labels], Any]) -> List[List[Any]]:
+    # Обратно к формату снимка: [имя, [[метка, значение], ...], значение].
+    return [
+        [name, [list(label) for label in labels], value]
+        for (name, labels), value in values.items()
+    ]
+
+
+def merge(snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Объединяет снимки процессов; gauges завершенных процессов отбрасываются."""
+
+    counters: Dict[Tuple[str, Labels], float] = {}
+    histograms: Dict[Tuple[str, Labels], List[float]] = {}
+    gauges: Dict[Tuple[str, Labels], float] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            total: List[float] = histograms.setdefault(key, [0.0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+        if not _is_alive(snapshot["pid"]):
+            continue
+        for name, labels, value in snapshot["gauges"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            gauges[key] = gauges.get(key, 0) + value
+    return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def render(merged: Dict[str, Any]) -> str:
+    """Форматирует метрики в текстовый формат Prometheus."""
+
+    series: Dict[str, List[str]] = {name: [] for name in METRICS}
+    for (name, labels), value in sorted(merged["counters"].items()):
+        series[name].append(f"{name}{_labels(labels)} {_number(value)}")
+    for (name, labels), value in sorted(merged["gauges"].items()):
+        series[name].append(f"{name}{_labels(labels)} {_number(value)}")
+    for (name, labels), values in sorted(merged["histograms"].items()):
+        for bound, count in zip(BUCKETS, values):
+            bucket: Labels = labels + (("le", _number(bound)),)
+            series[name].append(f"{name}_bucket{_labels(bucket)} {_number(count)}")
+        infinity: Labels = labels + (("le", "+Inf"),)
+        series[name].append(f"{name}_bucket{_labels(infinity)} {_number(values[-1])}")
+        series[name].append(f"{name}_sum{_labels(labels)} {_number(values[-2])}")
+        series[name].append(f"{name}_count{_labels(labels)} {_number(values[-1])}")
+
+    lines: List[str] = []
+    for name, (kind, description) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(series[name])
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped: List[str] = [
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry: MetricsRegistry = MetricsRegistry()
@@ -0,0 +1,310 @@
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+
+from . import log, routers
+from .metrics import QueryStats, registry, track_request_queries
+
+logger = logging.getLogger(__name__)
+
+#: Маршруты мониторинга, которые не попадают в метрики запросов.
+UNTRACKED_ROUTES = frozenset({"health", "ready", "metrics"})
+
+#: Методы, которые не изменяют данные и могут читать с реплики.
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class MetricsMiddleware:
+    """
+    Собирает метрики запросов к views api_qa.
+
+    Для каждого запроса учитываются длительность, статус, число и время
+    SQL запросов; метка ``route`` — имя маршрута из urls.py. Поддерживает
+    синхронный (WSGI) и асинхронный (ASGI) стек.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_request_queries(request) as queries:
+            registry.request_started()
+            started: float = time.perf_counter()
+            response: Optional[HttpResponseBase] = None
+            try:
+                response = self.get_response(request)
+                return response
+            finally:
+                self._record(request, response, started, queries)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        with track_request_queries(request) as queries:
+            registry.request_started()
+            started: float = time.perf_counter()
+            response: Optional[HttpResponseBase] = None
+            try:
+                response = await self.get_response(request)
+                return response
+            finally:
+                self._record(request, response, started, queries)
+
+    @staticmethod
+    def _record(
+        request: HttpRequest,
+        response: Optional[HttpResponseBase],
+        started: float,
+        queries: QueryStats,
+    ) -> None:
+        registry.request_finished()
+        match: Any = getattr(request, "resolver_match", None)
+        if match is None or match.url_name in UNTRACKED_ROUTES:
+            return
+        view: Any = getattr(match.func, "view_class", match.func)
+        if not view.__module__.startswith("api_qa."):
+            return
+
+        labels: Dict[str, str] = {"route": match.url_name, "method": request.method}
+        status: str = str(response.status_code) if response is not None else "500"
+        registry.inc("qa_http_requests_total", {**labels, "status": status})
+        registry.observe(
+            "qa_http_request_duration_seconds", labels, time.perf_counter() - started
+        )
+        registry.inc("qa_db_queries_total", labels, queries.count)
+        registry.observe("qa_db_query_duration_seconds", labels, queries.duration)
+        registry.flush()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запрос выполнил больше SQL запросов, чем разрешает бюджет маршрута."""
+
+
+def query_budget(route: Optional[str], method: Optional[str]) -> int:
+    """
+    Возвращает бюджет SQL запросов маршрута и метода (QA_QUERY_BUDGETS).
+
+    HEAD обслуживается обработчиком GET и получает его бюджет.
+    """
+
+    key: Tuple[Optional[str], Optional[str]] = (
+        route,
+        "GET" if method == "HEAD" else method,
+    )
+    budget: int = settings.QA_QUERY_BUDGETS.get(key, settings.QA_QUERY_BUDGET_DEFAULT)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Сравнивает число SQL запросов каждого запроса с бюджетом маршрута и метода.
+
+    При QA_QUERY_HEADERS добавляет в ответ заголовки ``X-Query-Count`` и
+    ``X-DB-Time`` (мс). Превышение бюджета пишется в лог, а при
+    QA_QUERY_BUDGET_STRICT (в тестах) вызывает QueryBudgetExceeded, так
+    что N+1 регрессии роняют тесты. Запросы, выполняемые при отдаче
+    потокового ответа, не учитываются.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_request_queries(request) as queries:
+            response: HttpResponseBase = self.get_response(request)
+            self._check(request, response, queries)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        with track_request_queries(request) as queries:
+            response: HttpResponseBase = await self.get_response(request)
+            self._check(request, response, queries)
+        return response
+
+    @staticmethod
+    def _check(
+        request: HttpRequest, response: HttpResponseBase, queries: QueryStats
+    ) -> None:
+        milliseconds: float = queries.duration * 1000
+        if settings.QA_QUERY_HEADERS:
+            response["X-Query-Count"] = str(queries.count)
+            response["X-DB-Time"] = f"{milliseconds:.3f}"
+
+        match: Any = getattr(request, "resolver_match", None)
+        route: Optional[str] = match.url_name if match is not None else None
+        budget: int = query_budget(route, request.method)
+        if queries.count <= budget:
+            return
+        message: str = (
+            f"{request.method} {request.path} ({route}): {queries.count} SQL "
+            f"запросов при бюджете {budget}, {milliseconds:.1f} мс"
+        )
+        if settings.QA_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class RequestLogMiddleware:
+    """
+    Присваивает запросу id и пишет в лог итоговую запись о запросе.
+
+    Id берется из заголовка ``X-Request-ID`` (его задает nginx) или
+    генерируется и возвращается в том же заголовке ответа. Итоговая
+    запись содержит статус, длительность, число и время SQL запросов;
+    как и остальные INFO записи, она сэмплируется по маршруту.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        context: log.RequestContext = self._context(request)
+        token = log.bind(context)
+        try:
+            started: float = time.perf_counter()
+            with track_request_queries(request) as queries:
+                response: HttpResponseBase = self.get_response(request)
+                self._finish(context, response, started, queries)
+            return response
+        finally:
+            log.unbind(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        context: log.RequestContext = self._context(request)
+        token = log.bind(context)
+        try:
+            started: float = time.perf_counter()
+            with track_request_queries(request) as queries:
+                response: HttpResponseBase = await self.get_response(request)
+                self._finish(context, response, started, queries)
+            return response
+        finally:
+            log.unbind(token)
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        _view_func: Callable[..., Any],
+        _view_args: Any,
+        _view_kwargs: Any,
+    ) -> None:
+        context: Optional[log.RequestContext] = log.current()
+        if context is not None:
+            log.set_route(context, request.resolver_match.url_name)
+
+    @staticmethod
+    def _context(request: HttpRequest) -> log.RequestContext:
+        request_id: str = request.headers.get("X-Request-ID", "")[:64]
+        return log.RequestContext(
+            request_id=request_id or uuid.uuid4().hex,
+            method=request.method,
+            path=request.path,
+        )
+
+    @staticmethod
+    def _finish(
+        context: log.RequestContext,
+        response: HttpResponseBase,
+        started: float,
+        queries: QueryStats,
+    ) -> None:
+        response["X-Request-ID"] = context.request_id
+        logger.info(
+            "%s %s %s",
+            context.method,
+            context.path,
+            response.status_code,
+            extra={
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "db_queries": queries.count,
+                "db_time_ms": round(queries.duration * 1000, 3),
+            },
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Закрепляет чтения запроса за primary, когда реплика может отставать.
+
+    На primary идут запросы с небезопасными методами и запросы клиента,
+    недавно выполнившего запись: после успешной записи ответ ставит
+    cookie QA_DB_PRIMARY_COOKIE со временем окончания закрепления
+    (через QA_DB_PRIMARY_STICKY секунд). Остальные чтения ReplicaRouter
+    распределяет по репликам.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._pinned(request):
+            response: HttpResponseBase = self.get_response(request)
+        else:
+            with routers.use_primary():
+                response = self.get_response(request)
+        self._stick(request, response)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if not self._pinned(request):
+            response: HttpResponseBase = await self.get_response(request)
+        else:
+            with routers.use_primary():
+                response = await self.get_response(request)
+        self._stick(request, response)
+        return response
+
+    @staticmethod
+    def _pinned(request: HttpRequest) -> bool:
+        if request.method not in SAFE_METHODS:
+            return True
+        try:
+            until: float = float(request.COOKIES.get(settings.QA_DB_PRIMARY_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
+
+    @staticmethod
+    def _stick(request: HttpRequest, response: HttpResponseBase) -> None:
+        window: int = settings.QA_DB_PRIMARY_STICKY
+        if request.method in SAFE_METHODS or response.status_code >= 400 or not window:
+            return
+        response.set_cookie(
+            settings.QA_DB_PRIMARY_COOKIE,
+            str(int(time.time()) + window),
+            max_age=window,
+            httponly=True,
+            samesite="Lax",
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="question_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0002_question_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="answer",
+            index=models.Index(
+                fields=["question_id", "created_at", "id"],
+                name="answer_question_created_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0003_answer_question_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        max_length=512, unique=True, verbose_name="Источник"
+                    ),
+                ),
+                (
+                    "rows_read",
+                    models.BigIntegerField(default=0, verbose_name="Прочитано записей"),
+                ),
+                (
+                    "rows_imported",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Импортировано записей"
+                    ),
+                ),
+                (
+                    "completed",
+                    models.BooleanField(default=False, verbose_name="Импорт завершен"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+                ),
+            ],
+            options={
+                "verbose_name": "Позиция импорта",
+                "verbose_name_plural": "Позиции импорта",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from api_qa import search
+
+SEARCH_MODELS = ["Question", "Answer"]
+
+
+def install_search(apps, schema_editor):
+    for name in SEARCH_MODELS:
+        search.install(schema_editor, apps.get_model("api_qa", name))
+
+
+def uninstall_search(apps, schema_editor):
+    for name in SEARCH_MODELS:
+        search.uninstall(schema_editor, apps.get_model("api_qa", name))
+
+
+class Migration(migrations.Migration):
+    """
+    Полнотекстовый поиск по полю text.
+
+    PostgreSQL: генерируемая колонка search_vector и GIN индекс.
+    SQLite: внешняя FTS5 таблица и триггеры синхронизации.
+    """
+
+    dependencies = [
+        ("api_qa", "0004_importcheckpoint"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
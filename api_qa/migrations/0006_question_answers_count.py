@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from api_qa import search
+
+
+def fill_answers_count(apps, schema_editor):
+    Question = apps.get_model("api_qa", "Question")
+    Answer = apps.get_model("api_qa", "Answer")
+    counts = (
+        Answer.objects.filter(question_id=OuterRef("pk"))
+        .order_by()
+        .values("question_id")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    Question.objects.update(answers_count=Coalesce(Subquery(counts), 0))
+
+
+def reinstall_search(apps, schema_editor):
+    # SQLite пересоздает таблицу при добавлении поля, триггеры FTS5 теряются.
+    search.install(schema_editor, apps.get_model("api_qa", "Question"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0005_full_text_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="answers_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Ответы"
+            ),
+        ),
+        migrations.RunPython(reinstall_search, migrations.RunPython.noop),
+        migrations.RunPython(fill_answers_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0006_question_answers_count"),
+    ]
+
+    # Составной индекс покрывает поиск по user_id, поэтому одиночный
+    # индекс удаляется после создания нового.
+    operations = [
+        migrations.AddIndex(
+            model_name="answer",
+            index=models.Index(
+                fields=["user_id", "created_at", "id"],
+                name="answer_user_created_id_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="answer",
+            name="api_qa_answ_user_id_0081bb_idx",
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api_qa", "0007_answer_user_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("window", models.CharField(max_length=16, verbose_name="Окно")),
+                ("score", models.FloatField(null=True, verbose_name="Счет")),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="trending_scores",
+                        to="api_qa.question",
+                        verbose_name="Вопрос",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Счет активности",
+                "verbose_name_plural": "Счета активности",
+                "indexes": [
+                    models.Index(
+                        fields=["window", "-score"], name="trending_window_score_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("window", "question"),
+                        name="trending_window_question_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
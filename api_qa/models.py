@@ -1,6 +1,201 @@
-from typing import ClassVar
+import datetime
+import uuid
+from collections import Counter
+from typing import Any, ClassVar, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import trending
+
+
+class QuestionQuerySet(models.QuerySet):
+    """QuerySet вопросов с операциями над денормализованным answers_count."""
+
+    def add_answers(self, deltas: Mapping[int, int]) -> None:
+        """
+        Атомарно изменяет answers_count вопросов на заданные величины.
+
+        Вопросы группируются по величине изменения, поэтому пакет из
+        тысяч ответов к разным вопросам обычно дает несколько UPDATE.
+        """
+
+        by_delta: Dict[int, List[int]] = {}
+        for question_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(question_id)
+        for delta, question_ids in by_delta.items():
+            self.filter(pk__in=question_ids).update(
+                answers_count=F("answers_count") + delta
+            )
+
+
+def _dates_by_question(
+    answers: Iterable["Answer"],
+) -> Dict[int, List[datetime.datetime]]:
+    dates: Dict[int, List[datetime.datetime]] = {}
+    for answer in answers:
+        dates.setdefault(answer.question_id_id, []).append(answer.created_at)
+    return dates
+
+
+class AnswerQuerySet(models.QuerySet):
+    """QuerySet ответов, сохраняющий answers_count при массовых операциях."""
+
+    def bulk_create(
+        self, objs: Iterable["Answer"], *args: Any, **kwargs: Any
+    ) -> List["Answer"]:
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            created: List["Answer"] = super().bulk_create(objs, *args, **kwargs)
+            Question.objects.using(self.db).add_answers(
+                Counter(answer.question_id_id for answer in created)
+            )
+            trending.add(_dates_by_question(created), self.db)
+        return created
+
+    def create_for_question(
+        self, question_id: int, user_id: uuid.UUID, text: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Создает ответ на вопрос без предварительной проверки вопроса.
+
+        На PostgreSQL это одна команда: CTE увеличивает answers_count
+        вопроса (заодно блокируя его строку от удаления), вставляет
+        ответ ``INSERT ... SELECT ... RETURNING`` и прибавляет его к
+        счетам trending. На SQLite — вставка ``INSERT ... SELECT ...
+        RETURNING``, UPDATE счетчика и счетов в одной транзакции. Если
+        вопроса нет, строка не вставляется.
+
+        Returns:
+            Поля ответа как у ``.values(*fast.ANSWER_FIELDS)`` или None,
+            если вопрос не найден.
+        """
+
+        self._for_write = True
+        connection = connections[self.db]
+        created_at: datetime.datetime = timezone.now()
+        values: List[Any] = [
+            self.model._meta.get_field(name).get_db_prep_value(value, connection)
+            for name, value in (
+                ("user_id", user_id),
+                ("text", text),
+                ("created_at", created_at),
+            )
+        ]
+        answer_id: Optional[int] = None
+        if connection.vendor == "postgresql":
+            answer_id = self._insert_with_cte(
+                connection, question_id, values, created_at
+            )
+        elif connection.features.can_return_columns_from_insert:
+            answer_id = self._insert_returning(
+                connection, question_id, values, created_at
+            )
+        else:
+            question: Optional[Question] = (
+                Question.objects.using(self.db).filter(id=question_id).first()
+            )
+            if question is not None:
+                answer: Answer = self.create(
+                    question_id=question, user_id=user_id, text=text
+                )
+                answer_id, created_at = answer.id, answer.created_at
+        if answer_id is None:
+            return None
+        return {
+            "id": answer_id,
+            "question_id": question_id,
+            "user_id": user_id,
+            "text": text,
+            "created_at": created_at,
+        }
+
+    def _tables(self, connection: Any) -> Tuple[str, str, str]:
+        # Таблицы ответов и вопросов и столбцы вставки ответа.
+        columns: str = ", ".join(
+            connection.ops.quote_name(self.model._meta.get_field(name).column)
+            for name in ("question_id", "user_id", "text", "created_at")
+        )
+        return (
+            connection.ops.quote_name(self.model._meta.db_table),
+            connection.ops.quote_name(Question._meta.db_table),
+            columns,
+        )
+
+    def _insert_with_cte(
+        self,
+        connection: Any,
+        question_id: int,
+        values: List[Any],
+        created_at: datetime.datetime,
+    ) -> Optional[int]:
+        answers, questions, columns = self._tables(connection)
+        scores: List[Any] = [
+            value
+            for window, _, score in trending.rows({question_id: [created_at]})
+            for value in (window, score)
+        ]
+        scores_source: str = (
+            "SELECT scores.column1, question.id, scores.column2 FROM question "
+            f"CROSS JOIN ({trending.values_sql(len(scores) // 2, 2)}) AS scores"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH question AS (UPDATE {questions} "
+                "SET answers_count = answers_count + 1 "
+                "WHERE id = %s RETURNING id), "
+                f"answer AS (INSERT INTO {answers} ({columns}) "
+                "SELECT id, %s, %s, %s FROM question RETURNING id), "
+                f"trending AS ({trending.add_sql(connection, scores_source)}) "
+                "SELECT id FROM answer",
+                [question_id, *values, *scores],
+            )
+            row: Optional[Tuple[Any, ...]] = cursor.fetchone()
+        return row[0] if row else None
+
+    def _insert_returning(
+        self,
+        connection: Any,
+        question_id: int,
+        values: List[Any],
+        created_at: datetime.datetime,
+    ) -> Optional[int]:
+        answers, questions, columns = self._tables(connection)
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {answers} ({columns}) "
+                f"SELECT id, %s, %s, %s FROM {questions} WHERE id = %s "
+                "RETURNING id",
+                [*values, question_id],
+            )
+            row: Optional[Tuple[Any, ...]] = cursor.fetchone()
+            if row is None:
+                return None
+            cursor.execute(
+                f"UPDATE {questions} SET answers_count = answers_count + 1 "
+                "WHERE id = %s",
+                [question_id],
+            )
+            trending.add({question_id: [created_at]}, self.db)
+        answer_id: int = row[0]
+        return answer_id
+
+    def delete(self) -> Tuple[int, Dict[str, int]]:
+        # Даты удаляемых ответов нужны для вычитания из счетов trending.
+        with transaction.atomic(using=self.db):
+            deleted: Dict[int, List[datetime.datetime]] = {}
+            for question_id, created_at in self.order_by().values_list(
+                "question_id", "created_at"
+            ):
+                deleted.setdefault(question_id, []).append(created_at)
+            result: Tuple[int, Dict[str, int]] = super().delete()
+            Question.objects.using(self.db).add_answers(
+                {question_id: -len(dates) for question_id, dates in deleted.items()}
+            )
+            trending.remove(deleted, self.db)
+        return result
 
 
 class Question(models.Model):
@@ -12,12 +207,25 @@ class Question(models.Model):
         verbose_name: ClassVar[str] = "Вопрос"
         verbose_name_plural: ClassVar[str] = "Вопросы"
         ordering: ClassVar[list[str]] = ["-created_at"]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="question_created_at_id_idx",
+            ),
+        ]
 
     text: models.TextField = models.TextField(verbose_name="Текст вопроса", blank=False)
     created_at: models.DateTimeField = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Дата создания вопроса",
     )
+    answers_count: models.PositiveIntegerField = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Ответы",
+    )
+
+    objects: ClassVar[models.Manager] = QuestionQuerySet.as_manager()
 
     def __str__(self) -> str:
         """Строковое представление вопроса."""
@@ -36,7 +244,14 @@ class Answer(models.Model):
         verbose_name_plural: ClassVar[str] = "Ответы"
         ordering: ClassVar[list[str]] = ["created_at"]
         indexes: ClassVar[list[models.Index]] = [
-            models.Index(fields=["user_id"]),
+            models.Index(
+                fields=["user_id", "created_at", "id"],
+                name="answer_user_created_id_idx",
+            ),
+            models.Index(
+                fields=["question_id", "created_at", "id"],
+                name="answer_question_created_id_idx",
+            ),
         ]
 
     question_id: models.ForeignKey = models.ForeignKey(
@@ -55,6 +270,100 @@ class Answer(models.Model):
         verbose_name="Дата создания ответа",
     )
 
+    objects: ClassVar[models.Manager] = AnswerQuerySet.as_manager()
+
     def __str__(self) -> str:
         """Строковое представление ответа."""
         return f"Ответ #{self.id} к вопросу #{self.question_id}"
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Сохраняет ответ; при создании увеличивает answers_count вопроса."""
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic(using=kwargs.get("using") or self._state.db):
+            super().save(*args, **kwargs)
+            Question.objects.using(self._state.db).add_answers({self.question_id_id: 1})
+            trending.add({self.question_id_id: [self.created_at]}, self._state.db)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        """Удаляет ответ и уменьшает answers_count вопроса."""
+        with transaction.atomic(using=kwargs.get("using") or self._state.db):
+            result: Tuple[int, Dict[str, int]] = super().delete(*args, **kwargs)
+            Question.objects.using(self._state.db).add_answers(
+                {self.question_id_id: -1}
+            )
+            trending.remove({self.question_id_id: [self.created_at]}, self._state.db)
+        return result
+
+
+class ImportCheckpoint(models.Model):
+    """Позиция потокового импорта файла для возобновления после прерывания."""
+
+    class Meta:
+        """Метаданные модели ImportCheckpoint."""
+
+        verbose_name: ClassVar[str] = "Позиция импорта"
+        verbose_name_plural: ClassVar[str] = "Позиции импорта"
+
+    source: models.CharField = models.CharField(
+        max_length=512,
+        unique=True,
+        verbose_name="Источник",
+    )
+    rows_read: models.BigIntegerField = models.BigIntegerField(
+        default=0,
+        verbose_name="Прочитано записей",
+    )
+    rows_imported: models.BigIntegerField = models.BigIntegerField(
+        default=0,
+        verbose_name="Импортировано записей",
+    )
+    completed: models.BooleanField = models.BooleanField(
+        default=False,
+        verbose_name="Импорт завершен",
+    )
+    updated_at: models.DateTimeField = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата обновления",
+    )
+
+    def __str__(self) -> str:
+        """Строковое представление позиции импорта."""
+        return f"{self.source}: {self.rows_read}"
+
+
+class TrendingScore(models.Model):
+    """
+    Счет активности вопроса в окне рейтинга trending.
+
+    ``score`` — логарифм суммы затухающих вкладов ответов (см.
+    api_qa/trending.py); NULL — ответов в окне не осталось.
+    """
+
+    class Meta:
+        """Метаданные модели TrendingScore."""
+
+        verbose_name: ClassVar[str] = "Счет активности"
+        verbose_name_plural: ClassVar[str] = "Счета активности"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=["window", "question"], name="trending_window_question_uniq"
+            ),
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=["window", "-score"], name="trending_window_score_idx"),
+        ]
+
+    question: models.ForeignKey = models.ForeignKey(
+        to=Question,
+        on_delete=models.CASCADE,
+        related_name="trending_scores",
+        verbose_name="Вопрос",
+    )
+    window: models.CharField = models.CharField(max_length=16, verbose_name="Окно")
+    score: models.FloatField = models.FloatField(null=True, verbose_name="Счет")
+
+    def __str__(self) -> str:
+        """Строковое представление счета."""
+        return f"{self.window}: вопрос #{self.question_id}"
@@ -0,0 +1,62 @@
+"""Служебные эндпоинты: liveness, readiness и метрики Prometheus."""
+
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from . import routers
+from .metrics import CONTENT_TYPE, merge, registry, render
+
+
+@require_GET
+def health(request: HttpRequest) -> JsonResponse:
+    """Liveness: процесс запущен и обрабатывает запросы, БД не проверяется."""
+
+    return JsonResponse({"status": "ok"})
+
+
+@require_GET
+def ready(request: HttpRequest) -> JsonResponse:
+    """
+    Readiness: проверяет primary и каждую реплику запросом ``SELECT 1``.
+
+    Возвращает время проверки в миллисекундах. При ошибке primary
+    отвечает 503, чтобы балансировщик не направлял запросы в воркер;
+    недоступная реплика только исключается из чтений (routers.mark_down).
+    """
+
+    databases: Dict[str, Dict[str, Any]] = {}
+    for alias in [DEFAULT_DB_ALIAS, *settings.QA_DB_REPLICAS]:
+        started: float = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        except DatabaseError as exc:
+            databases[alias] = {"ok": False, "error": str(exc)}
+            if alias != DEFAULT_DB_ALIAS:
+                routers.mark_down(alias)
+            continue
+        if alias != DEFAULT_DB_ALIAS:
+            routers.mark_up(alias)
+        databases[alias] = {
+            "ok": True,
+            "time_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    is_ready: bool = databases[DEFAULT_DB_ALIAS]["ok"]
+    return JsonResponse(
+        {"status": "ok" if is_ready else "unavailable", "databases": databases},
+        status=200 if is_ready else 503,
+    )
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Отдает метрики всех воркеров в текстовом формате Prometheus."""
+
+    return HttpResponse(render(merge(registry.collect())), content_type=CONTENT_TYPE)
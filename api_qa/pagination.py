@@ -0,0 +1,376 @@
+import base64
+import binascii
+import json
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM: str = "pagination"
+CURSOR_MODE: str = "cursor"
+
+
+SEARCH_QUERY_PARAM: str = "q"
+
+
+def is_cursor_requested(request: Request) -> bool:
+    """Проверяет, запросил ли клиент курсорную (keyset) пагинацию."""
+
+    return (
+        request.query_params.get(PAGINATION_QUERY_PARAM) == CURSOR_MODE
+        or "cursor" in request.query_params
+    )
+
+
+def get_search_query(request: Request) -> str:
+    """Возвращает поисковый запрос из параметра ``q`` или пустую строку."""
+
+    query: str = request.query_params.get(SEARCH_QUERY_PARAM, "")
+    return query.strip()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) пагинация по составному ключу.
+
+    В отличие от PageNumberPagination не выполняет COUNT(*) и OFFSET:
+    каждая страница выбирается условием вида ``(created_at, id) < (c, i)``
+    по составному индексу, поэтому время ответа не зависит от глубины.
+    Курсоры next/previous непрозрачны для клиента (base64 от JSON).
+    """
+
+    #: Поля упорядочивания; последнее поле должно быть уникальным.
+    ordering: ClassVar[Tuple[str, ...]] = ("-created_at", "-id")
+    cursor_query_param: ClassVar[str] = "cursor"
+    page_size_query_param: ClassVar[str] = "page_size"
+    max_page_size: ClassVar[int] = 100
+    invalid_cursor_message: ClassVar[str] = "Некорректный курсор."
+
+    def __init__(self) -> None:
+        self.page_size: int = api_settings.PAGE_SIZE or 10
+        self.base_url: Optional[str] = None
+        self.has_next: bool = False
+        self.has_previous: bool = False
+        self.next_position: Optional[Dict[str, Any]] = None
+        self.previous_position: Optional[Dict[str, Any]] = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> List[Any]:
+        """Возвращает одну страницу queryset, начиная с позиции курсора."""
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        cursor: Optional[Dict[str, Any]] = self.decode_cursor(request, queryset)
+        return self.fetch_page(queryset, cursor)
+
+    def paginate_first_page(
+        self, queryset: QuerySet, base_url: str, page_size: int
+    ) -> List[Any]:
+        """
+        Возвращает первую страницу без объекта запроса.
+
+        Используется для ограниченных вложенных списков (например, первые
+        N ответов в детальном ответе вопроса), ссылка next при этом строится
+        от переданного base_url.
+        """
+
+        self.page_size = page_size
+        self.base_url = base_url
+        return self.fetch_page(queryset, None)
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> List[Any]:
+        """Асинхронный вариант paginate_queryset для async views."""
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        cursor: Optional[Dict[str, Any]] = self.decode_cursor(request, queryset)
+        return await self.afetch_page(queryset, cursor)
+
+    async def apaginate_first_page(
+        self, queryset: QuerySet, base_url: str, page_size: int
+    ) -> List[Any]:
+        """Асинхронный вариант paginate_first_page."""
+
+        self.page_size = page_size
+        self.base_url = base_url
+        return await self.afetch_page(queryset, None)
+
+    def fetch_page(
+        self, queryset: QuerySet, cursor: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        """Выбирает page_size записей после позиции курсора одним запросом."""
+
+        return self._finish_page(list(self._page_queryset(queryset, cursor)), cursor)
+
+    async def afetch_page(
+        self, queryset: QuerySet, cursor: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        """Асинхронный вариант fetch_page через async итерацию queryset."""
+
+        rows: QuerySet = self._page_queryset(queryset, cursor)
+        return self._finish_page([item async for item in rows], cursor)
+
+    def _page_queryset(
+        self, queryset: QuerySet, cursor: Optional[Dict[str, Any]]
+    ) -> QuerySet:
+        ordering: Sequence[str] = self.ordering
+        if cursor and cursor["r"]:
+            ordering = [self._invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, cursor["v"]))
+        return queryset[: self.page_size + 1]
+
+    def _finish_page(
+        self, results: List[Any], cursor: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        reverse: bool = bool(cursor and cursor["r"])
+        has_more: bool = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        if results:
+            self.next_position = {"v": self.position_of(results[-1]), "r": False}
+            self.previous_position = {"v": self.position_of(results[0]), "r": True}
+        elif cursor is not None:
+            # Пустая страница: обе ссылки указывают на исходную позицию.
+            self.next_position = {"v": cursor["v"], "r": False}
+            self.previous_position = {"v": cursor["v"], "r": True}
+        return results
+
+    def get_paginated_response(self, data: Any) -> Response:
+        """Формирует ответ без общего количества записей."""
+
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def to_html(self) -> str:
+        # display_page_controls ложно: browsable API не выводит элементы
+        # управления страницами, ссылки next/previous есть в самом ответе.
+        return ""
+
+    def get_page_size(self, request: Request) -> int:
+        """Возвращает размер страницы с учетом параметра запроса."""
+
+        raw: Optional[str] = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            value: int = int(raw)
+        except ValueError:
+            return self.page_size
+        if value <= 0:
+            return self.page_size
+        return min(value, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position)
+
+    def position_of(self, item: Any) -> List[Any]:
+        """Извлекает значения ключа из объекта модели или словаря."""
+
+        position: List[Any] = []
+        for field in self.ordering:
+            name: str = field.lstrip("-")
+            value: Any = item[name] if isinstance(item, dict) else getattr(item, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def seek_filter(self, ordering: Sequence[str], values: Sequence[Any]) -> Q:
+        """
+        Строит условие «строго после позиции» для составного ключа.
+
+        Для ключа (a, b) по убыванию получается
+        ``a < va OR (a = va AND b < vb)``.
+        """
+
+        condition: Q = Q()
+        for index in range(len(ordering) - 1, -1, -1):
+            field: str = ordering[index]
+            name: str = field.lstrip("-")
+            lookup: str = "lt" if field.startswith("-") else "gt"
+            step: Q = Q(**{f"{name}__{lookup}": values[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{name: values[index]}) & condition
+            condition = step
+        return condition
+
+    def encode_cursor(self, position: Dict[str, Any]) -> str:
+        """Кодирует позицию в непрозрачный токен и подставляет его в URL."""
+
+        raw: bytes = json.dumps(position, separators=(",", ":")).encode("utf-8")
+        token: str = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        url: str = replace_query_param(
+            self.base_url or "", self.cursor_query_param, token
+        )
+        return url
+
+    def decode_cursor(
+        self, request: Request, queryset: QuerySet
+    ) -> Optional[Dict[str, Any]]:
+        """Декодирует курсор из запроса; None означает первую страницу."""
+
+        token: Optional[str] = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded: str = token + "=" * (-len(token) % 4)
+            position: Any = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values: List[Any] = position["v"]
+            reverse: bool = bool(position.get("r", False))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            values = [
+                self._to_python(queryset, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return {"v": values, "r": reverse}
+
+    @staticmethod
+    def _invert(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _to_python(queryset: QuerySet, name: str, value: Any) -> Any:
+        try:
+            return queryset.model._meta.get_field(name).to_python(value)
+        except FieldDoesNotExist:
+            # Аннотированные поля (например, ранг поиска) передаются как есть.
+            return value
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination с асинхронной выборкой страницы.
+
+    Ответ совпадает с синхронной пагинацией DRF; COUNT(*) и выборка
+    страницы выполняются через async ORM.
+    """
+
+    def __init__(self) -> None:
+        # Атрибуты, которые paginate_queryset DRF задает при выборке страницы.
+        self.request: Optional[Request] = None
+        self.page: Optional[Page] = None
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> Optional[List[Any]]:
+        self.request = request
+        page_size: Optional[int] = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number: Any = self.get_page_number(request, paginator)
+        try:
+            number: int = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            ) from exc
+
+        bottom: int = (number - 1) * paginator.per_page
+        rows: QuerySet = queryset[bottom : bottom + paginator.per_page]
+        self.page = Page([item async for item in rows], number, paginator)
+        return list(self.page)
+
+
+class QuestionCursorPagination(KeysetPagination):
+    """Keyset пагинация списка вопросов по (-created_at, -id)."""
+
+    ordering: ClassVar[Tuple[str, ...]] = ("-created_at", "-id")
+
+
+class AnswerCursorPagination(KeysetPagination):
+    """Keyset пагинация ответов на вопрос по (created_at, id)."""
+
+    ordering: ClassVar[Tuple[str, ...]] = ("created_at", "id")
+
+
+class SearchCursorPagination(KeysetPagination):
+    """Keyset пагинация результатов поиска по (-rank, -id)."""
+
+    ordering: ClassVar[Tuple[str, ...]] = ("-rank", "-id")
+
+
+class UserAnswerCursorPagination(KeysetPagination):
+    """
+    Keyset пагинация ответов пользователя по (-created_at, -id).
+
+    Первая страница дополнительно содержит ``count`` — число ответов
+    пользователя с учетом фильтров. Подсчет идет по тому же индексу
+    (user_id, created_at, id), что и выборка страницы, и не повторяется
+    на следующих страницах.
+    """
+
+    ordering: ClassVar[Tuple[str, ...]] = ("-created_at", "-id")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.count: Optional[int] = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> List[Any]:
+        page: List[Any] = super().paginate_queryset(queryset, request, view)
+        if self.cursor_query_param not in request.query_params:
+            self.count = queryset.order_by().count()
+        return page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        response: Response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
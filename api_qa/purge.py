@@ -0,0 +1,106 @@
+"""
+Удаление вопросов с большим числом ответов.
+
+Обычное удаление вопроса выполняет один ``DELETE`` всех его ответов:
+на сотнях тысяч строк такая транзакция долго держит блокировки и
+нагружает WAL и реплики. Вопросы, у которых ответов больше
+QA_PURGE_ASYNC_THRESHOLD, удаляются в фоновом потоке: ответы — пачками
+по QA_PURGE_BATCH_SIZE, каждая в своей короткой транзакции, затем сам
+вопрос. Если процесс завершится посреди удаления, повторный DELETE
+продолжит его с оставшихся ответов.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from . import routers
+from .cache import invalidate_question
+from .models import Answer, Question
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="qa-purge"
+)
+_lock: threading.Lock = threading.Lock()
+_pending: Dict[int, Future] = {}
+
+
+def is_large(question: Question) -> bool:
+    """Возвращает True, если вопрос нужно удалять в фоне."""
+
+    threshold: int = settings.QA_PURGE_ASYNC_THRESHOLD
+    return bool(threshold) and question.answers_count > threshold
+
+
+def purge_question(question_id: int) -> int:
+    """
+    Удаляет ответы вопроса пачками, затем сам вопрос.
+
+    Пачка выбирается по индексу (question_id, created_at, id) и удаляется
+    по первичному ключу; answers_count уменьшается вместе с каждой
+    пачкой. Возвращает число удаленных ответов.
+    """
+
+    deleted: int = 0
+    with routers.use_primary():
+        while True:
+            with transaction.atomic():
+                ids: List[int] = list(
+                    Answer.objects.filter(question_id=question_id)
+                    .order_by("created_at", "id")
+                    .values_list("id", flat=True)[: settings.QA_PURGE_BATCH_SIZE]
+                )
+                if not ids:
+                    break
+                deleted += Answer.objects.filter(id__in=ids).delete()[0]
+        Question.objects.filter(id=question_id).delete()
+    invalidate_question(question_id)
+    return deleted
+
+
+def schedule(question_id: int) -> Future:
+    """
+    Запускает фоновое удаление вопроса.
+
+    Повторный вызов для вопроса, который еще удаляется, возвращает уже
+    запущенную задачу.
+    """
+
+    with _lock:
+        future: Future | None = _pending.get(question_id)
+        if future is None:
+            future = _executor.submit(_run, question_id)
+            _pending[question_id] = future
+        return future
+
+
+def wait() -> None:
+    """Дожидается завершения всех запущенных удалений (для тестов и команд)."""
+
+    with _lock:
+        futures: List[Future] = list(_pending.values())
+    for future in futures:
+        future.result()
+
+
+def _run(question_id: int) -> int:
+    try:
+        deleted: int = purge_question(question_id)
+        logger.info(
+            "Purged question #%s with %s answers in background", question_id, deleted
+        )
+        return deleted
+    except Exception:
+        logger.exception("Background purge of question #%s failed", question_id)
+        raise
+    finally:
+        with _lock:
+            _pending.pop(question_id, None)
+        # Поток не обслуживает HTTP запросы: соединения закрываются вручную.
+        connections.close_all()
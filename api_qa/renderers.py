@@ -0,0 +1,115 @@
+"""
+Быстрые JSON рендерер и парсер для DRF на orjson.
+
+orjson (необязательная зависимость) кодирует ответы в несколько раз
+быстрее стандартного модуля json. Вывод совпадает с JSONRenderer DRF
+побайтно: компактный JSON в UTF-8, UUID — строкой, даты — через
+JSONEncoder DRF (ISO 8601, UTC как ``Z``), символы U+2028 и U+2029
+экранируются после кодирования, как это делает DRF. Если orjson не
+установлен или запрошен формат, который он не поддерживает (отступы,
+кодировка не UTF-8), используются стандартные реализации DRF.
+"""
+
+import importlib
+from types import ModuleType
+from typing import IO, Any, Mapping, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+orjson: Optional[ModuleType]
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+#: Опции orjson: даты кодируются в _default, как в DRF; нестроковые
+#: ключи словарей допускаются, как в модуле json.
+ORJSON_OPTIONS: int = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+#: Разделители строк, которые DRF экранирует для вставки JSON в <script>.
+LINE_SEPARATORS: Mapping[bytes, bytes] = {
+    "\u2028".encode(): b"\\u2028",
+    "\u2029".encode(): b"\\u2029",
+}
+
+_encoder: JSONEncoder = JSONEncoder()
+
+
+def is_available() -> bool:
+    """Проверяет, установлен ли orjson."""
+
+    return orjson is not None
+
+
+def _default(value: Any) -> Any:
+    # Типы, которые orjson не кодирует сам, — как JSONEncoder DRF.
+    return _encoder.default(value)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer DRF с кодированием через orjson."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if (
+            orjson is None
+            or not self._is_default_format()
+            or self.get_indent(accepted_media_type or "", renderer_context or {})
+        ):
+            return self._render_drf(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        try:
+            rendered: bytes = orjson.dumps(
+                data, default=_default, option=ORJSON_OPTIONS
+            )
+        except TypeError:
+            # Например, ключи словаря, которые orjson не поддерживает.
+            return self._render_drf(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS.items():
+            if separator in rendered:
+                rendered = rendered.replace(separator, escaped)
+        return rendered
+
+    def _render_drf(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str],
+        renderer_context: Optional[Mapping[str, Any]],
+    ) -> bytes:
+        rendered: bytes = super().render(data, accepted_media_type, renderer_context)
+        return rendered
+
+    def _is_default_format(self) -> bool:
+        # orjson всегда пишет компактный JSON в UTF-8 без экранирования.
+        return bool(self.compact and not self.ensure_ascii and self.strict)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser DRF с разбором через orjson."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        encoding: str = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
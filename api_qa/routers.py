@@ -0,0 +1,91 @@
+"""
+Маршрутизация запросов к БД между primary и репликами.
+
+Чтения уходят на реплики из QA_DB_REPLICAS по кругу, записи — на
+``default``. ReplicaRoutingMiddleware закрепляет за primary запросы с
+небезопасными методами и запросы клиента в течение
+QA_DB_PRIMARY_STICKY секунд после его записи (cookie), чтобы клиент
+сразу читал свои изменения несмотря на отставание реплик. Реплика, не
+ответившая на проверку ``ready/``, пропускается QA_DB_REPLICA_RETRY
+секунд.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY: str = DEFAULT_DB_ALIAS
+_pinned: ContextVar[bool] = ContextVar("qa_db_pinned", default=False)
+_counter: Iterator[int] = itertools.count()
+_down_until: Dict[str, float] = {}
+_lock: threading.Lock = threading.Lock()
+
+
+def is_pinned() -> bool:
+    """Возвращает True, если чтения текущего запроса идут на primary."""
+
+    return _pinned.get() or not settings.QA_DB_REPLICAS
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Направляет все чтения внутри блока на primary."""
+
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def mark_down(alias: str) -> None:
+    """Исключает реплику из чтений на QA_DB_REPLICA_RETRY секунд."""
+
+    with _lock:
+        _down_until[alias] = time.monotonic() + settings.QA_DB_REPLICA_RETRY
+
+
+def mark_up(alias: str) -> None:
+    with _lock:
+        _down_until.pop(alias, None)
+
+
+def available_replicas() -> List[str]:
+    """Возвращает реплики, которые сейчас не исключены из чтений."""
+
+    now: float = time.monotonic()
+    with _lock:
+        return [
+            alias
+            for alias in settings.QA_DB_REPLICAS
+            if _down_until.get(alias, 0.0) <= now
+        ]
+
+
+class ReplicaRouter:
+    """Роутер Django: чтения — на реплики по кругу, записи — на primary."""
+
+    def db_for_read(self, _model: Any, **hints: Any) -> Optional[str]:
+        if hints.get("instance") is not None:
+            # Без ответа роутера Django читает связанные объекты из той же
+            # базы, что и сам объект.
+            return None
+        if is_pinned():
+            return PRIMARY
+        replicas: List[str] = available_replicas()
+        if not replicas:
+            return PRIMARY
+        return replicas[next(_counter) % len(replicas)]
+
+    def db_for_write(self, _model: Any, **_hints: Any) -> Optional[str]:
+        return PRIMARY
+
+    def allow_relation(self, _obj1: Any, _obj2: Any, **_hints: Any) -> Optional[bool]:
+        # Реплики содержат те же данные, что и primary.
+        return True
@@ -1,7 +1,8 @@
-from typing import ClassVar, List
+from typing import Any, ClassVar, Dict, List
 
 from rest_framework import serializers
 
+from .fast import answers_preview
 from .models import Answer, Question
 
 
@@ -25,28 +26,43 @@ class AnswerSerializer(serializers.ModelSerializer):
 
 
 class QuestionListSerializer(serializers.ModelSerializer):
-    """Сериализатор для списка вопросов (только ID и текст)."""
+    """Сериализатор для списка вопросов (ID, текст и количество ответов)."""
 
     class Meta:
         """Метаданные сериализатора списка вопросов."""
 
         model: ClassVar[type[Question]] = Question
-        fields: ClassVar[List[str]] = ["id", "text"]
-        read_only_fields: ClassVar[List[str]] = ["id"]
+        fields: ClassVar[List[str]] = ["id", "text", "answers_count"]
+        read_only_fields: ClassVar[List[str]] = ["id", "answers_count"]
 
 
 class QuestionDetailSerializer(serializers.ModelSerializer):
-    """Сериализатор для детального просмотра вопроса (все поля + ответы)."""
+    """
+    Сериализатор для детального просмотра вопроса.
 
-    answers: AnswerSerializer = AnswerSerializer(many=True, read_only=True)
+    Вместо всех ответов возвращает первые QA_DETAIL_ANSWERS_LIMIT ответов
+    и ссылку ``answers_next`` на продолжение списка в
+    ``GET /questions/<id>/answers/``.
+    """
 
     class Meta:
         """Метаданные сериализатора детального просмотра вопроса."""
 
         model: ClassVar[type[Question]] = Question
-        fields: ClassVar[List[str]] = ["id", "text", "created_at", "answers"]
+        fields: ClassVar[List[str]] = ["id", "text", "created_at"]
         read_only_fields: ClassVar[List[str]] = ["id", "created_at"]
 
+    def to_representation(self, instance: Question) -> Dict[str, Any]:
+        """Добавляет ограниченный список ответов и курсор продолжения."""
+
+        data: Dict[str, Any] = super().to_representation(instance)
+        answers, answers_next = answers_preview(
+            instance.id, self.context.get("request")
+        )
+        data["answers"] = AnswerSerializer(answers, many=True).data
+        data["answers_next"] = answers_next
+        return data
+
 
 class AnswerCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания ответа."""
@@ -58,3 +74,14 @@ class AnswerCreateSerializer(serializers.ModelSerializer):
 
         model: ClassVar[type[Answer]] = Answer
         fields: ClassVar[List[str]] = ["user_id", "text"]
+
+
+class AnswerBulkItemSerializer(AnswerCreateSerializer):
+    """Сериализатор элемента пакетного создания ответов к разным вопросам."""
+
+    question_id: serializers.IntegerField = serializers.IntegerField(min_value=1)
+
+    class Meta(AnswerCreateSerializer.Meta):
+        """Метаданные сериализатора элемента пакета."""
+
+        fields: ClassVar[List[str]] = ["question_id", "user_id", "text"]
@@ -0,0 +1,18 @@
+from typing import Any, TypeVar
+
+from django.test import override_settings
+
+T = TypeVar("T")
+
+
+def assert_query_budgets(target: T) -> T:
+    """
+    Декоратор класса или метода теста, проверяющий бюджеты SQL запросов.
+
+    Внутри теста запрос, превысивший бюджет своего маршрута
+    (QA_QUERY_BUDGETS), завершается исключением QueryBudgetExceeded,
+    которое тестовый клиент пробрасывает в тест.
+    """
+
+    decorated: Any = override_settings(QA_QUERY_BUDGET_STRICT=True)(target)
+    return decorated
@@ -0,0 +1,38 @@
+"""
+Фабрики тестовых данных на factory-boy (dev зависимость).
+
+Фабрики только строят объекты (``build_batch``), а сохраняются они
+пакетно через ``bulk_create``: так заполняются наборы из сотен тысяч
+строк. Последовательность данных задается ``seed`` (см. reseed).
+"""
+
+import factory
+import factory.random
+
+from api_qa.models import Answer, Question
+
+
+def reseed(seed: int) -> None:
+    """Делает данные фабрик воспроизводимыми (factory-boy и Faker)."""
+
+    factory.random.reseed_random(seed)
+
+
+class QuestionFactory(factory.django.DjangoModelFactory):
+    """Фабрика вопросов."""
+
+    class Meta:
+        model = Question
+
+    text = factory.Faker("sentence", nb_words=8)
+
+
+class AnswerFactory(factory.django.DjangoModelFactory):
+    """Фабрика ответов; вопрос передается параметром ``question_id``."""
+
+    class Meta:
+        model = Answer
+
+    question_id = factory.SubFactory(QuestionFactory)
+    user_id = factory.Faker("uuid4", cast_to=None)
+    text = factory.Faker("paragraph", nb_sentences=3)
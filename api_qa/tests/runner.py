@@ -0,0 +1,31 @@
+import unittest
+from typing import Any, Type
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+
+
+def clear_caches() -> None:
+    """Очищает все созданные в процессе кэши."""
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+
+
+class QATestRunner(DiscoverRunner):
+    """
+    Тестовый раннер, очищающий кэши перед каждым тестом.
+
+    LocMemCache живет весь прогон, а id вопросов в SQLite после отката
+    транзакции теста выдаются заново: без очистки тест получил бы
+    версии и ответы, закэшированные предыдущим.
+    """
+
+    def get_resultclass(self) -> Type[Any]:
+        base: Type[Any] = super().get_resultclass() or unittest.TextTestResult
+
+        class CacheClearingResult(base):
+            def startTest(self, test: unittest.TestCase) -> None:
+                clear_caches()
+                super().startTest(test)
+
+        return CacheClearingResult
@@ -0,0 +1,73 @@
+import uuid
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api_qa.admin import LargeTablePaginator
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+
+@assert_query_budgets
+class LargeTableAdminTest(TestCase):
+    """Тесты админки в режиме больших таблиц."""
+
+    def setUp(self) -> None:
+        """Подготовка суперпользователя, вопросов и ответов."""
+        user: Any = get_user_model().objects.create_superuser(
+            "admin", "admin@example.com", "pw"
+        )
+        self.client.force_login(user)
+        self.question: Question = Question.objects.create(text="Admin question?")
+        self.other: Question = Question.objects.create(text="Other question?")
+        Answer.objects.bulk_create(
+            Answer(question_id=question, user_id=uuid.uuid4(), text=f"Answer {index}")
+            for index, question in enumerate([self.question] * 5 + [self.other])
+        )
+
+    def test_filtered_count_is_capped(self) -> None:
+        """Тестирует ограничение COUNT(*) для отфильтрованного списка."""
+        with override_settings(QA_ADMIN_COUNT_LIMIT=3):
+            paginator = LargeTablePaginator(
+                Answer.objects.filter(question_id=self.question), 2
+            )
+            self.assertEqual(paginator.count, 3)
+        self.assertEqual(LargeTablePaginator(Answer.objects.all(), 2).count, 6)
+
+    def test_answer_changelist_filters_by_question(self) -> None:
+        """Тестирует фильтр по id вопроса без вывода всех вопросов."""
+        url: str = reverse("admin:api_qa_answer_changelist")
+        response = self.client.get(url, {"question": self.other.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 1)
+        self.assertContains(response, f"#{self.other.id}: Other question?")
+        self.assertNotContains(response, "Admin question?")
+
+    def test_invalid_question_filter(self) -> None:
+        """Тестирует некорректный id вопроса в фильтре."""
+        url: str = reverse("admin:api_qa_answer_changelist")
+        response = self.client.get(url, {"question": "abc"})
+        self.assertRedirects(response, f"{url}?e=1")
+
+    @override_settings(QA_ADMIN_INLINE_ANSWERS=2)
+    def test_inline_is_capped(self) -> None:
+        """Тестирует ограничение числа ответов на странице вопроса."""
+        url: str = reverse("admin:api_qa_question_change", args=[self.question.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        inline = response.context["inline_admin_formsets"][0]
+        self.assertEqual(len(inline.formset.forms), 2)
+        self.assertFalse(inline.has_add_permission)
+        self.assertContains(response, "Все ответы (5)")
+
+    def test_question_changelist_search(self) -> None:
+        """Тестирует поиск вопросов в админке через полнотекстовый индекс."""
+        url: str = reverse("admin:api_qa_question_changelist")
+        response = self.client.get(url, {"q": "other"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [question.id for question in response.context["cl"].result_list],
+            [self.other.id],
+        )
@@ -0,0 +1,123 @@
+import uuid
+from typing import Dict, List
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+ASYNC_URLCONF: str = "api_qa.tests.urls_async"
+
+
+@assert_query_budgets
+class AsyncViewsTest(TestCase):
+    """Тесты async views: те же URL и побайтно те же ответы, что у DRF views."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов с ответами."""
+        self.questions: List[Question] = [
+            Question.objects.create(text=f"Async question {index}?")
+            for index in range(12)
+        ]
+        self.question: Question = self.questions[0]
+        self.answer: Answer = Answer.objects.create(
+            question_id=self.question, user_id=uuid.uuid4(), text="First answer"
+        )
+        Answer.objects.bulk_create(
+            Answer(question_id=self.question, user_id=uuid.uuid4(), text=f"A{index}")
+            for index in range(25)
+        )
+
+    def _assert_same(self, path: str, params: Dict[str, str] | None = None) -> None:
+        expected = self.client.get(path, params)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            actual = self.client.get(path, params)
+        self.assertEqual(actual.status_code, expected.status_code, path)
+        self.assertEqual(actual.content, expected.content, path)
+
+    def test_get_responses_match_sync_views(self) -> None:
+        """Тестирует совпадение ответов GET эндпоинтов."""
+        detail: str = reverse("question-detail", kwargs={"pk": self.question.id})
+        answers: str = reverse(
+            "answer-create", kwargs={"question_id": self.question.id}
+        )
+        self._assert_same(reverse("question-list"))
+        self._assert_same(reverse("question-list"), {"page": "2"})
+        self._assert_same(reverse("question-list"), {"page": "99"})
+        self._assert_same(reverse("question-list"), {"pagination": "cursor"})
+        self._assert_same(reverse("question-list"), {"q": "async"})
+        self._assert_same(detail)
+        self._assert_same(reverse("question-detail", kwargs={"pk": 999}))
+        self._assert_same(answers)
+        self._assert_same(answers, {"cursor": "broken"})
+        self._assert_same(reverse("answer-create", kwargs={"question_id": 999}))
+        self._assert_same(reverse("answer-detail", kwargs={"pk": self.answer.id}))
+        self._assert_same(reverse("answer-detail", kwargs={"pk": 999}))
+
+    def test_unpaginated_list_matches(self) -> None:
+        """Тестирует список вопросов без пагинации (PAGE_SIZE не задан)."""
+        with mock.patch.object(PageNumberPagination, "page_size", None):
+            self._assert_same(reverse("question-list"))
+
+    def test_cursor_next_page_matches(self) -> None:
+        """Тестирует переход по ссылке next из async ответа."""
+        url: str = reverse("answer-create", kwargs={"question_id": self.question.id})
+        first = self.client.get(url).json()
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            self.assertEqual(self.client.get(url).json(), first)
+            second = self.client.get(first["next"])
+        self.assertEqual(second.content, self.client.get(first["next"]).content)
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    def test_create_and_delete(self) -> None:
+        """Тестирует создание и удаление через async views."""
+        response = self.client.post(reverse("question-list"), {"text": "New?"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["answers"], [])
+        question: Question = Question.objects.get(id=response.json()["id"])
+
+        url: str = reverse("answer-create", kwargs={"question_id": question.id})
+        response = self.client.post(
+            url,
+            {"user_id": str(uuid.uuid4()), "text": "Async answer"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        question.refresh_from_db()
+        self.assertEqual(question.answers_count, 1)
+
+        answer_url: str = reverse("answer-detail", kwargs={"pk": response.json()["id"]})
+        response = self.client.delete(answer_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        question.refresh_from_db()
+        self.assertEqual(question.answers_count, 0)
+
+        response = self.client.delete(
+            reverse("question-detail", kwargs={"pk": question.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Question.objects.filter(id=question.id).exists())
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    def test_validation_errors(self) -> None:
+        """Тестирует формат ошибок валидации и разбора тела запроса."""
+        url: str = reverse("answer-create", kwargs={"question_id": self.question.id})
+        response = self.client.post(url, {"user_id": "bad", "text": ""})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("user_id", response.json())
+        response = self.client.post(url, "{", content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("detail", response.json())
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    async def test_async_client(self) -> None:
+        """Тестирует обработку запроса в event loop через AsyncClient."""
+        response = await self.async_client.get(
+            reverse("answer-detail", kwargs={"pk": self.answer.id})
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["text"], "First answer")
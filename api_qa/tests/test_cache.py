@@ -0,0 +1,173 @@
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_qa.cache import question_detail_cache, question_list_version
+from api_qa.checks import check_shared_cache
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+
+@assert_query_budgets
+class QuestionDetailCacheTest(APITestCase):
+    """Тесты версионированного кэша GET /questions/<id>/."""
+
+    def setUp(self) -> None:
+        """Подготовка вопроса с ответом."""
+        question_detail_cache.reset_stats()
+        self.question: Question = Question.objects.create(text="Cached?")
+        self.answer: Answer = Answer.objects.create(
+            question_id=self.question, user_id=uuid.uuid4(), text="First"
+        )
+        self.detail_url: str = reverse(
+            "question-detail", kwargs={"pk": self.question.id}
+        )
+
+    def test_second_request_is_served_from_cache(self) -> None:
+        """Тестирует попадание в кэш без запросов к БД."""
+        first = self.client.get(self.detail_url)
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(question_detail_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_answer_create_invalidates(self) -> None:
+        """Тестирует инвалидацию кэша при создании ответа."""
+        self.client.get(self.detail_url)
+        self.client.post(
+            reverse("answer-create", kwargs={"question_id": self.question.id}),
+            {"user_id": str(uuid.uuid4()), "text": "Second"},
+        )
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.json()["answers"]), 2)
+
+    def test_answer_delete_invalidates(self) -> None:
+        """Тестирует инвалидацию кэша при удалении ответа."""
+        self.client.get(self.detail_url)
+        self.client.delete(reverse("answer-detail", kwargs={"pk": self.answer.id}))
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["answers"], [])
+
+    def test_question_delete_invalidates(self) -> None:
+        """Тестирует, что удаленный вопрос не отдается из кэша."""
+        self.client.get(self.detail_url)
+        self.client.delete(self.detail_url)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_not_found_is_not_cached(self) -> None:
+        """Тестирует, что ответы 404 не попадают в кэш."""
+        url: str = reverse("question-detail", kwargs={"pk": 999})
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(question_detail_cache.stats()["hits"], 0)
+
+
+@assert_query_budgets
+class QuestionListConditionalTest(APITestCase):
+    """Тесты ETag, Last-Modified и 304 для GET /questions/."""
+
+    url: str = reverse("question-list")
+
+    def setUp(self) -> None:
+        """Подготовка вопроса."""
+        self.question: Question = Question.objects.create(text="Listed?")
+
+    def test_not_modified(self) -> None:
+        """Тестирует 304 по ETag и Last-Modified без запросов к БД."""
+        modified: float = question_list_version.get()[1]
+        with mock.patch("api_qa.conditional.time.time", return_value=modified + 2):
+            first = self.client.get(self.url)
+            self.assertEqual(first.status_code, status.HTTP_200_OK)
+            self.assertIn("public", first["Cache-Control"])
+            self.assertIn("max-age=5", first["Cache-Control"])
+
+            with self.assertNumQueries(0):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response["ETag"], first["ETag"])
+            self.assertIn("max-age=5", response["Cache-Control"])
+
+            response = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_last_modified_within_second(self) -> None:
+        """Тестирует, что Last-Modified не выдается в секунду изменения."""
+        modified: float = question_list_version.get()[1]
+        with mock.patch("api_qa.conditional.time.time", return_value=modified):
+            response = self.client.get(self.url)
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+
+    def test_etag_depends_on_query(self) -> None:
+        """Тестирует разные ETag для разных страниц списка."""
+        first = self.client.get(self.url)
+        response = self.client.get(
+            f"{self.url}?page_size=1", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_writes_change_etag(self) -> None:
+        """Тестирует смену версии списка при записи вопросов и ответов."""
+        answers_url: str = reverse(
+            "answer-create", kwargs={"question_id": self.question.id}
+        )
+        writes = [
+            lambda: self.client.post(self.url, {"text": "Another?"}),
+            lambda: self.client.post(
+                answers_url, {"user_id": str(uuid.uuid4()), "text": "Answer"}
+            ),
+            lambda: self.client.delete(
+                reverse("question-detail", kwargs={"pk": self.question.id})
+            ),
+        ]
+        for write in writes:
+            etag: str = self.client.get(self.url)["ETag"]
+            write()
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(ROOT_URLCONF="api_qa.tests.urls_async")
+    def test_async_view(self) -> None:
+        """Тестирует 304 в async view."""
+        first = self.client.get(self.url)
+        self.assertIn("ETag", first)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """Тесты системной проверки общего кэша (api_qa.E001)."""
+
+    @override_settings(QA_CACHE_REQUIRE_SHARED=True)
+    def test_process_local_cache_is_rejected(self) -> None:
+        """Тестирует ошибку для LocMemCache вне DEBUG."""
+        self.assertEqual([error.id for error in check_shared_cache()], ["api_qa.E001"])
+
+    @override_settings(
+        QA_CACHE_REQUIRE_SHARED=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379/0",
+            }
+        },
+    )
+    def test_shared_cache_passes(self) -> None:
+        """Тестирует отсутствие ошибок для Redis."""
+        self.assertEqual(check_shared_cache(), [])
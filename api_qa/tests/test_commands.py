@@ -0,0 +1,292 @@
+import json
+import shutil
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from api_qa.benchmark import SCENARIOS
+from api_qa.management.commands.reconcile_answers_count import Command
+from api_qa.models import Answer, ImportCheckpoint, Question
+from api_qa.search import search
+from api_qa.urls import build_urlpatterns
+
+
+class ImportDataCommandTest(TestCase):
+    """Тесты команды потокового импорта import_data."""
+
+    def setUp(self) -> None:
+        """Создает временный каталог для файлов импорта."""
+        self.dir: Path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _write_jsonl(self, name: str, records: List[Dict[str, Any]]) -> Path:
+        path: Path = self.dir / name
+        path.write_text(
+            "".join(json.dumps(record) + "\n" for record in records),
+            encoding="utf-8",
+        )
+        return path
+
+    def _import(self, **options: Any) -> str:
+        out: StringIO = StringIO()
+        call_command("import_data", stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_import_jsonl_keeps_ids_and_dates(self) -> None:
+        """Тестирует импорт JSONL с сохранением id и created_at."""
+        questions: Path = self._write_jsonl(
+            "questions.jsonl",
+            [
+                {"id": 10, "text": "Q10", "created_at": "2024-01-01T00:00:00Z"},
+                {"id": 11, "text": "Q11"},
+            ],
+        )
+        answers: Path = self._write_jsonl(
+            "answers.jsonl",
+            [
+                {"question_id": 10, "user_id": str(uuid.uuid4()), "text": "A"},
+                {"question_id": 99, "user_id": str(uuid.uuid4()), "text": "Lost"},
+                {"question_id": 11, "user_id": "bad", "text": "Invalid"},
+            ],
+        )
+        self._import(questions=questions, answers=answers, batch_size=2)
+
+        self.assertEqual(Question.objects.get(id=10).created_at.year, 2024)
+        self.assertEqual(Question.objects.count(), 2)
+        self.assertEqual(Answer.objects.count(), 1)
+        self.assertEqual(Answer.objects.get().question_id_id, 10)
+        self.assertEqual(Question.objects.get(id=10).answers_count, 1)
+        new_question: Question = Question.objects.create(text="After import")
+        self.assertGreater(new_question.id, 11)
+
+    def test_import_csv(self) -> None:
+        """Тестирует импорт CSV."""
+        path: Path = self.dir / "questions.csv"
+        path.write_text("id,text\n1,First\n2,Second\n", encoding="utf-8")
+        self._import(questions=path)
+        self.assertEqual(
+            list(Question.objects.order_by("id").values_list("text", flat=True)),
+            ["First", "Second"],
+        )
+
+    def test_resume_after_interruption(self) -> None:
+        """Тестирует продолжение импорта с сохраненной позиции."""
+        path: Path = self._write_jsonl(
+            "questions.jsonl", [{"text": f"Q{index}"} for index in range(5)]
+        )
+        # Имитация прерванного импорта: первые три записи уже зафиксированы.
+        ImportCheckpoint.objects.create(
+            source=f"questions:{path.resolve()}", rows_read=3, rows_imported=3
+        )
+        self._import(questions=path)
+        self.assertEqual(
+            sorted(Question.objects.values_list("text", flat=True)), ["Q3", "Q4"]
+        )
+
+    def test_completed_import_is_not_repeated(self) -> None:
+        """Тестирует, что повторный запуск не создает дублей."""
+        path: Path = self._write_jsonl("questions.jsonl", [{"text": "Once"}])
+        self._import(questions=path)
+        output: str = self._import(questions=path)
+        self.assertIn("уже импортирован", output)
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_load_test_data(self) -> None:
+        """Тестирует загрузку тестовых данных через потоковый импорт."""
+        call_command("load_test_data", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Question.objects.count(), 3)
+        self.assertEqual(Answer.objects.count(), 3)
+
+
+class ExportDataCommandTest(TestCase):
+    """Тесты команды выгрузки export_data."""
+
+    def test_export_to_file(self) -> None:
+        """Тестирует выгрузку вопросов с ответами в файл NDJSON."""
+        question: Question = Question.objects.create(text="Exported?")
+        Answer.objects.create(question_id=question, user_id=uuid.uuid4(), text="Yes")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "dump.ndjson"
+            call_command("export_data", output=str(path), stderr=StringIO())
+            lines = [json.loads(line) for line in path.read_text().splitlines()]
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["text"], "Exported?")
+        self.assertEqual(lines[0]["answers"][0]["text"], "Yes")
+
+
+class ReconcileAnswersCountCommandTest(TestCase):
+    """Тесты команды сверки answers_count."""
+
+    def setUp(self) -> None:
+        """Создает вопросы с заведомо неверными счетчиками."""
+        self.question: Question = Question.objects.create(text="Q")
+        self.empty: Question = Question.objects.create(text="Empty")
+        Answer.objects.bulk_create(
+            Answer(question_id=self.question, user_id=uuid.uuid4(), text="A")
+            for _ in range(3)
+        )
+        Question.objects.filter(id=self.question.id).update(answers_count=0)
+        Question.objects.filter(id=self.empty.id).update(answers_count=5)
+
+    def _counts(self) -> List[int]:
+        return list(
+            Question.objects.order_by("id").values_list("answers_count", flat=True)
+        )
+
+    def test_dry_run_does_not_change(self) -> None:
+        """Тестирует, что --dry-run только выводит расхождения."""
+        out: StringIO = StringIO()
+        call_command("reconcile_answers_count", dry_run=True, stdout=out)
+        self.assertIn("Найдено расхождений: 2", out.getvalue())
+        self.assertEqual(self._counts(), [0, 5])
+
+    def test_fixes_mismatches(self) -> None:
+        """Тестирует исправление счетчиков по диапазонам id."""
+        call_command("reconcile_answers_count", batch_size=1, stdout=StringIO())
+        self.assertEqual(self._counts(), [3, 0])
+
+    def test_answer_added_during_reconcile(self) -> None:
+        """Тестирует, что ответ, добавленный после подсчета, не откатывается."""
+        call_command("reconcile_answers_count", stdout=StringIO())
+        count_answers: Callable[[int, int], Dict[int, int]] = Command.count_answers
+
+        def count_then_answer(start: int, end: int) -> Dict[int, int]:
+            counts: Dict[int, int] = count_answers(start, end)
+            # Конкурентная запись сразу после подсчета ответов.
+            Answer.objects.create(
+                question_id=self.question, user_id=uuid.uuid4(), text="Late"
+            )
+            return counts
+
+        with mock.patch.object(Command, "count_answers", count_then_answer):
+            call_command("reconcile_answers_count", stdout=StringIO())
+        self.assertEqual(self._counts(), [4, 0])
+
+
+class BenchApiCommandTest(TestCase):
+    """Тесты бенчмарка эндпоинтов bench_api."""
+
+    def setUp(self) -> None:
+        """Создает временный каталог для отчетов."""
+        self.dir: Path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _report(self, path: Path, p95: float, queries: float) -> Path:
+        result: Dict[str, Any] = {
+            "rps": 100.0,
+            "p50_ms": 1.0,
+            "p95_ms": p95,
+            "p99_ms": p95,
+            "queries": queries,
+        }
+        path.write_text(
+            json.dumps({"results": {"inprocess": {"question-list": result}}}),
+            encoding="utf-8",
+        )
+        return path
+
+    def test_every_route_has_scenario(self) -> None:
+        """Тестирует, что бенчмарк нагружает каждый маршрут API."""
+        routes = {scenario.route for scenario in SCENARIOS}
+        for pattern in build_urlpatterns(use_async=False):
+            self.assertIn(pattern.name, routes)
+
+    def test_inprocess_report(self) -> None:
+        """Тестирует JSON отчет по всем сценариям и удаление данных."""
+        path: Path = self.dir / "report.json"
+        call_command(
+            "bench_api",
+            questions=3,
+            answers=2,
+            requests=3,
+            warmup=1,
+            mode=["inprocess"],
+            output=str(path),
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        report: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+        results: Dict[str, Any] = report["results"]["inprocess"]
+        self.assertEqual(set(results), {scenario.name for scenario in SCENARIOS})
+        for name, result in results.items():
+            self.assertEqual(result["errors"], 0, name)
+            self.assertGreater(result["rps"], 0, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"], name)
+        self.assertEqual(results["question-list"]["queries"], 2)
+        self.assertFalse(Question.objects.exists())
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_compare(self) -> None:
+        """Тестирует поиск регрессий p95 и числа SQL запросов."""
+        base: Path = self._report(self.dir / "base.json", 10.0, 2)
+        same: Path = self._report(self.dir / "same.json", 10.5, 2)
+        worse: Path = self._report(self.dir / "worse.json", 20.0, 3)
+
+        out: StringIO = StringIO()
+        call_command("bench_api", compare=[str(base), str(same)], stdout=out)
+        self.assertIn("Регрессий не найдено", out.getvalue())
+
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "Найдено регрессий: 2"):
+            call_command("bench_api", compare=[str(base), str(worse)], stdout=out)
+        self.assertIn("queries 2 -> 3", out.getvalue())
+
+    def test_without_dev_dependencies(self) -> None:
+        """Тестирует понятную ошибку, если factory-boy не установлен."""
+        with mock.patch(
+            "api_qa.management.commands.bench_api.FACTORIES_ERROR",
+            ImportError("No module named 'factory'"),
+        ):
+            with self.assertRaisesMessage(CommandError, "factory-boy"):
+                call_command("bench_api", stdout=StringIO())
+        self.assertFalse(Question.objects.exists())
+
+
+class GenerateDataCommandTest(TestCase):
+    """Тесты генератора синтетических данных generate_data."""
+
+    def _generate(self, **options: Any) -> None:
+        options = {"questions": 20, "answers": 200, "users": 7, **options}
+        call_command("generate_data", stdout=StringIO(), **options)
+
+    def test_counts_and_dates(self) -> None:
+        """Тестирует объем данных, счетчики ответов и порядок дат."""
+        self._generate()
+        self.assertEqual(Question.objects.count(), 20)
+        self.assertEqual(Answer.objects.count(), 200)
+        self.assertEqual(
+            sum(Question.objects.values_list("answers_count", flat=True)), 200
+        )
+        self.assertLessEqual(Answer.objects.values("user_id").distinct().count(), 7)
+        for answer in Answer.objects.select_related("question_id"):
+            self.assertGreaterEqual(answer.created_at, answer.question_id.created_at)
+
+    def test_same_seed_same_data(self) -> None:
+        """Тестирует воспроизводимость данных при одинаковом seed."""
+        self._generate(seed=5)
+        first: List[str] = list(
+            Answer.objects.order_by("id").values_list("text", flat=True)
+        )
+        Question.objects.all().delete()
+        self._generate(seed=5)
+        second: List[str] = list(
+            Answer.objects.order_by("id").values_list("text", flat=True)
+        )
+        self.assertEqual(first, second)
+
+    def test_search_index_rebuilt(self) -> None:
+        """Тестирует, что созданные строки находятся полнотекстовым поиском."""
+        self._generate(questions=1, answers=1)
+        answer: Answer = Answer.objects.get()
+        word: str = answer.text.split()[0]
+        self.assertIn(answer, search(Answer.objects.all(), word))
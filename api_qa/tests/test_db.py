@@ -0,0 +1,50 @@
+from typing import Any, Dict
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_qa.db import pool_stats
+
+
+class FakePool:
+    """Пул с фиксированной статистикой psycopg_pool."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": 5,
+            "pool_available": 2,
+            "requests_queued": 4,
+            "requests_wait_ms": 100,
+        }
+
+
+class DatabasePoolTest(APITestCase):
+    """Тесты статистики пула соединений."""
+
+    def test_stats_without_pool(self) -> None:
+        """Тестирует отсутствие статистики у базы без пула."""
+        self.assertIsNone(pool_stats())
+
+    def test_stats_with_pool(self) -> None:
+        """Тестирует вычисление выданных соединений и среднего ожидания."""
+        with mock.patch.object(connection, "pool", FakePool(), create=True):
+            stats = pool_stats()
+        self.assertEqual(stats["checked_out"], 3)
+        self.assertEqual(stats["requests_wait_ms_avg"], 25)
+
+    def test_endpoint_requires_admin(self) -> None:
+        """Тестирует доступ к статистике только для администратора."""
+        url: str = reverse("db-pool")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        admin: Any = get_user_model().objects.create_superuser(
+            "admin", "a@example.com", "pw"
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pools"], dict.fromkeys(settings.DATABASES))
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Dict, List
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api_qa import events
+from api_qa.models import Answer, Question
+
+ASYNC_URLCONF: str = "api_qa.tests.urls_async"
+
+
+def parse(frame: bytes) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    for line in frame.decode().strip().split("\n"):
+        name, _, value = line.partition(": ")
+        fields[name] = value
+    return fields
+
+
+class AnswerStreamCatchUpTest(TestCase):
+    """Тесты потока ответов под WSGI: только пропущенные ответы."""
+
+    def setUp(self) -> None:
+        """Подготовка вопроса с ответами."""
+        self.question: Question = Question.objects.create(text="Streamed?")
+        self.answers: List[Answer] = [
+            Answer.objects.create(
+                question_id=self.question, user_id=uuid.uuid4(), text=f"A{index}"
+            )
+            for index in range(3)
+        ]
+        self.url: str = reverse(
+            "answer-stream", kwargs={"question_id": self.question.id}
+        )
+
+    def _frames(self, **extra: Any) -> List[Dict[str, str]]:
+        response = self.client.get(self.url, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        return [parse(frame) for frame in response.content.split(b"\n\n")[:-1]]
+
+    def test_without_last_event_id(self) -> None:
+        """Тестирует первый кадр с id последнего ответа."""
+        frames = self._frames()
+        self.assertEqual(frames, [{"retry": "3000", "id": str(self.answers[-1].id)}])
+
+    def test_catch_up(self) -> None:
+        """Тестирует отдачу ответов после Last-Event-ID."""
+        frames = self._frames(HTTP_LAST_EVENT_ID=str(self.answers[0].id))
+        self.assertEqual(frames[0]["id"], str(self.answers[-1].id))
+        self.assertEqual(
+            [frame["id"] for frame in frames[1:]],
+            [str(answer.id) for answer in self.answers[1:]],
+        )
+        self.assertEqual(frames[1]["event"], "answer")
+        self.assertEqual(json.loads(frames[1]["data"])["text"], "A1")
+
+    @override_settings(QA_STREAM_BACKLOG=1)
+    def test_catch_up_limit(self) -> None:
+        """Тестирует ограничение числа пропущенных ответов за раз."""
+        response = self.client.get(self.url, {"last_event_id": 0})
+        frames = [parse(frame) for frame in response.content.split(b"\n\n")[:-1]]
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(frames[0]["id"], str(self.answers[0].id))
+
+    def test_not_found(self) -> None:
+        """Тестирует 404 для несуществующего вопроса."""
+        response = self.client.get(
+            reverse("answer-stream", kwargs={"question_id": 999})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AnswerStreamTest(TransactionTestCase):
+    """Тесты потока ответов под ASGI с публикацией внутри процесса."""
+
+    def setUp(self) -> None:
+        """Подготовка вопроса."""
+        self.question: Question = Question.objects.create(text="Streamed?")
+        self.url: str = reverse(
+            "answer-stream", kwargs={"question_id": self.question.id}
+        )
+        self.answers_url: str = reverse(
+            "answer-create", kwargs={"question_id": self.question.id}
+        )
+
+    async def _open(self) -> AsyncIterator[bytes]:
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        stream: AsyncIterator[bytes] = aiter(response.streaming_content)
+        self.assertEqual(parse(await anext(stream))["id"], "0")
+        return stream
+
+    async def _next(self, stream: AsyncIterator[bytes]) -> Dict[str, str]:
+        return parse(await asyncio.wait_for(anext(stream), 5))
+
+    async def _disconnect(self, stream: AsyncIterator[bytes]) -> None:
+        # Как ASGI обработчик Django при отключении клиента: отмена
+        # ожидающей отдачи потока.
+        pending: asyncio.Future = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+
+    async def _create(self, text: str) -> Dict[str, Any]:
+        response = await self.async_client.post(
+            self.answers_url,
+            {"user_id": str(uuid.uuid4()), "text": text},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()
+
+    async def test_new_answers_are_pushed(self) -> None:
+        """Тестирует доставку нового ответа всем подписчикам вопроса."""
+        first = await self._open()
+        second = await self._open()
+        self.assertEqual(events.subscriber_count(), 2)
+        created = await self._create("Pushed")
+        for stream in (first, second):
+            frame = await self._next(stream)
+            self.assertEqual(frame["id"], str(created["id"]))
+            self.assertEqual(json.loads(frame["data"]), created)
+            await self._disconnect(stream)
+        self.assertEqual(events.subscriber_count(), 0)
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF, QA_SINGLE_QUERY_WRITES=False)
+    async def test_async_create_view(self) -> None:
+        """Тестирует публикацию из async view создания ответа."""
+        stream = await self._open()
+        created = await self._create("Async")
+        self.assertEqual((await self._next(stream))["id"], str(created["id"]))
+        await self._disconnect(stream)
+        self.assertEqual(events.subscriber_count(), 0)
+
+    @override_settings(QA_STREAM_KEEPALIVE=0.01, QA_STREAM_MAX_AGE=0.05)
+    async def test_keepalive_and_max_age(self) -> None:
+        """Тестирует комментарии при простое и закрытие потока."""
+        stream = await self._open()
+        self.assertEqual(await anext(stream), b": keepalive\n\n")
+        chunks: List[bytes] = [chunk async for chunk in stream]
+        self.assertTrue(all(chunk == b": keepalive\n\n" for chunk in chunks))
+        self.assertEqual(events.subscriber_count(), 0)
+
+    @override_settings(QA_STREAM_QUEUE_SIZE=1)
+    async def test_slow_subscriber_is_closed(self) -> None:
+        """Тестирует закрытие потока при переполнении очереди."""
+        stream = await self._open()
+        first = await self._create("One")
+        await self._create("Two")
+        await asyncio.sleep(0.1)
+        self.assertEqual((await self._next(stream))["id"], str(first["id"]))
+        with self.assertRaises(StopAsyncIteration):
+            await self._next(stream)
+        self.assertEqual(events.subscriber_count(), 0)
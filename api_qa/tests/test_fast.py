@@ -0,0 +1,63 @@
+import uuid
+from datetime import timedelta
+from typing import List
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+
+@assert_query_budgets
+class FastSerializationEquivalenceTest(APITestCase):
+    """Тесты побайтного совпадения быстрого пути с сериализаторами DRF."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов и ответов с разными датами и текстом."""
+        base = timezone.now().replace(microsecond=123456)
+        self.question: Question = Question.objects.create(text='Вопрос "в кавычках"')
+        Question.objects.create(text="Второй вопрос")
+        answers: List[Answer] = Answer.objects.bulk_create(
+            Answer(question_id=self.question, user_id=uuid.uuid4(), text=f"Ответ {i}")
+            for i in range(25)
+        )
+        for index, answer in enumerate(answers):
+            # Даты без микросекунд и с микросекундами форматируются по-разному.
+            created_at = base - timedelta(seconds=index)
+            if index % 2:
+                created_at = created_at.replace(microsecond=0)
+            Answer.objects.filter(id=answer.id).update(created_at=created_at)
+        self.answer: Answer = answers[0]
+
+    def assertSameBytes(self, url: str, **params: str) -> None:
+        with override_settings(QA_FAST_SERIALIZATION=False):
+            expected = self.client.get(url, params)
+        with override_settings(QA_FAST_SERIALIZATION=True):
+            actual = self.client.get(url, params)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual.content, expected.content)
+
+    def test_question_list(self) -> None:
+        """Тестирует список вопросов во всех режимах пагинации."""
+        url: str = reverse("question-list")
+        self.assertSameBytes(url)
+        self.assertSameBytes(url, pagination="cursor")
+        self.assertSameBytes(url, q="вопрос")
+
+    def test_question_detail(self) -> None:
+        """Тестирует детальный ответ вопроса со встроенными ответами."""
+        self.assertSameBytes(
+            reverse("question-detail", kwargs={"pk": self.question.id})
+        )
+        self.assertSameBytes(reverse("question-detail", kwargs={"pk": 999}))
+
+    def test_answer_endpoints(self) -> None:
+        """Тестирует список, поиск и детальный ответ."""
+        self.assertSameBytes(
+            reverse("answer-create", kwargs={"question_id": self.question.id})
+        )
+        self.assertSameBytes(reverse("answer-search"), q="ответ")
+        self.assertSameBytes(reverse("answer-detail", kwargs={"pk": self.answer.id}))
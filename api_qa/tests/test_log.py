@@ -0,0 +1,116 @@
+import json
+import logging
+from typing import List
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api_qa.log import (
+    BackgroundQueueHandler,
+    JsonFormatter,
+    RequestContextFilter,
+    SamplingFilter,
+)
+from api_qa.models import Question
+
+
+class ListHandler(logging.Handler):
+    """Обработчик, сохраняющий записи в список."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@override_settings(QA_LOG_SAMPLE_RATES={})
+class RequestLogTest(TestCase):
+    """Тесты контекста запроса и сэмплирования записей лога."""
+
+    def setUp(self) -> None:
+        """Подключение обработчика с фильтрами, как у обработчика queue."""
+        self.handler: ListHandler = ListHandler()
+        self.handler.addFilter(RequestContextFilter())
+        self.handler.addFilter(SamplingFilter())
+        logging.getLogger("api_qa").addHandler(self.handler)
+        self.addCleanup(logging.getLogger("api_qa").removeHandler, self.handler)
+        self.question: Question = Question.objects.create(text="Logged question?")
+
+    def test_request_summary(self) -> None:
+        """Тестирует итоговую запись запроса с id, маршрутом и временем."""
+        response = self.client.get(
+            reverse("question-detail", kwargs={"pk": self.question.id}),
+            headers={"X-Request-ID": "abc123"},
+        )
+        self.assertEqual(response["X-Request-ID"], "abc123")
+        records: List[logging.LogRecord] = self.handler.records
+        self.assertEqual(
+            [record.getMessage() for record in records],
+            [
+                f"Retrieved question #{self.question.id}",
+                f"GET /questions/{self.question.id}/ 200",
+            ],
+        )
+        self.assertTrue(all(record.request_id == "abc123" for record in records))
+        self.assertTrue(all(record.route == "question-detail" for record in records))
+        summary: logging.LogRecord = records[-1]
+        self.assertEqual(summary.status, 200)
+        self.assertEqual(summary.db_queries, 2)
+        self.assertGreaterEqual(summary.duration_ms, summary.db_time_ms)
+
+    def test_generated_request_id(self) -> None:
+        """Тестирует генерацию id запроса без заголовка."""
+        response = self.client.get(reverse("question-list"))
+        self.assertEqual(len(response["X-Request-ID"]), 32)
+        self.assertEqual(self.handler.records[-1].request_id, response["X-Request-ID"])
+
+    @override_settings(QA_LOG_SAMPLE_RATES={"question-detail": 0.0})
+    def test_sampling(self) -> None:
+        """Тестирует отбрасывание INFO записей маршрута с нулевой долей."""
+        self.client.get(reverse("question-detail", kwargs={"pk": self.question.id}))
+        self.assertEqual(self.handler.records, [])
+        self.client.get(reverse("question-list"))
+        self.assertEqual(len(self.handler.records), 1)
+
+
+class LogHandlersTest(TestCase):
+    """Тесты JSON формата и фонового обработчика."""
+
+    def test_json_formatter(self) -> None:
+        """Тестирует запись в одну строку JSON с полями запроса."""
+        record: logging.LogRecord = logging.LogRecord(
+            "api_qa.views", logging.INFO, __file__, 1, "Вопрос #%s", (7,), None
+        )
+        record.request_id = "abc"
+        record.duration_ms = 1.5
+        data = json.loads(JsonFormatter().format(record))
+        self.assertEqual(data["message"], "Вопрос #7")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["request_id"], "abc")
+        self.assertEqual(data["duration_ms"], 1.5)
+        self.assertNotIn("status", data)
+
+    def test_background_handler(self) -> None:
+        """Тестирует запись в фоновом потоке и потерю записей при переполнении."""
+        target: ListHandler = ListHandler()
+        handler: BackgroundQueueHandler = BackgroundQueueHandler([target], maxsize=1)
+        logger: logging.Logger = logging.getLogger("api_qa.tests.background")
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+
+        logger.warning("first")
+        handler.stop()
+        self.assertEqual([record.getMessage() for record in target.records], ["first"])
+
+        logger.warning("second")
+        logger.warning("third")
+        self.assertEqual(handler.dropped, 1)
+        # Остановка с заполненной очередью дописывает оставшиеся записи.
+        handler.start()
+        handler.stop()
+        handler.stop()
+        self.assertEqual(
+            [record.getMessage() for record in target.records], ["first", "second"]
+        )
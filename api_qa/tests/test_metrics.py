@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api_qa.metrics import (
+    ARCHIVE_NAME,
+    merge,
+    registry,
+    render,
+    track_request_queries,
+)
+from api_qa.models import Question
+
+ASYNC_URLCONF: str = "api_qa.tests.urls_async"
+
+
+class MonitoringTest(TestCase):
+    """Тесты эндпоинтов /health/, /ready/ и /metrics."""
+
+    def setUp(self) -> None:
+        """Сброс метрик процесса перед каждым тестом."""
+        registry.reset()
+        self.question: Question = Question.objects.create(text="Metrics question?")
+
+    def test_health(self) -> None:
+        """Тестирует liveness без обращения к БД."""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("health"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_ready(self) -> None:
+        """Тестирует readiness с временем проверки БД."""
+        response = self.client.get(reverse("ready"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        database: Dict[str, Any] = response.json()["databases"]["default"]
+        self.assertTrue(database["ok"])
+        self.assertGreaterEqual(database["time_ms"], 0)
+
+    def test_ready_database_unavailable(self) -> None:
+        """Тестирует ответ 503 при ошибке БД."""
+        with mock.patch(
+            "django.db.backends.utils.CursorWrapper.execute",
+            side_effect=DatabaseError("connection refused"),
+        ):
+            response = self.client.get(reverse("ready"))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["status"], "unavailable")
+
+    def test_request_metrics(self) -> None:
+        """Тестирует счетчики, гистограммы и время SQL по маршрутам."""
+        self.client.get(reverse("question-list"))
+        self.client.get(reverse("question-detail", kwargs={"pk": 0}))
+        self.client.get(reverse("health"))
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text: str = response.content.decode()
+        self.assertIn(
+            'qa_http_requests_total{method="GET",route="question-list",status="200"} 1',
+            text,
+        )
+        self.assertIn(
+            'qa_http_requests_total{method="GET",route="question-detail",'
+            'status="404"} 1',
+            text,
+        )
+        self.assertIn(
+            'qa_http_request_duration_seconds_bucket{method="GET",'
+            'route="question-list",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'qa_db_query_duration_seconds_count{method="GET",route="question-list"} 1',
+            text,
+        )
+        self.assertIn("qa_http_requests_in_flight 1", text)
+        self.assertNotIn('route="health"', text)
+
+    def test_async_views_metrics(self) -> None:
+        """Тестирует сбор метрик и SQL запросов для async views."""
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            self.client.get(reverse("question-list"))
+        merged: Dict[str, Any] = merge([registry.snapshot()])
+        labels = (("method", "GET"), ("route", "question-list"))
+        self.assertEqual(
+            merged["counters"][
+                ("qa_http_requests_total", labels + (("status", "200"),))
+            ],
+            1,
+        )
+        self.assertGreater(merged["counters"][("qa_db_queries_total", labels)], 0)
+
+    def test_workers_snapshots_merged(self) -> None:
+        """Тестирует суммирование снимков воркеров из QA_METRICS_DIR."""
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(QA_METRICS_DIR=directory):
+                self.client.get(reverse("question-list"))
+                snapshot: Dict[str, Any] = registry.snapshot()
+                # Снимок другого (завершенного) воркера с тем же запросом.
+                snapshot["pid"] = 2**22 + 1
+                dead: str = os.path.join(directory, f"{snapshot['pid']}.json")
+                with open(dead, "w", encoding="utf-8") as file:
+                    json.dump(snapshot, file)
+                text: str = render(merge(registry.collect()))
+                # Снимок завершенного воркера перенесен в архив один раз.
+                self.assertFalse(os.path.exists(dead))
+                self.assertTrue(os.path.exists(os.path.join(directory, ARCHIVE_NAME)))
+                self.assertEqual(render(merge(registry.collect())), text)
+        self.assertIn(
+            'qa_http_requests_total{method="GET",route="question-list",status="200"} 2',
+            text,
+        )
+        self.assertIn("qa_http_requests_in_flight 0", text)
+
+
+class RequestQueriesTest(TestCase):
+    """Тесты общего счетчика SQL запросов HTTP запроса."""
+
+    def test_nested_trackers_share_stats(self) -> None:
+        """Тестирует, что вложенные middleware получают один накопитель."""
+        request = RequestFactory().get("/")
+        with track_request_queries(request) as outer:
+            with track_request_queries(request) as inner:
+                self.assertIs(inner, outer)
+                Question.objects.count()
+        self.assertEqual(outer.count, 1)
@@ -53,3 +53,41 @@ class AnswerModelTest(TestCase):
 
         expected_str: str = f"Ответ #{answer.id} к вопросу #{self.question}"
         self.assertEqual(str(answer), expected_str)
+
+
+class AnswersCountTest(TestCase):
+    """Тесты денормализованного счетчика Question.answers_count."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов с ответами."""
+        self.question: Question = Question.objects.create(text="Counted?")
+        self.other: Question = Question.objects.create(text="Other?")
+        Answer.objects.create(
+            question_id=self.question, user_id=uuid.uuid4(), text="Answer"
+        )
+        Answer.objects.bulk_create(
+            Answer(question_id=question, user_id=uuid.uuid4(), text="Answer")
+            for question in (self.question, self.other)
+        )
+
+    def _count(self, question: Question) -> int:
+        question.refresh_from_db(fields=["answers_count"])
+        return question.answers_count
+
+    def test_create_increments(self) -> None:
+        """Тестирует увеличение счетчиков при create и bulk_create."""
+        self.assertEqual(self._count(self.question), 2)
+        self.assertEqual(self._count(self.other), 1)
+
+    def test_answer_delete_decrements(self) -> None:
+        """Тестирует уменьшение счетчика при удалении одного ответа."""
+        self.question.answers.first().delete()
+        self.assertEqual(self._count(self.question), 1)
+        self.assertEqual(self._count(self.other), 1)
+
+    def test_queryset_delete_decrements(self) -> None:
+        """Тестирует уменьшение счетчиков при массовом удалении ответов."""
+        deleted, _ = Answer.objects.all().delete()
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self._count(self.question), 0)
+        self.assertEqual(self._count(self.other), 0)
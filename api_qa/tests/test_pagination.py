@@ -0,0 +1,150 @@
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+
+@assert_query_budgets
+class QuestionCursorPaginationTest(APITestCase):
+    """Тесты keyset пагинации списка вопросов."""
+
+    def setUp(self) -> None:
+        """Создает вопросы, часть из которых имеет одинаковый created_at."""
+        self.list_url: str = reverse("question-list")
+        base = timezone.now()
+        for index in range(25):
+            question: Question = Question.objects.create(text=f"Question {index}")
+            # Каждые три вопроса делят одну метку времени.
+            Question.objects.filter(id=question.id).update(
+                created_at=base - timedelta(minutes=index // 3)
+            )
+        self.expected_ids: List[int] = list(
+            Question.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def _collect(self, url: str) -> List[Dict[str, Any]]:
+        pages: List[Dict[str, Any]] = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            url = response.data["next"]
+        return pages
+
+    def test_cursor_mode_has_no_count(self) -> None:
+        """Тестирует, что курсорный режим не возвращает общее количество."""
+        response = self.client.get(self.list_url, {"pagination": "cursor"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_walk_forward_returns_every_question_once(self) -> None:
+        """Тестирует обход всех страниц вперед без пропусков и повторов."""
+        pages = self._collect(f"{self.list_url}?pagination=cursor")
+        ids: List[int] = [item["id"] for page in pages for item in page["results"]]
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(len(pages), 3)
+
+    def test_previous_link_returns_previous_page(self) -> None:
+        """Тестирует переход на предыдущую страницу по курсору."""
+        first = self.client.get(self.list_url, {"pagination": "cursor"}).data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+        self.assertEqual(
+            [item["id"] for item in back["results"]],
+            [item["id"] for item in first["results"]],
+        )
+        self.assertIsNone(back["previous"])
+
+    def test_page_size_param(self) -> None:
+        """Тестирует ограничение размера страницы параметром page_size."""
+        response = self.client.get(
+            self.list_url, {"pagination": "cursor", "page_size": 4}
+        )
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], self.expected_ids[:4]
+        )
+
+    def test_invalid_cursor(self) -> None:
+        """Тестирует ответ 404 на поврежденный курсор."""
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_default_mode_unchanged(self) -> None:
+        """Тестирует, что без параметра используется постраничная пагинация."""
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["count"], 25)
+
+
+@assert_query_budgets
+class AnswerCursorPaginationTest(APITestCase):
+    """Тесты ограниченной выдачи ответов и списка ответов на вопрос."""
+
+    def setUp(self) -> None:
+        """Создает вопрос с количеством ответов больше лимита."""
+        self.question: Question = Question.objects.create(text="Popular?")
+        Answer.objects.bulk_create(
+            Answer(question_id=self.question, user_id=uuid.uuid4(), text=f"A{i}")
+            for i in range(30)
+        )
+        self.expected_ids: List[int] = list(
+            Answer.objects.order_by("created_at", "id").values_list("id", flat=True)
+        )
+        self.detail_url: str = reverse(
+            "question-detail", kwargs={"pk": self.question.id}
+        )
+        self.list_url: str = reverse(
+            "answer-create", kwargs={"question_id": self.question.id}
+        )
+
+    @override_settings(QA_DETAIL_ANSWERS_LIMIT=5)
+    def test_detail_is_bounded(self) -> None:
+        """Тестирует, что детальный ответ содержит первые N ответов и курсор."""
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["answers"]], self.expected_ids[:5]
+        )
+        self.assertIsNotNone(response.data["answers_next"])
+
+        continuation = self.client.get(response.data["answers_next"])
+        self.assertEqual(
+            [item["id"] for item in continuation.data["results"]],
+            self.expected_ids[5:15],
+        )
+
+    def test_detail_without_more_answers(self) -> None:
+        """Тестирует отсутствие курсора, когда все ответы уместились."""
+        question: Question = Question.objects.create(text="Quiet?")
+        response = self.client.get(
+            reverse("question-detail", kwargs={"pk": question.id})
+        )
+        self.assertEqual(response.data["answers"], [])
+        self.assertIsNone(response.data["answers_next"])
+
+    def test_list_walks_all_answers(self) -> None:
+        """Тестирует обход всех ответов вопроса по курсору."""
+        ids: List[int] = []
+        url = self.list_url
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(ids, self.expected_ids)
+
+    def test_list_for_missing_question(self) -> None:
+        """Тестирует 404 для списка ответов несуществующего вопроса."""
+        response = self.client.get(
+            reverse("answer-create", kwargs={"question_id": 999})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
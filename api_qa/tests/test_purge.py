@@ -0,0 +1,92 @@
+import uuid
+from typing import List
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api_qa import purge
+from api_qa.models import Answer, Question
+
+ASYNC_URLCONF: str = "api_qa.tests.urls_async"
+
+
+def create_question(answers: int) -> Question:
+    question: Question = Question.objects.create(text="Purged question?")
+    Answer.objects.bulk_create(
+        Answer(question_id=question, user_id=uuid.uuid4(), text=f"Answer {index}")
+        for index in range(answers)
+    )
+    return question
+
+
+class SetBasedDeleteTest(TestCase):
+    """Тесты удаления вопроса без загрузки ответов в Python."""
+
+    def test_answers_are_not_loaded(self) -> None:
+        """Тестирует, что ответы удаляются одним DELETE без SELECT."""
+        question: Question = create_question(5)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(
+                reverse("question-detail", kwargs={"pk": question.id})
+            )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        statements: List[str] = [query["sql"] for query in queries]
+        self.assertFalse(
+            any(
+                sql.startswith("SELECT") and "api_qa_answer" in sql
+                for sql in statements
+            )
+        )
+        self.assertFalse(Answer.objects.exists())
+
+    def test_purge_question_in_batches(self) -> None:
+        """Тестирует удаление ответов пачками и затем вопроса."""
+        question: Question = create_question(7)
+        other: Question = create_question(2)
+        with override_settings(QA_PURGE_BATCH_SIZE=3):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(purge.purge_question(question.id), 7)
+        deletes: int = sum(
+            '"api_qa_answer"."id" IN' in query["sql"]
+            for query in queries
+            if query["sql"].startswith("DELETE")
+        )
+        self.assertEqual(deletes, 3)
+        self.assertFalse(Question.objects.filter(id=question.id).exists())
+        other.refresh_from_db()
+        self.assertEqual(other.answers_count, 2)
+
+
+@override_settings(QA_PURGE_ASYNC_THRESHOLD=3, QA_PURGE_BATCH_SIZE=2)
+class BackgroundPurgeTest(TransactionTestCase):
+    """Тесты фонового удаления больших вопросов (202 Accepted)."""
+
+    def _delete(self, question: Question) -> int:
+        response = self.client.delete(
+            reverse("question-detail", kwargs={"pk": question.id})
+        )
+        purge.wait()
+        return response.status_code
+
+    def test_large_question_purged_in_background(self) -> None:
+        """Тестирует ответ 202 и удаление ответов в фоне."""
+        question: Question = create_question(5)
+        self.assertEqual(self._delete(question), status.HTTP_202_ACCEPTED)
+        self.assertFalse(Question.objects.exists())
+        self.assertFalse(Answer.objects.exists())
+
+    def test_small_question_deleted_immediately(self) -> None:
+        """Тестирует обычное удаление вопроса с ответами ниже порога."""
+        question: Question = create_question(3)
+        self.assertEqual(self._delete(question), status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Question.objects.exists())
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    def test_async_view(self) -> None:
+        """Тестирует фоновое удаление через async view."""
+        question: Question = create_question(4)
+        self.assertEqual(self._delete(question), status.HTTP_202_ACCEPTED)
+        self.assertFalse(Answer.objects.exists())
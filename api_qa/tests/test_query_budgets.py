@@ -0,0 +1,197 @@
+import uuid
+from typing import Any, Dict, List, Set, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import URLPattern, reverse
+from rest_framework.test import APIClient
+
+from api_qa.middleware import QueryBudgetExceeded, query_budget
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+from api_qa.urls import build_urlpatterns
+
+ASYNC_URLCONF: str = "api_qa.tests.urls_async"
+
+
+def route_methods(pattern: URLPattern) -> Set[str]:
+    """Методы, которые обслуживает view маршрута (без HEAD и OPTIONS)."""
+    view: Any = getattr(pattern.callback, "view_class", None)
+    if view is None:
+        return {"GET"}
+    return {
+        method.upper()
+        for method in view.http_method_names
+        if method not in ("head", "options") and hasattr(view, method)
+    }
+
+
+@assert_query_budgets
+@override_settings(QA_QUERY_HEADERS=True)
+class QueryBudgetTest(TestCase):
+    """Тесты бюджетов SQL запросов всех эндпоинтов api_qa/urls.py."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов с большим числом ответов (N+1 заметен)."""
+        self.client: APIClient = APIClient()
+        self.questions: List[Question] = [
+            Question.objects.create(text=f"Budget question {index}?")
+            for index in range(15)
+        ]
+        self.question: Question = self.questions[0]
+        Answer.objects.bulk_create(
+            Answer(question_id=self.question, user_id=uuid.uuid4(), text=f"A{index}")
+            for index in range(30)
+        )
+        self.answer: Answer = Answer.objects.filter(question_id=self.question).first()
+        self.admin: Any = get_user_model().objects.create_superuser(
+            "admin", "a@example.com", "pw"
+        )
+
+    def _requests(self) -> List[Tuple[str, str, Any]]:
+        question: int = self.question.id
+        user_id: str = str(uuid.uuid4())
+        return [
+            ("get", reverse("question-list"), None),
+            ("get", reverse("question-list") + "?pagination=cursor", None),
+            ("get", reverse("question-list") + "?q=budget", None),
+            ("post", reverse("question-list"), {"text": "New question?"}),
+            ("get", reverse("question-detail", kwargs={"pk": question}), None),
+            ("get", reverse("answer-create", kwargs={"question_id": question}), None),
+            (
+                "post",
+                reverse("answer-create", kwargs={"question_id": question}),
+                {"user_id": user_id, "text": "New answer"},
+            ),
+            (
+                "post",
+                reverse("answer-bulk-create", kwargs={"question_id": question}),
+                [{"user_id": user_id, "text": f"Bulk {index}"} for index in range(20)],
+            ),
+            (
+                "post",
+                reverse("answer-bulk-create-any"),
+                [
+                    {"question_id": item.id, "user_id": user_id, "text": "Bulk"}
+                    for item in self.questions
+                ],
+            ),
+            ("get", reverse("answer-search") + "?q=A1", None),
+            ("get", reverse("answer-detail", kwargs={"pk": self.answer.id}), None),
+            ("delete", reverse("answer-detail", kwargs={"pk": self.answer.id}), None),
+            (
+                "delete",
+                reverse("question-detail", kwargs={"pk": self.questions[1].id}),
+                None,
+            ),
+            ("get", reverse("health"), None),
+            ("get", reverse("ready"), None),
+            ("get", reverse("metrics"), None),
+        ]
+
+    def _assert_within_budgets(self) -> None:
+        for method, url, data in self._requests():
+            response = getattr(self.client, method)(url, data, format="json")
+            self.assertLess(response.status_code, 300, url)
+            self.assertIn("X-Query-Count", response, url)
+        self.client.force_authenticate(self.admin)
+        for url in (reverse("question-export"), reverse("db-pool")):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+
+    def test_every_route_has_budget(self) -> None:
+        """Тестирует, что у каждого метода каждого маршрута API задан бюджет."""
+        for use_async in (False, True):
+            for pattern in build_urlpatterns(use_async):
+                for method in route_methods(pattern):
+                    self.assertIn((pattern.name, method), settings.QA_QUERY_BUDGETS)
+
+    def test_budget_by_method(self) -> None:
+        """Тестирует разные бюджеты методов одного маршрута."""
+        self.assertEqual(query_budget("question-detail", "HEAD"), 2)
+        self.assertEqual(query_budget("question-detail", "DELETE"), 5)
+        self.assertEqual(
+            query_budget("question-detail", "PUT"), settings.QA_QUERY_BUDGET_DEFAULT
+        )
+
+    def test_sync_views(self) -> None:
+        """Тестирует бюджеты синхронных views."""
+        self._assert_within_budgets()
+
+    @override_settings(QA_FAST_SERIALIZATION=False)
+    def test_serializers(self) -> None:
+        """Тестирует бюджеты views с сериализаторами DRF (вложенные ответы)."""
+        self._assert_within_budgets()
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    def test_async_views(self) -> None:
+        """Тестирует бюджеты async views."""
+        self._assert_within_budgets()
+
+    def test_admin_question_inline(self) -> None:
+        """Тестирует страницу вопроса в админке без запроса на каждый ответ."""
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("admin:api_qa_question_change", args=[self.question.id])
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_headers(self) -> None:
+        """Тестирует заголовки с числом и временем SQL запросов."""
+        response = self.client.get(reverse("question-list"))
+        self.assertEqual(response["X-Query-Count"], "2")
+        self.assertGreaterEqual(float(response["X-DB-Time"]), 0)
+
+    def test_exceeded_budget_fails(self) -> None:
+        """Тестирует ошибку при превышении бюджета в тестах."""
+        budgets: Dict[Tuple[str, str], int] = {
+            **settings.QA_QUERY_BUDGETS,
+            ("question-list", "GET"): 1,
+        }
+        with override_settings(QA_QUERY_BUDGETS=budgets):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("question-list"))
+
+    @override_settings(QA_QUERY_BUDGET_STRICT=False, QA_QUERY_HEADERS=False)
+    def test_exceeded_budget_logged(self) -> None:
+        """Тестирует запись в лог превышения бюджета без заголовков."""
+        budgets: Dict[Tuple[str, str], int] = {
+            **settings.QA_QUERY_BUDGETS,
+            ("question-list", "GET"): 1,
+        }
+        with override_settings(QA_QUERY_BUDGETS=budgets):
+            with self.assertLogs("api_qa.middleware", "WARNING") as logs:
+                response = self.client.get(reverse("question-list"))
+        self.assertNotIn("X-Query-Count", response)
+        self.assertIn("2 SQL запросов при бюджете 1", logs.output[0])
+
+
+@assert_query_budgets
+class QuestionDeleteBudgetTest(TransactionTestCase):
+    """
+    Бюджет удаления вопроса с ответами вне транзакции теста.
+
+    Как в production, удаление выполняется в своей транзакции (BEGIN
+    учитывается), а каскад удаляет ответы и счета trending.
+    """
+
+    def _delete(self) -> None:
+        question: Question = Question.objects.create(text="Deleted?")
+        Answer.objects.bulk_create(
+            Answer(question_id=question, user_id=uuid.uuid4(), text=f"A{index}")
+            for index in range(3)
+        )
+        response = self.client.delete(
+            reverse("question-detail", kwargs={"pk": question.id})
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Answer.objects.exists())
+
+    def test_sync_view(self) -> None:
+        """Тестирует бюджет синхронного DELETE /questions/<id>/."""
+        self._delete()
+
+    @override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+    def test_async_view(self) -> None:
+        """Тестирует бюджет async DELETE /questions/<id>/."""
+        self._delete()
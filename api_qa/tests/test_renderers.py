@@ -0,0 +1,74 @@
+import datetime
+import uuid
+from io import BytesIO
+from typing import Any, Dict
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api_qa import renderers
+from api_qa.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONTest(SimpleTestCase):
+    """Тесты рендерера и парсера на orjson."""
+
+    def setUp(self) -> None:
+        """Данные с типами, которые встречаются в ответах API."""
+        self.data: Dict[str, Any] = {
+            "id": 1,
+            "user_id": uuid.UUID("9b2f6a1e-0c8d-4a51-9a0e-6c3f0e2b7d11"),
+            "text": 'Ответ с юникодом — "кавычки", \\ слеш и \u2028\u2029',
+            "created_at": timezone.make_aware(
+                datetime.datetime(2025, 1, 2, 3, 4, 5, 678901),
+                datetime.timezone.utc,
+            ),
+            "answers": [{"rank": 0.5, "ok": True, "next": None}],
+            7: "нестроковый ключ",
+        }
+
+    def test_render_matches_drf(self) -> None:
+        """Тестирует побайтное совпадение с JSONRenderer DRF."""
+        self.assertTrue(renderers.is_available())
+        expected: bytes = JSONRenderer().render(self.data)
+        self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        self.assertIn(b'"created_at":"2025-01-02T03:04:05.678901Z"', expected)
+
+    def test_render_fallback(self) -> None:
+        """Тестирует запасной путь без orjson и с отступами."""
+        expected: bytes = JSONRenderer().render(self.data)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(self.data), expected)
+        indented: bytes = FastJSONRenderer().render(
+            self.data, renderer_context={"indent": 4}
+        )
+        self.assertEqual(
+            indented, JSONRenderer().render(self.data, None, {"indent": 4})
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_parse(self) -> None:
+        """Тестирует разбор тела запроса и ошибку на некорректном JSON."""
+        body: bytes = '{"user_id": "x", "text": "ответ"}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)),
+            JSONParser().parse(BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"text": '))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"rank": NaN}'))
+
+    def test_parse_fallback(self) -> None:
+        """Тестирует разбор без orjson и в кодировке, отличной от UTF-8."""
+        body: bytes = '{"text": "ответ"}'.encode("cp1251")
+        parsed: Any = FastJSONParser().parse(
+            BytesIO(body), parser_context={"encoding": "cp1251"}
+        )
+        self.assertEqual(parsed, {"text": "ответ"})
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONParser().parse(BytesIO(b'{"a": 1}')), {"a": 1})
@@ -0,0 +1,137 @@
+import time
+import uuid
+from io import StringIO
+from typing import List
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DatabaseError, connections
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api_qa import routers
+from api_qa.cache import question_detail_cache, question_list_version
+from api_qa.models import Answer, Question
+
+
+@override_settings(QA_DB_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTest(SimpleTestCase):
+    """Тесты выбора базы роутером ReplicaRouter."""
+
+    def setUp(self) -> None:
+        self.router: routers.ReplicaRouter = routers.ReplicaRouter()
+        self.addCleanup(routers.mark_up, "replica1")
+
+    def _reads(self, count: int) -> List[str]:
+        return [self.router.db_for_read(Question) for _ in range(count)]
+
+    def test_round_robin(self) -> None:
+        """Тестирует распределение чтений по репликам и записи на primary."""
+        self.assertEqual(set(self._reads(4)), {"replica1", "replica2"})
+        self.assertEqual(self.router.db_for_write(Question), "default")
+
+    def test_pinned_reads_go_to_primary(self) -> None:
+        """Тестирует закрепление чтений за primary."""
+        with routers.use_primary():
+            self.assertEqual(set(self._reads(4)), {"default"})
+
+    def test_replica_marked_down_is_skipped(self) -> None:
+        """Тестирует исключение недоступной реплики из чтений."""
+        routers.mark_down("replica1")
+        self.assertEqual(set(self._reads(4)), {"replica2"})
+        routers.mark_up("replica1")
+        self.assertIn("replica1", self._reads(2))
+
+    @override_settings(QA_DB_REPLICAS=[])
+    def test_without_replicas(self) -> None:
+        """Тестирует работу без реплик: все запросы идут в default."""
+        self.assertEqual(set(self._reads(2)), {"default"})
+
+
+@override_settings(QA_DB_REPLICAS=["replica"])
+class ReplicaRoutingTest(TestCase):
+    """Тесты маршрутизации HTTP запросов на две SQLite базы."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        """Создает разные данные в primary и в «отстающей» реплике."""
+        self.primary: Question = Question.objects.create(text="Primary?")
+        Question.objects.using("replica").create(id=self.primary.id, text="Stale?")
+        self.list_url: str = reverse("question-list")
+
+    def _texts(self, client: Client) -> List[str]:
+        response = client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [question["text"] for question in response.json()["results"]]
+
+    def test_reads_go_to_replica(self) -> None:
+        """Тестирует чтение списка вопросов с реплики."""
+        self.assertEqual(self._texts(self.client), ["Stale?"])
+
+    def test_read_your_writes(self) -> None:
+        """Тестирует чтение с primary после записи клиента."""
+        response = self.client.post(
+            reverse("answer-create", kwargs={"question_id": self.primary.id}),
+            {"user_id": str(uuid.uuid4()), "text": "Fresh answer"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(settings.QA_DB_PRIMARY_COOKIE, response.cookies)
+        self.assertEqual(self._texts(self.client), ["Primary?"])
+        # Другой клиент продолжает читать с реплики.
+        self.assertEqual(self._texts(Client()), ["Stale?"])
+
+    def test_stickiness_expires(self) -> None:
+        """Тестирует окончание закрепления за primary."""
+        self.client.cookies[settings.QA_DB_PRIMARY_COOKIE] = "1"
+        self.assertEqual(self._texts(self.client), ["Stale?"])
+
+    def test_replica_response_cached_briefly(self) -> None:
+        """Тестирует короткое время жизни кэша для ответов с реплики."""
+        self.assertEqual(question_detail_cache.timeout(), 5)
+        with routers.use_primary():
+            self.assertEqual(
+                question_detail_cache.timeout(), settings.QA_DETAIL_CACHE_TIMEOUT
+            )
+
+    def test_list_validators_after_recent_write(self) -> None:
+        """Тестирует отсутствие ETag, пока реплика может не видеть запись."""
+        question_list_version.bump()
+        later = mock.patch(
+            "api_qa.conditional.time.time", return_value=time.time() + 60
+        )
+        with later:
+            self.assertIn("ETag", Client().get(self.list_url))
+        response = Client().get(self.list_url)
+        self.assertNotIn("ETag", response)
+        self.assertIn("max-age", response["Cache-Control"])
+        # Клиент, читающий с primary, получает валидаторы сразу.
+        self.client.cookies[settings.QA_DB_PRIMARY_COOKIE] = str(time.time() + 60)
+        self.assertIn("ETag", self.client.get(self.list_url))
+
+    def test_ready_marks_replica_down(self) -> None:
+        """Тестирует исключение реплики, не прошедшей проверку ready/."""
+        self.addCleanup(routers.mark_up, "replica")
+        replica = mock.patch.object(
+            connections["replica"],
+            "cursor",
+            side_effect=DatabaseError("replica is down"),
+        )
+        with replica:
+            response = self.client.get(reverse("ready"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()["databases"]["replica"]["ok"])
+        self.assertEqual(routers.available_replicas(), [])
+        self.assertEqual(self._texts(self.client), ["Primary?"])
+
+    def test_commands_use_primary(self) -> None:
+        """Тестирует сверку счетчиков по primary, а не по отстающей реплике."""
+        Answer.objects.create(
+            question_id=self.primary, user_id=uuid.uuid4(), text="Primary answer"
+        )
+        Question.objects.filter(id=self.primary.id).update(answers_count=5)
+        call_command("reconcile_answers_count", stdout=StringIO())
+        self.primary.refresh_from_db()
+        self.assertEqual(self.primary.answers_count, 1)
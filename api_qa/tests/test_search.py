@@ -0,0 +1,89 @@
+import uuid
+from typing import List
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_qa.models import Answer, Question
+from api_qa.tests.budgets import assert_query_budgets
+
+
+@assert_query_budgets
+class QuestionSearchTest(APITestCase):
+    """Тесты полнотекстового поиска по вопросам (FTS5 на SQLite)."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов с разным текстом."""
+        self.url: str = reverse("question-list")
+        self.docker: Question = Question.objects.create(text="Зачем нужен Docker?")
+        self.django: Question = Question.objects.create(
+            text="Django или Flask: что выбрать для API?"
+        )
+        self.both: Question = Question.objects.create(
+            text="Django в Docker: Docker compose и Django settings"
+        )
+
+    def _ids(self, query: str, **params: str) -> List[int]:
+        response = self.client.get(self.url, {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_search_matches_words(self) -> None:
+        """Тестирует поиск вопросов по словам."""
+        self.assertCountEqual(self._ids("docker"), [self.docker.id, self.both.id])
+        self.assertEqual(self._ids("flask"), [self.django.id])
+
+    def test_results_are_ranked(self) -> None:
+        """Тестирует, что более релевантный вопрос идет первым."""
+        self.assertEqual(self._ids("docker")[0], self.both.id)
+
+    def test_new_rows_are_indexed(self) -> None:
+        """Тестирует, что индекс обновляется при вставке и удалении."""
+        question: Question = Question.objects.create(text="Что такое Kubernetes?")
+        self.assertEqual(self._ids("kubernetes"), [question.id])
+        question.delete()
+        self.assertEqual(self._ids("kubernetes"), [])
+
+    def test_search_is_keyset_paginated(self) -> None:
+        """Тестирует постраничный обход результатов поиска по курсору."""
+        first = self.client.get(self.url, {"q": "docker", "page_size": 1}).data
+        self.assertNotIn("count", first)
+        second = self.client.get(first["next"]).data
+        ids = [first["results"][0]["id"], second["results"][0]["id"]]
+        self.assertCountEqual(ids, [self.docker.id, self.both.id])
+        self.assertIsNone(second["next"])
+
+    def test_query_syntax_is_escaped(self) -> None:
+        """Тестирует, что спецсимволы запроса не ломают поиск."""
+        self.assertEqual(self._ids('"compose* ('), [self.both.id])
+        self.assertEqual(self._ids("***"), [])
+
+
+@assert_query_budgets
+class AnswerSearchTest(APITestCase):
+    """Тесты полнотекстового поиска по ответам."""
+
+    def setUp(self) -> None:
+        """Подготовка ответов."""
+        self.url: str = reverse("answer-search")
+        question: Question = Question.objects.create(text="Question?")
+        self.answer: Answer = Answer.objects.create(
+            question_id=question, user_id=uuid.uuid4(), text="Используйте PostgreSQL"
+        )
+        Answer.objects.create(
+            question_id=question, user_id=uuid.uuid4(), text="Используйте SQLite"
+        )
+
+    def test_search_answers(self) -> None:
+        """Тестирует поиск ответов по словам."""
+        response = self.client.get(self.url, {"q": "postgresql"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [self.answer.id]
+        )
+
+    def test_query_is_required(self) -> None:
+        """Тестирует ошибку 400 без параметра q."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,143 @@
+import datetime
+import math
+import uuid
+from io import StringIO
+from typing import Any, Dict, List
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api_qa.bulk import BulkWriter
+from api_qa.models import Answer, Question, TrendingScore
+
+NOW: datetime.datetime = datetime.datetime(2025, 6, 1, tzinfo=datetime.timezone.utc)
+HOUR: datetime.timedelta = datetime.timedelta(hours=1)
+
+
+def at(moment: datetime.datetime) -> Any:
+    return mock.patch("django.utils.timezone.now", return_value=moment)
+
+
+@override_settings(QA_TRENDING_WINDOWS={"hour": 3600.0, "week": 604800.0})
+class TrendingTest(TestCase):
+    """Тесты рейтинга GET /questions/trending/ и его инкрементальных счетов."""
+
+    def setUp(self) -> None:
+        """Три ответа два часа назад на один вопрос и один свежий на другой."""
+        self.old: Question = Question.objects.create(text="Old?")
+        self.new: Question = Question.objects.create(text="New?")
+        self.quiet: Question = Question.objects.create(text="Quiet?")
+        with at(NOW - 2 * HOUR):
+            self.answers: List[Answer] = Answer.objects.bulk_create(
+                Answer(question_id=self.old, user_id=uuid.uuid4(), text=f"A{index}")
+                for index in range(3)
+            )
+        with at(NOW):
+            self.fresh: Answer = Answer.objects.create(
+                question_id=self.new, user_id=uuid.uuid4(), text="Fresh"
+            )
+        self.url: str = reverse("question-trending")
+
+    def _get(self, **params: Any) -> Dict[str, Any]:
+        with at(NOW):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _scores(self, window: str) -> Dict[int, float]:
+        return {
+            item["id"]: item["score"] for item in self._get(window=window)["results"]
+        }
+
+    def test_ranking_depends_on_window(self) -> None:
+        """Тестирует порядок и затухание счетов в разных окнах."""
+        data = self._get()
+        self.assertEqual(data["window"], "hour")
+        self.assertEqual(
+            data["results"][0],
+            {"id": self.new.id, "text": "New?", "answers_count": 1, "score": 1.0},
+        )
+        self.assertAlmostEqual(data["results"][1]["score"], 3 * math.exp(-2), places=5)
+        week = self._scores("week")
+        self.assertEqual(list(week), [self.old.id, self.new.id])
+        self.assertAlmostEqual(week[self.old.id], 3 * math.exp(-2 / 168), places=5)
+
+    def test_limit(self) -> None:
+        """Тестирует размер рейтинга и верхнюю границу limit."""
+        self.assertEqual(len(self._get(limit=1)["results"]), 1)
+        with override_settings(QA_TRENDING_MAX_LIMIT=1):
+            self.assertEqual(len(self._get(limit=50)["results"]), 1)
+
+    def test_invalid_params(self) -> None:
+        """Тестирует ответ 400 на неизвестное окно и нечисловой limit."""
+        for params in ({"window": "year"}, {"limit": "many"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_single_query(self) -> None:
+        """Тестирует, что рейтинг читается одним запросом."""
+        with self.assertNumQueries(1):
+            self._get(window="week")
+
+    def test_delete_subtracts(self) -> None:
+        """Тестирует вычитание удаленных ответов и выпадение из рейтинга."""
+        self.answers[0].delete()
+        Answer.objects.filter(id=self.answers[1].id).delete()
+        self.assertAlmostEqual(
+            self._scores("hour")[self.old.id], math.exp(-2), places=5
+        )
+        self.fresh.delete()
+        self.assertNotIn(self.new.id, self._scores("hour"))
+        self.assertTrue(
+            TrendingScore.objects.filter(question=self.new, score__isnull=True).exists()
+        )
+
+    def test_create_endpoint(self) -> None:
+        """Тестирует учет ответа, созданного через API."""
+        with at(NOW):
+            response = self.client.post(
+                reverse("answer-create", kwargs={"question_id": self.quiet.id}),
+                {"user_id": str(uuid.uuid4()), "text": "Late"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._scores("hour")[self.quiet.id], 1.0)
+
+    def test_import_writer(self) -> None:
+        """Тестирует учет ответов, записанных импортом в обход ORM."""
+        BulkWriter().write_answers(
+            [
+                {
+                    "question_id": question_id,
+                    "user_id": uuid.uuid4(),
+                    "text": "Imported",
+                    "created_at": NOW - HOUR,
+                }
+                for question_id in (self.quiet.id, 999)
+            ]
+        )
+        self.assertAlmostEqual(
+            self._scores("hour")[self.quiet.id], math.exp(-1), places=5
+        )
+
+    def test_rebuild_matches_incremental(self) -> None:
+        """Тестирует, что rebuild_trending дает те же счета."""
+        self.fresh.delete()
+        expected: Dict[Any, float] = {
+            (row.window, row.question_id): row.score
+            for row in TrendingScore.objects.filter(score__isnull=False)
+        }
+        TrendingScore.objects.all().delete()
+        out: StringIO = StringIO()
+        call_command("rebuild_trending", batch_size=1, stdout=out)
+        self.assertIn("Пересчитано вопросов: 1", out.getvalue())
+        actual: Dict[Any, float] = {
+            (row.window, row.question_id): row.score
+            for row in TrendingScore.objects.all()
+        }
+        self.assertEqual(actual.keys(), expected.keys())
+        for key, score in expected.items():
+            self.assertAlmostEqual(actual[key], score, places=6)
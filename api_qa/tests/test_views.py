@@ -1,13 +1,24 @@
+import datetime
+import json
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, List
+from unittest import mock
 
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from api_qa.models import Answer, Question
+from api_qa.models import Answer, AnswerQuerySet, Question
+from api_qa.serializers import AnswerSerializer
+from api_qa.tests.budgets import assert_query_budgets
 
 
+@assert_query_budgets
 class QuestionAPITest(APITestCase):
     """Тесты API для модели Question."""
 
@@ -57,6 +68,7 @@ class QuestionAPITest(APITestCase):
         self.assertEqual(Question.objects.count(), 0)
 
 
+@assert_query_budgets
 class AnswerAPITest(APITestCase):
     """Тесты API для модели Answer."""
 
@@ -78,6 +90,20 @@ class AnswerAPITest(APITestCase):
         response = self.client.post(self.create_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Answer.objects.count(), 2)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answers_count, 2)
+
+    def test_list_shows_answers_count(self) -> None:
+        """Тестирует вывод количества ответов в списке вопросов без JOIN."""
+        self.client.post(
+            self.create_url, {"user_id": str(uuid.uuid4()), "text": "Counted"}
+        )
+        self.client.delete(self.detail_url)
+        self.client.post(
+            self.create_url, {"user_id": str(uuid.uuid4()), "text": "Counted"}
+        )
+        response = self.client.get(reverse("question-list"))
+        self.assertEqual(response.data["results"][0]["answers_count"], 2)
 
     def test_get_answer_detail(self) -> None:
         """Тестирует получение детальной информации об ответе."""
@@ -113,3 +139,250 @@ class AnswerAPITest(APITestCase):
             reverse("answer-create", kwargs={"question_id": 999}), data
         )
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Answer.objects.count(), 1)
+
+    def test_create_answer_single_query(self) -> None:
+        """Тестирует создание ответа без отдельной проверки вопроса."""
+        data: Dict[str, str] = {"user_id": str(uuid.uuid4()), "text": "Fast"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.create_url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(
+            any(query["sql"].startswith("SELECT") for query in queries),
+            [query["sql"] for query in queries],
+        )
+        answer: Answer = Answer.objects.get(id=response.data["id"])
+        self.assertEqual(response.data, AnswerSerializer(answer).data)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answers_count, 2)
+
+    def test_create_answer_integrity_error(self) -> None:
+        """Тестирует ответ 404 при нарушении внешнего ключа."""
+        data: Dict[str, str] = {"user_id": str(uuid.uuid4()), "text": "Lost"}
+        with mock.patch.object(
+            AnswerQuerySet, "create_for_question", side_effect=IntegrityError
+        ):
+            response = self.client.post(self.create_url, data)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(QA_SINGLE_QUERY_WRITES=False)
+    def test_create_answer_orm_path(self) -> None:
+        """Тестирует прежний путь создания через ORM."""
+        data: Dict[str, str] = {"user_id": str(uuid.uuid4()), "text": "ORM"}
+        response = self.client.post(self.create_url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        answer: Answer = Answer.objects.get(id=response.data["id"])
+        self.assertEqual(response.data, AnswerSerializer(answer).data)
+        response = self.client.post(
+            reverse("answer-create", kwargs={"question_id": 999}), data
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@assert_query_budgets
+class AnswerBulkAPITest(APITestCase):
+    """Тесты API пакетного создания ответов."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов для пакетной вставки."""
+        self.question: Question = Question.objects.create(text="Bulk question?")
+        self.other: Question = Question.objects.create(text="Other question?")
+        self.bulk_url: str = reverse(
+            "answer-bulk-create", kwargs={"question_id": self.question.id}
+        )
+        self.any_bulk_url: str = reverse("answer-bulk-create-any")
+
+    def test_bulk_create_returns_ids_in_order(self) -> None:
+        """Тестирует создание пакета ответов одним запросом."""
+        data = [
+            {"user_id": str(uuid.uuid4()), "text": f"Answer {index}"}
+            for index in range(5)
+        ]
+        response = self.client.post(self.bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["errors"], [])
+        texts = [Answer.objects.get(id=pk).text for pk in response.data["created"]]
+        self.assertEqual(texts, [item["text"] for item in data])
+
+    def test_bulk_create_reports_item_errors(self) -> None:
+        """Тестирует, что невалидные элементы не мешают остальным."""
+        data = [
+            {"user_id": str(uuid.uuid4()), "text": "Valid"},
+            {"user_id": "not-a-uuid", "text": "Invalid"},
+            {"user_id": str(uuid.uuid4()), "text": "Also valid"},
+        ]
+        response = self.client.post(self.bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 2)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("user_id", response.data["errors"][0]["errors"])
+
+    def test_bulk_create_missing_question(self) -> None:
+        """Тестирует 404 для пакета к несуществующему вопросу."""
+        response = self.client.post(
+            reverse("answer-bulk-create", kwargs={"question_id": 999}),
+            [{"user_id": str(uuid.uuid4()), "text": "Lost"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_create_across_questions(self) -> None:
+        """Тестирует пакет ответов к разным вопросам."""
+        data = [
+            {
+                "question_id": self.question.id,
+                "user_id": str(uuid.uuid4()),
+                "text": "One",
+            },
+            {"question_id": 999, "user_id": str(uuid.uuid4()), "text": "Lost"},
+            {"question_id": self.other.id, "user_id": str(uuid.uuid4()), "text": "Two"},
+        ]
+        # Проверка вопросов, SAVEPOINT, INSERT, UPDATE счетчиков, UPSERT
+        # счетов trending и RELEASE.
+        with self.assertNumQueries(6):
+            response = self.client.post(self.any_bulk_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 2)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertEqual(self.other.answers.count(), 1)
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.answers_count, 1)
+
+    def test_bulk_create_rejects_non_list(self) -> None:
+        """Тестирует ошибку 400 для тела запроса, не являющегося списком."""
+        response = self.client.post(
+            self.bulk_url, {"user_id": str(uuid.uuid4())}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@assert_query_budgets
+class QuestionExportAPITest(APITestCase):
+    """Тесты потоковой выгрузки вопросов в NDJSON."""
+
+    def setUp(self) -> None:
+        """Подготовка вопросов с ответами и пользователя."""
+        self.url: str = reverse("question-export")
+        self.user = get_user_model().objects.create_user(
+            username="analyst", password="secret"
+        )
+        self.first: Question = Question.objects.create(text="First?")
+        self.second: Question = Question.objects.create(text="Second?")
+        for text in ("A1", "A2"):
+            Answer.objects.create(
+                question_id=self.first, user_id=uuid.uuid4(), text=text
+            )
+        Question.objects.filter(id=self.first.id).update(
+            created_at=timezone.make_aware(datetime.datetime(2024, 1, 1))
+        )
+
+    def _lines(self, response: Any) -> List[Dict[str, Any]]:
+        body: bytes = b"".join(response.streaming_content)
+        return [json.loads(line) for line in body.decode().splitlines()]
+
+    def test_requires_authentication(self) -> None:
+        """Тестирует, что выгрузка недоступна анонимно."""
+        response = self.client.get(self.url)
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_export_groups_answers_by_question(self) -> None:
+        """Тестирует выгрузку вопросов с вложенными ответами."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = self._lines(response)
+        self.assertEqual(
+            [line["id"] for line in lines], [self.first.id, self.second.id]
+        )
+        self.assertEqual([a["text"] for a in lines[0]["answers"]], ["A1", "A2"])
+        self.assertEqual(lines[1]["answers"], [])
+
+    def test_export_date_range(self) -> None:
+        """Тестирует фильтр по диапазону дат создания вопроса."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, {"since": "2025-01-01"})
+        self.assertEqual(
+            [line["id"] for line in self._lines(response)], [self.second.id]
+        )
+
+        response = self.client.get(self.url, {"until": "bad-date"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_export_async_under_asgi(self) -> None:
+        """Тестирует, что под ASGI выгрузка отдается асинхронным потоком."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        chunks: List[bytes] = [chunk async for chunk in response.streaming_content]
+        lines: List[Dict[str, Any]] = [
+            json.loads(line) for line in b"".join(chunks).decode().splitlines()
+        ]
+        self.assertEqual(
+            [line["id"] for line in lines], [self.first.id, self.second.id]
+        )
+
+
+@assert_query_budgets
+class UserAnswerListAPITest(APITestCase):
+    """Тесты списка ответов пользователя GET /users/<uuid>/answers/."""
+
+    def setUp(self) -> None:
+        """Подготовка ответов двух пользователей к двум вопросам."""
+        self.user_id: uuid.UUID = uuid.uuid4()
+        self.first: Question = Question.objects.create(text="First?")
+        self.second: Question = Question.objects.create(text="Second?")
+        for index, question in enumerate([self.first, self.second, self.first]):
+            Answer.objects.create(
+                question_id=question, user_id=self.user_id, text=f"Mine {index}"
+            )
+        Answer.objects.create(
+            question_id=self.first, user_id=uuid.uuid4(), text="Someone else"
+        )
+        Answer.objects.filter(text="Mine 0").update(
+            created_at=timezone.make_aware(datetime.datetime(2024, 1, 1))
+        )
+        self.url: str = reverse("user-answers", kwargs={"user_id": self.user_id})
+
+    def _texts(self, response: Any) -> List[str]:
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [answer["text"] for answer in response.data["results"]]
+
+    def test_list_newest_first_with_count(self) -> None:
+        """Тестирует порядок от новых к старым и count на первой странице."""
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(self._texts(response), ["Mine 2", "Mine 1"])
+        self.assertEqual(response.data["count"], 3)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(self._texts(response), ["Mine 0"])
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["next"])
+
+    def test_filters(self) -> None:
+        """Тестирует фильтры по вопросу и диапазону дат."""
+        response = self.client.get(self.url, {"question": self.first.id})
+        self.assertEqual(self._texts(response), ["Mine 2", "Mine 0"])
+        response = self.client.get(self.url, {"since": "2025-01-01"})
+        self.assertEqual(self._texts(response), ["Mine 2", "Mine 1"])
+        self.assertEqual(response.data["count"], 2)
+        response = self.client.get(self.url, {"until": "2025-01-01"})
+        self.assertEqual(self._texts(response), ["Mine 0"])
+
+    def test_invalid_filters(self) -> None:
+        """Тестирует ответ 400 на некорректные фильтры."""
+        for params in ({"since": "bad-date"}, {"question": "first"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_user(self) -> None:
+        """Тестирует пустой список для пользователя без ответов."""
+        response = self.client.get(
+            reverse("user-answers", kwargs={"user_id": uuid.uuid4()})
+        )
+        self.assertEqual(self._texts(response), [])
+        self.assertEqual(response.data["count"], 0)
@@ -0,0 +1,3 @@
+from api_qa.urls import build_urlpatterns
+
+urlpatterns = build_urlpatterns(use_async=True)
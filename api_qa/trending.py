@@ -0,0 +1,229 @@
+"""
+Рейтинг самых активных вопросов (``GET /questions/trending/``).
+
+Для каждого окна из QA_TRENDING_WINDOWS (имя — постоянная затухания τ
+в секундах) счет вопроса — сумма по его ответам
+``exp(-(now - created_at) / τ)``: только что созданный ответ дает 1,
+ответ возрастом τ — 1/e. Счета всех вопросов затухают с одной
+скоростью, поэтому их порядок от now не зависит, и в TrendingScore
+хранится не зависящая от времени величина в логарифмической шкале::
+
+    score = ln Σ exp((created_at - EPOCH) / τ)
+
+Создание ответа прибавляет к сумме слагаемое (log-sum-exp в одном
+UPSERT на все окна), удаление — вычитает его; пустая сумма хранится
+как NULL. Текущее значение счета — ``exp(score - (now - EPOCH) / τ)``.
+Рейтинг читается по индексу (window, score) за время, не зависящее от
+числа ответов. Команда rebuild_trending пересчитывает счета с нуля,
+например после изменения окон или импорта в обход ORM.
+"""
+
+import datetime
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Model
+from django.utils import timezone
+
+#: Начало отсчета времени для счетов; менять только вместе с rebuild_trending.
+EPOCH: datetime.datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+#: Разница логарифмов, после которой меньшее слагаемое не влияет на сумму
+#: (e^-30 ~ 1e-13) и EXP не вычисляется: на PostgreSQL EXP от большого
+#: по модулю аргумента дает ошибку переполнения.
+_NEGLIGIBLE: float = 30.0
+
+#: Строк в одной команде: держит число параметров ниже лимитов SQLite.
+CHUNK_ROWS: int = 1000
+
+#: Строка для UPSERT: окно, id вопроса, логарифм добавляемой суммы.
+Row = Tuple[str, int, float]
+
+
+def windows() -> Dict[str, float]:
+    """Возвращает окна рейтинга: имя и постоянную затухания в секундах."""
+
+    configured: Dict[str, float] = settings.QA_TRENDING_WINDOWS
+    return configured
+
+
+def position(created_at: datetime.datetime, tau: float) -> float:
+    """Логарифм вклада ответа: (created_at - EPOCH) / τ."""
+
+    return (created_at - EPOCH).total_seconds() / tau
+
+
+def _logsumexp(values: List[float]) -> float:
+    largest: float = max(values)
+    return largest + math.log(sum(math.exp(value - largest) for value in values))
+
+
+def rows(created: Mapping[int, Iterable[datetime.datetime]]) -> List[Row]:
+    """Сворачивает даты ответов по вопросам в строки для всех окон."""
+
+    result: List[Row] = []
+    for question_id, dates in created.items():
+        dates = list(dates)
+        if not dates:
+            continue
+        for window, tau in windows().items():
+            result.append(
+                (
+                    window,
+                    question_id,
+                    _logsumexp([position(created_at, tau) for created_at in dates]),
+                )
+            )
+    return result
+
+
+def _chunks(batch: List[Row]) -> Iterable[List[Row]]:
+    for start in range(0, len(batch), CHUNK_ROWS):
+        yield batch[start : start + CHUNK_ROWS]
+
+
+def _names(connection: BaseDatabaseWrapper) -> Dict[str, str]:
+    meta: Any = apps.get_model("api_qa", "TrendingScore")._meta
+    quote = connection.ops.quote_name
+    return {
+        "table": quote(meta.db_table),
+        "window": quote(meta.get_field("window").column),
+        "question": quote(meta.get_field("question").column),
+        "score": quote(meta.get_field("score").column),
+    }
+
+
+def add_sql(connection: BaseDatabaseWrapper, source: str) -> str:
+    """
+    Возвращает ``INSERT ... ON CONFLICT DO UPDATE``, прибавляющий суммы.
+
+    ``source`` — VALUES или SELECT со столбцами (окно, id вопроса,
+    логарифм суммы). Подходит для PostgreSQL и SQLite 3.24+.
+    """
+
+    names: Dict[str, str] = _names(connection)
+    old: str = "{table}.{score}".format(**names)
+    new: str = "excluded.{score}".format(**names)
+    return (
+        "INSERT INTO {table} ({window}, {question}, {score}) ".format(**names)
+        + source
+        + " ON CONFLICT ({window}, {question}) DO UPDATE SET {score} = ".format(**names)
+        + f"CASE WHEN {old} IS NULL OR {new} - {old} > {_NEGLIGIBLE} THEN {new} "
+        f"WHEN {old} - {new} > {_NEGLIGIBLE} THEN {old} "
+        f"WHEN {old} >= {new} THEN {old} + LN(1 + EXP({new} - {old})) "
+        f"ELSE {new} + LN(1 + EXP({old} - {new})) END"
+    )
+
+
+def values_sql(count: int, columns: int = 3) -> str:
+    """Возвращает ``VALUES (%s, ...), ...`` на count строк."""
+
+    row: str = "(" + ", ".join(["%s"] * columns) + ")"
+    return "VALUES " + ", ".join([row] * count)
+
+
+def add(
+    created: Mapping[int, Iterable[datetime.datetime]], using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """Учитывает созданные ответы: id вопроса -> даты создания."""
+
+    connection: BaseDatabaseWrapper = connections[using]
+    for batch in _chunks(rows(created)):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                add_sql(connection, values_sql(len(batch))),
+                [value for row in batch for value in row],
+            )
+
+
+def remove(
+    deleted: Mapping[int, Iterable[datetime.datetime]], using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """
+    Вычитает удаленные ответы командой ``UPDATE ... FROM (VALUES ...)``.
+
+    Если остаток суммы пренебрежимо мал (удалены все ответы окна), счет
+    становится NULL и вопрос выпадает из рейтинга.
+    """
+
+    connection: BaseDatabaseWrapper = connections[using]
+    names: Dict[str, str] = _names(connection)
+    old: str = "{table}.{score}".format(**names)
+    new: str = "removed.column3"
+    for batch in _chunks(rows(deleted)):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE {table} SET {score} = ".format(**names)
+                + f"CASE WHEN {old} IS NULL OR {old} - {new} < 1e-9 THEN NULL "
+                f"WHEN {old} - {new} > {_NEGLIGIBLE} THEN {old} "
+                f"ELSE {old} + LN(1 - EXP({new} - {old})) END "
+                f"FROM ({values_sql(len(batch))}) AS removed "
+                "WHERE {table}.{window} = removed.column1 ".format(**names)
+                + "AND {table}.{question} = removed.column2".format(**names),
+                [value for row in batch for value in row],
+            )
+
+
+def top(window: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Возвращает первые limit вопросов окна с текущими счетами.
+
+    Один запрос по индексу (window, score) с join вопросов.
+    """
+
+    model: type[Model] = apps.get_model("api_qa", "TrendingScore")
+    now: float = position(timezone.now(), windows()[window])
+    result: List[Dict[str, Any]] = []
+    for row in (
+        model.objects.filter(window=window, score__isnull=False)
+        .order_by("-score")
+        .values("question_id", "question__text", "question__answers_count", "score")[
+            :limit
+        ]
+    ):
+        result.append(
+            {
+                "id": row["question_id"],
+                "text": row["question__text"],
+                "answers_count": row["question__answers_count"],
+                "score": round(math.exp(min(row["score"] - now, _NEGLIGIBLE)), 6),
+            }
+        )
+    return result
+
+
+def rebuild(batch_size: int = 10000, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Пересчитывает все счета по таблице ответов в одной транзакции.
+
+    Ответы читаются потоком (question_id, created_at) в порядке вопросов,
+    суммы пишутся пачками вопросов. Возвращает число вопросов с ответами.
+    """
+
+    model: type[Model] = apps.get_model("api_qa", "TrendingScore")
+    answers: Any = apps.get_model("api_qa", "Answer")
+    questions: int = 0
+    pending: Dict[int, List[datetime.datetime]] = defaultdict(list)
+    current: Optional[int] = None
+    with transaction.atomic(using=using):
+        model.objects.using(using).all().delete()
+        for question_id, created_at in (
+            answers.objects.using(using)
+            .order_by("question_id", "created_at")
+            .values_list("question_id", "created_at")
+            .iterator(chunk_size=batch_size)
+        ):
+            if question_id != current:
+                current = question_id
+                questions += 1
+                if len(pending) >= batch_size:
+                    add(pending, using)
+                    pending.clear()
+            pending[question_id].append(created_at)
+        add(pending, using)
+    return questions
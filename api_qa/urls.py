@@ -1,18 +1,84 @@
-from django.urls import path
-
-from . import views
-
-urlpatterns = [
-    path("questions/", views.QuestionListCreateView.as_view(), name="question-list"),
-    path(
-        "questions/<int:pk>/",
-        views.QuestionDetailView.as_view(),
-        name="question-detail",
-    ),
-    path(
-        "questions/<int:question_id>/answers/",
-        views.AnswerCreateView.as_view(),
-        name="answer-create",
-    ),
-    path("answers/<int:pk>/", views.AnswerDetailView.as_view(), name="answer-detail"),
-]
+from types import ModuleType
+from typing import List
+
+from django.conf import settings
+from django.urls import URLPattern, path
+
+from . import async_views, monitoring, views
+
+
+def build_urlpatterns(use_async: bool) -> List[URLPattern]:
+    """
+    Возвращает маршруты API.
+
+    При ``use_async`` вопросы и ответы обслуживаются async views из
+    async_views.py (для ASGI сервера), иначе — синхронными views DRF.
+    URL, имена маршрутов и формат ответов одинаковы. Поток новых ответов
+    (SSE) всегда обслуживается async view.
+    """
+
+    module: ModuleType = async_views if use_async else views
+    return [
+        path(
+            "questions/",
+            module.QuestionListCreateView.as_view(),
+            name="question-list",
+        ),
+        path(
+            "questions/trending/",
+            views.TrendingQuestionsView.as_view(),
+            name="question-trending",
+        ),
+        path(
+            "questions/<int:pk>/",
+            module.QuestionDetailView.as_view(),
+            name="question-detail",
+        ),
+        path(
+            "questions/<int:question_id>/answers/",
+            module.AnswerCreateView.as_view(),
+            name="answer-create",
+        ),
+        path(
+            "questions/<int:question_id>/answers/stream/",
+            async_views.AnswerStreamView.as_view(),
+            name="answer-stream",
+        ),
+        path(
+            "questions/<int:question_id>/answers/bulk/",
+            views.AnswerBulkCreateView.as_view(),
+            name="answer-bulk-create",
+        ),
+        path("answers/", views.AnswerSearchView.as_view(), name="answer-search"),
+        path(
+            "answers/bulk/",
+            views.AnswerBulkCreateView.as_view(),
+            name="answer-bulk-create-any",
+        ),
+        path(
+            "users/<uuid:user_id>/answers/",
+            views.UserAnswerListView.as_view(),
+            name="user-answers",
+        ),
+        path(
+            "export/questions/",
+            views.QuestionExportView.as_view(),
+            name="question-export",
+        ),
+        path(
+            "answers/<int:pk>/",
+            module.AnswerDetailView.as_view(),
+            name="answer-detail",
+        ),
+        path("health/", monitoring.health, name="health"),
+        path("ready/", monitoring.ready, name="ready"),
+        path("metrics", monitoring.metrics, name="metrics"),
+        path(
+            "internal/db-pool/",
+            views.DatabasePoolView.as_view(),
+            name="db-pool",
+        ),
+    ]
+
+
+urlpatterns = build_urlpatterns(settings.QA_ASYNC_VIEWS)
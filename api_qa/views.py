@@ -1,14 +1,50 @@
+import abc
 import logging
-from typing import Any, Type
+import os
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponseBase, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, status
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from . import conditional, events, fast, purge, trending
+from .cache import invalidate_question, question_detail_cache, question_list_version
+from .db import pool_stats
+from .export import aiter_questions_ndjson, iter_questions_ndjson, parse_bound
 from .models import Answer, Question
+from .pagination import (
+    AnswerCursorPagination,
+    QuestionCursorPagination,
+    SearchCursorPagination,
+    UserAnswerCursorPagination,
+    get_search_query,
+    is_cursor_requested,
+)
+from .search import search
 from .serializers import (
+    AnswerBulkItemSerializer,
     AnswerCreateSerializer,
     AnswerSerializer,
     QuestionDetailSerializer,
@@ -18,10 +54,82 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
-class QuestionListCreateView(generics.ListCreateAPIView):
+class FastListMixin(abc.ABC):
+    """
+    Быстрый путь list() для GET эндпоинтов.
+
+    При QA_FAST_SERIALIZATION строки выбираются через ``.values()`` и
+    превращаются в словари методом fast_items вместо сериализатора DRF.
+    """
+
+    fast_fields: ClassVar[Tuple[str, ...]] = ()
+
+    @abc.abstractmethod
+    def fast_items(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Превращает строки ``.values()`` в элементы ответа."""
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if not fast.is_enabled():
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        view: Any = self
+        rows: QuerySet = view.filter_queryset(view.get_queryset()).values(
+            *fast.value_fields(self.fast_fields, view.paginator)
+        )
+        page: List[Dict[str, Any]] | None = view.paginate_queryset(rows)
+        items: List[Dict[str, Any]] = self.fast_items(rows if page is None else page)
+        if page is not None:
+            return view.get_paginated_response(items)
+        return Response(items)
+
+
+class QuestionListCreateView(FastListMixin, generics.ListCreateAPIView):
     """View для получения списка вопросов и создания нового вопроса."""
 
     queryset = Question.objects.all()
+    fast_fields: ClassVar[Tuple[str, ...]] = fast.QUESTION_LIST_FIELDS
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Отдает 304 по ETag/Last-Modified версии списка без запросов к БД."""
+
+        current: conditional.Validators | None = conditional.validators(
+            request, question_list_version.get()
+        )
+        cached: HttpResponseBase | None = conditional.not_modified(request, current)
+        if cached is not None:
+            return cached  # type: ignore[return-value]
+        response: Response = super().list(request, *args, **kwargs)
+        conditional.patch_headers(response, current)
+        return response
+
+    def get_queryset(self) -> QuerySet:
+        """Возвращает вопросы, при ``?q=`` — результаты полнотекстового поиска."""
+
+        queryset: QuerySet = super().get_queryset()
+        query: str = get_search_query(self.request)
+        if self.request.method == "GET" and query:
+            return search(queryset, query)
+        return queryset
+
+    @property
+    def pagination_class(self) -> Type[BasePagination] | None:
+        """
+        Возвращает класс пагинации для списка вопросов.
+
+        По умолчанию используется глобальная PageNumberPagination. При
+        ``?pagination=cursor`` или наличии ``?cursor=`` включается keyset
+        пагинация по (created_at, id) без COUNT(*) и OFFSET. Результаты
+        поиска ``?q=`` всегда упорядочены по релевантности и разбиты
+        на страницы по (rank, id). Экземпляр создает и запоминает
+        свойство ``paginator`` DRF.
+        """
+
+        if get_search_query(self.request):
+            return SearchCursorPagination
+        if is_cursor_requested(self.request):
+            return QuestionCursorPagination
+        default: Type[BasePagination] | None = api_settings.DEFAULT_PAGINATION_CLASS
+        return default
 
     def get_serializer_class(self) -> Type[Serializer]:
         """
@@ -36,11 +144,15 @@ class QuestionListCreateView(generics.ListCreateAPIView):
             return QuestionListSerializer
         return QuestionDetailSerializer
 
+    def fast_items(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [fast.question_list_item(row) for row in rows]
+
     def perform_create(self, serializer: Serializer) -> None:
         """Логирует создание нового вопроса."""
 
         instance: Question = serializer.save()
-        logger.info(f"Created question #{instance.id}: {instance.text[:50]}...")
+        question_list_version.bump()
+        logger.info("Created question #%s: %s...", instance.id, instance.text[:50])
 
 
 class QuestionDetailView(generics.RetrieveDestroyAPIView):
@@ -49,34 +161,158 @@ class QuestionDetailView(generics.RetrieveDestroyAPIView):
     queryset = Question.objects.all()
     serializer_class: Type[Serializer] = QuestionDetailSerializer
 
-    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Обрабатывает GET запрос для получения вопроса."""
+    cache_key: str | None = None
 
-        instance: Question = self.get_object()
-        serializer: Serializer = self.get_serializer(instance)
-        logger.info(f"Retrieved question #{instance.id}")
-        return Response(serializer.data)
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """
+        Обрабатывает GET запрос для получения вопроса.
+
+        Отрендеренный ответ кэшируется по id вопроса и его версии; при
+        попадании в кэш запросы к БД и сериализация не выполняются.
+        """
+
+        question_id: int = kwargs["pk"]
+        version: str = question_detail_cache.version(question_id)
+        cache_key: str = question_detail_cache.make_key(question_id, version, request)
+        cached: HttpResponseBase | None = question_detail_cache.get(cache_key)
+        if cached is not None:
+            cached["X-Cache"] = "HIT"
+            logger.info("Retrieved question #%s from cache", question_id)
+            return cached
+
+        data: Dict[str, Any]
+        if fast.is_enabled():
+            row: Dict[str, Any] = get_object_or_404(
+                self.get_queryset().values(*fast.QUESTION_DETAIL_FIELDS),
+                pk=question_id,
+            )
+            data = fast.question_detail(row, request)
+        else:
+            instance: Question = self.get_object()
+            data = self.get_serializer(instance).data
+        logger.info("Retrieved question #%s", question_id)
+        self.cache_key = cache_key
+        return Response(data, headers={"X-Cache": "MISS"})
+
+    def finalize_response(
+        self, request: Request, response: HttpResponseBase, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """Рендерит успешный ответ и сохраняет его тело в кэш."""
+
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            self.cache_key is not None
+            and isinstance(response, Response)
+            and response.status_code == status.HTTP_200_OK
+        ):
+            response.render()
+            question_detail_cache.set(self.cache_key, response)
+        return response
 
     def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Обрабатывает DELETE запрос для удаления вопроса."""
+        """
+        Обрабатывает DELETE запрос для удаления вопроса.
+
+        Ответы удаляются одним ``DELETE`` без загрузки в Python; вопрос
+        с большим числом ответов удаляется в фоне пачками (см. purge),
+        а запрос получает 202.
+        """
 
         instance: Question = self.get_object()
         question_id: int = instance.id
+        if purge.is_large(instance):
+            purge.schedule(question_id)
+            logger.info(
+                "Scheduled purge of question #%s with %s answers",
+                question_id,
+                instance.answers_count,
+            )
+            return Response(status=status.HTTP_202_ACCEPTED)
         self.perform_destroy(instance)
-        logger.info(f"Deleted question #{question_id} with all its answers")
+        invalidate_question(question_id)
+        logger.info("Deleted question #%s with all its answers", question_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AnswerCreateView(generics.CreateAPIView):
-    """View для создания ответа на конкретный вопрос."""
+class TrendingQuestionsView(APIView):
+    """
+    View рейтинга самых активных вопросов (``GET /questions/trending/``).
+
+    Счета поддерживаются инкрементально при создании и удалении ответов
+    (api_qa.trending), поэтому ответ — один запрос по индексу без
+    агрегации ответов. Параметры: ``window`` — окно из
+    QA_TRENDING_WINDOWS (по умолчанию первое), ``limit`` — размер
+    рейтинга (не больше QA_TRENDING_MAX_LIMIT).
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Возвращает вопросы окна по убыванию текущего счета."""
+
+        windows: Dict[str, float] = trending.windows()
+        window: str = request.query_params.get("window") or next(iter(windows))
+        if window not in windows:
+            raise ValidationError(
+                {"window": [f"Допустимые окна: {', '.join(windows)}."]}
+            )
+        limit: str = request.query_params.get("limit", "")
+        if limit and not limit.isdigit():
+            raise ValidationError({"limit": ["Укажите целое число."]})
+        size: int = min(
+            int(limit or settings.QA_TRENDING_LIMIT), settings.QA_TRENDING_MAX_LIMIT
+        )
+        return Response({"window": window, "results": trending.top(window, size)})
+
+
+class AnswerCreateView(FastListMixin, generics.ListCreateAPIView):
+    """View для списка ответов на вопрос и создания нового ответа."""
 
     queryset = Answer.objects.all()
-    serializer_class: Type[Serializer] = AnswerCreateSerializer
+    pagination_class = AnswerCursorPagination
+    fast_fields: ClassVar[Tuple[str, ...]] = fast.ANSWER_FIELDS
 
-    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Создает новый ответ для указанного вопроса."""
+    def get_serializer_class(self) -> Type[Serializer]:
+        """
+        Возвращает класс сериализатора в зависимости от метода запроса.
+
+        Returns:
+            AnswerSerializer для GET запросов (список)
+            AnswerCreateSerializer для POST запросов (создание)
+        """
+
+        if self.request.method == "GET":
+            return AnswerSerializer
+        return AnswerCreateSerializer
+
+    def fast_items(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return fast.answer_items(rows)
+
+    def get_queryset(self) -> QuerySet:
+        """Возвращает ответы на вопрос из URL."""
+
+        return Answer.objects.filter(question_id=self.kwargs["question_id"])
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Возвращает страницу ответов на вопрос в порядке создания."""
 
         question_id = kwargs.get("question_id")
+        if not Question.objects.filter(id=question_id).exists():
+            raise Http404
+        return super().list(request, *args, **kwargs)
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Создает новый ответ для указанного вопроса.
+
+        При QA_SINGLE_QUERY_WRITES существование вопроса не проверяется
+        отдельным запросом: ответ вставляется одной командой (см.
+        AnswerQuerySet.create_for_question), а отсутствие вопроса, в том
+        числе нарушение внешнего ключа, дает тот же ответ 404.
+        """
+
+        # Маршрут <int:question_id> уже преобразовал id в число.
+        question_id: int = kwargs["question_id"]
+        if settings.QA_SINGLE_QUERY_WRITES:
+            return self._create_single_query(request, question_id)
         question: Question = get_object_or_404(Question, id=question_id)
 
         serializer: Serializer = self.get_serializer(data=request.data)
@@ -87,15 +323,220 @@ class AnswerCreateView(generics.CreateAPIView):
             user_id=serializer.validated_data["user_id"],
             text=serializer.validated_data["text"],
         )
+        invalidate_question(question.id)
+        events.publish(question.id, answer.id)
 
         logger.info(
-            f"User {answer.user_id} created answer "
-            f"#{answer.id} for question #{question_id}"
+            "User %s created answer #%s for question #%s",
+            answer.user_id,
+            answer.id,
+            question_id,
         )
 
         response_serializer: AnswerSerializer = AnswerSerializer(answer)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+    def _create_single_query(self, request: Request, question_id: int) -> Response:
+        serializer: Serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            row: Dict[str, Any] | None = Answer.objects.create_for_question(
+                question_id,
+                serializer.validated_data["user_id"],
+                serializer.validated_data["text"],
+            )
+        except IntegrityError:
+            row = None
+        if row is None:
+            raise Http404
+        invalidate_question(question_id)
+        events.publish(question_id, row["id"])
+
+        logger.info(
+            "User %s created answer #%s for question #%s",
+            row["user_id"],
+            row["id"],
+            question_id,
+        )
+        return Response(
+            fast.answer_item(row, fast.current_timezone()),
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class AnswerSearchView(FastListMixin, generics.ListAPIView):
+    """View для полнотекстового поиска по ответам (``GET /answers/?q=``)."""
+
+    queryset = Answer.objects.all()
+    serializer_class: Type[Serializer] = AnswerSerializer
+    pagination_class = SearchCursorPagination
+    fast_fields: ClassVar[Tuple[str, ...]] = fast.ANSWER_FIELDS
+
+    def fast_items(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return fast.answer_items(rows)
+
+    def get_queryset(self) -> QuerySet:
+        """Возвращает ответы, найденные по запросу ``q``."""
+
+        query: str = get_search_query(self.request)
+        if not query:
+            raise ValidationError({"q": ["Укажите поисковый запрос."]})
+        return search(super().get_queryset(), query)
+
+
+class UserAnswerListView(FastListMixin, generics.ListAPIView):
+    """
+    View для списка ответов пользователя (``GET /users/<uuid>/answers/``).
+
+    Ответы упорядочены от новых к старым и выбираются по индексу
+    (user_id, created_at, id). Необязательные параметры: ``question`` —
+    id вопроса, ``since`` и ``until`` — границы даты создания
+    (``since <= created_at < until``).
+    """
+
+    queryset = Answer.objects.all()
+    serializer_class: Type[Serializer] = AnswerSerializer
+    pagination_class = UserAnswerCursorPagination
+    fast_fields: ClassVar[Tuple[str, ...]] = fast.ANSWER_FIELDS
+
+    def fast_items(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return fast.answer_items(rows)
+
+    def get_queryset(self) -> QuerySet:
+        """Возвращает ответы пользователя из URL с учетом фильтров."""
+
+        params: Dict[str, str] = self.request.query_params
+        queryset: QuerySet = (
+            super().get_queryset().filter(user_id=self.kwargs["user_id"])
+        )
+        try:
+            since = parse_bound(params.get("since"))
+            until = parse_bound(params.get("until"))
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)}) from exc
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        if until is not None:
+            queryset = queryset.filter(created_at__lt=until)
+        question: str | None = params.get("question")
+        if question:
+            if not question.isdigit():
+                raise ValidationError({"question": ["Укажите id вопроса."]})
+            queryset = queryset.filter(question_id=int(question))
+        return queryset
+
+
+class AnswerBulkCreateView(generics.GenericAPIView):
+    """
+    View для пакетного создания ответов.
+
+    ``POST /questions/<id>/answers/bulk/`` принимает список объектов
+    ``{"user_id", "text"}``, ``POST /answers/bulk/`` — список объектов
+    ``{"question_id", "user_id", "text"}``. Валидные элементы вставляются
+    одним bulk_create в одной транзакции, невалидные возвращаются в
+    ``errors`` с индексом элемента и не мешают остальным.
+    """
+
+    queryset = Answer.objects.all()
+
+    def get_serializer_class(self) -> Type[Serializer]:
+        if "question_id" in self.kwargs:
+            return AnswerCreateSerializer
+        return AnswerBulkItemSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Создает пакет ответов и возвращает их id в порядке запроса."""
+
+        items: Any = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"detail": "Ожидается список ответов."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > settings.QA_BULK_ANSWERS_MAX:
+            return Response(
+                {
+                    "detail": "Слишком много ответов в одном запросе "
+                    f"(максимум {settings.QA_BULK_ANSWERS_MAX})."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        path_question_id: int | None = kwargs.get("question_id")
+        if path_question_id is not None:
+            get_object_or_404(Question.objects.only("id"), id=path_question_id)
+
+        valid: List[Tuple[int, Dict[str, Any]]]
+        errors: List[Dict[str, Any]]
+        valid, errors = self._validate(items, path_question_id)
+
+        answers: List[Answer] = [
+            Answer(
+                question_id_id=data["question_id"],
+                user_id=data["user_id"],
+                text=data["text"],
+            )
+            for _, data in valid
+        ]
+        with transaction.atomic():
+            created: List[Answer] = Answer.objects.bulk_create(
+                answers, batch_size=settings.QA_BULK_BATCH_SIZE
+            )
+        for question_id in {answer.question_id_id for answer in created}:
+            question_detail_cache.bump(question_id)
+        question_list_version.bump()
+
+        logger.info(
+            "Bulk created %s answers, rejected %s items", len(created), len(errors)
+        )
+
+        response_status: int = (
+            status.HTTP_201_CREATED
+            if created or not errors
+            else status.HTTP_400_BAD_REQUEST
+        )
+        return Response(
+            {"created": [answer.id for answer in created], "errors": errors},
+            status=response_status,
+        )
+
+    def _validate(
+        self, items: List[Any], path_question_id: int | None
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+        """Возвращает валидные элементы с их индексами и ошибки по индексам."""
+
+        errors: List[Dict[str, Any]] = []
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            serializer: Serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                data: Dict[str, Any] = dict(serializer.validated_data)
+                data.setdefault("question_id", path_question_id)
+                valid.append((index, data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+        if path_question_id is None:
+            valid = self._with_existing_questions(valid, errors)
+        return valid, errors
+
+    @staticmethod
+    def _with_existing_questions(
+        valid: List[Tuple[int, Dict[str, Any]]], errors: List[Dict[str, Any]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        # Существование всех вопросов пакета проверяется одним запросом.
+        existing: Set[int] = set(
+            Question.objects.filter(id__in={data["question_id"] for _, data in valid})
+            .order_by()
+            .values_list("id", flat=True)
+        )
+        for index, data in valid:
+            if data["question_id"] not in existing:
+                errors.append(
+                    {"index": index, "errors": {"question_id": ["Вопрос не найден."]}}
+                )
+        errors.sort(key=lambda error: error["index"])
+        return [item for item in valid if item[1]["question_id"] in existing]
+
 
 class AnswerDetailView(generics.RetrieveDestroyAPIView):
     """View для получения и удаления конкретного ответа."""
@@ -105,9 +546,16 @@ class AnswerDetailView(generics.RetrieveDestroyAPIView):
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Обрабатывает GET запрос для получения ответа."""
+        if fast.is_enabled():
+            row: Dict[str, Any] = get_object_or_404(
+                self.get_queryset().values(*fast.ANSWER_FIELDS), pk=kwargs["pk"]
+            )
+            logger.info("Retrieved answer #%s", row["id"])
+            return Response(fast.answer_item(row, fast.current_timezone()))
+
         instance: Answer = self.get_object()
         serializer: Serializer = self.get_serializer(instance)
-        logger.info(f"Retrieved answer #{instance.id}")
+        logger.info("Retrieved answer #%s", instance.id)
         return Response(serializer.data)
 
     def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -115,5 +563,63 @@ class AnswerDetailView(generics.RetrieveDestroyAPIView):
         instance: Answer = self.get_object()
         answer_id: int = instance.id
         self.perform_destroy(instance)
-        logger.info(f"Deleted answer #{answer_id}")
+        invalidate_question(instance.question_id_id)
+        logger.info("Deleted answer #%s", answer_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class QuestionExportView(APIView):
+    """
+    View для потоковой выгрузки вопросов с ответами в NDJSON.
+
+    Параметры ``since`` и ``until`` ограничивают дату создания вопросов
+    (``since <= created_at < until``). Ответ формируется построчно,
+    поэтому память воркера не зависит от размера таблиц. Под ASGI
+    поток отдается асинхронным итератором, иначе Django собрал бы его
+    в список перед отправкой.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Обрабатывает GET запрос для выгрузки вопросов."""
+
+        try:
+            since = parse_bound(request.query_params.get("since"))
+            until = parse_bound(request.query_params.get("until"))
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)}) from exc
+
+        logger.info("Export of questions started by user #%s", request.user.pk)
+        content: Union[Iterator[bytes], AsyncIterator[bytes]]
+        # Атрибут scope есть только у ASGIRequest (Request DRF его проксирует).
+        if hasattr(request, "scope"):
+            content = aiter_questions_ndjson(since, until)
+        else:
+            content = iter_questions_ndjson(since, until)
+        response = StreamingHttpResponse(
+            content, content_type="application/x-ndjson; charset=utf-8"
+        )
+        response["Content-Disposition"] = 'attachment; filename="questions.ndjson"'
+        return response
+
+
+class DatabasePoolView(APIView):
+    """
+    View статистики пулов соединений БД (только для администраторов).
+
+    Пул у каждого процесса свой, поэтому ответ относится к воркеру,
+    обработавшему запрос (его pid указан в ответе).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Возвращает статистику пула по каждому алиасу БД."""
+
+        return Response(
+            {
+                "pid": os.getpid(),
+                "pools": {alias: pool_stats(alias) for alias in settings.DATABASES},
+            }
+        )
@@ -2,6 +2,9 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Long-lived responses (the server-sent event stream of new answers,
+``api_qa.async_views.AnswerStreamView``) are kept open only when served
+from this application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
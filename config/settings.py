@@ -10,9 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
 import sys
 from os import getenv
 from pathlib import Path
+from typing import Any, Dict
 
 from dotenv import load_dotenv
 
@@ -51,6 +53,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api_qa.middleware.MetricsMiddleware",
+    "api_qa.middleware.RequestLogMiddleware",
+    "api_qa.middleware.QueryBudgetMiddleware",
+    "api_qa.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,7 +89,7 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+DATABASES: Dict[str, Dict[str, Any]] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": getenv("POSTGRES_DB"),
@@ -91,14 +97,106 @@ DATABASES = {
         "PASSWORD": getenv("POSTGRES_PASSWORD"),
         "HOST": getenv("POSTGRES_HOST", "db"),
         "PORT": getenv("POSTGRES_PORT", "5432"),
+        # Проверка соединения перед использованием (и при выдаче из пула)
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Пул соединений psycopg 3: соединения переиспользуются между запросами
+# воркера вместо подключения к PostgreSQL на каждый запрос. Размер пула
+# задается на процесс (воркер gunicorn/uvicorn). Без пула можно включить
+# постоянные соединения через POSTGRES_CONN_MAX_AGE.
+if getenv("POSTGRES_POOL", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+            "max_size": int(getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+            "timeout": float(getenv("POSTGRES_POOL_TIMEOUT", "10")),
+            "max_lifetime": float(getenv("POSTGRES_POOL_MAX_LIFETIME", "3600")),
+            "max_idle": float(getenv("POSTGRES_POOL_MAX_IDLE", "600")),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(getenv("POSTGRES_CONN_MAX_AGE", "0"))
+
+# Реплики только для чтения: POSTGRES_REPLICA_HOSTS — адреса через
+# запятую, остальные параметры подключения совпадают с primary. Чтения
+# распределяются по репликам (api_qa/routers.py); после записи клиент
+# QA_DB_PRIMARY_STICKY секунд читает с primary, чтобы видеть свои
+# изменения. Реплика, не прошедшая проверку ready/, исключается на
+# QA_DB_REPLICA_RETRY секунд. Ответы, прочитанные с реплики, кэшируются
+# не дольше QA_DB_REPLICA_CACHE_TIMEOUT секунд: иначе кэш мог бы надолго
+# сохранить данные отстающей реплики.
+QA_DB_REPLICAS = []
+for index, host in enumerate(
+    filter(None, getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica{index + 1}"
+    DATABASES[alias] = {**copy.deepcopy(DATABASES["default"]), "HOST": host.strip()}
+    QA_DB_REPLICAS.append(alias)
+QA_DB_PRIMARY_STICKY = int(getenv("QA_DB_PRIMARY_STICKY", "5"))
+QA_DB_PRIMARY_COOKIE = "qa_primary"
+QA_DB_REPLICA_RETRY = float(getenv("QA_DB_REPLICA_RETRY", "30"))
+QA_DB_REPLICA_CACHE_TIMEOUT = int(getenv("QA_DB_REPLICA_CACHE_TIMEOUT", "5"))
+
+DATABASE_ROUTERS = ["api_qa.routers.ReplicaRouter"]
+
+if "test" in sys.argv:
+    # Вторая база — реплика для тестов маршрутизации; по умолчанию
+    # QA_DB_REPLICAS пуст и все запросы идут в default.
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        },
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        },
+    }
+    QA_DB_REPLICAS = []
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Версии вопросов и списка (api_qa/cache.py) должны быть общими для всех
+# воркеров: иначе запись, обработанная одним воркером, не инвалидирует
+# кэш остальных. В production кэш — Redis (REDIS_URL); локальный кэш
+# процесса допустим только при DEBUG и в тестах, иначе проверка
+# api_qa.E001 не дает запустить migrate и runserver.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+if getenv("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": getenv("REDIS_URL", ""),
+    }
+
+QA_CACHE_REQUIRE_SHARED = not DEBUG
+
 if "test" in sys.argv:
-    DATABASES["default"] = {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": ":memory:",
+    # Тесты работают с LocMemCache: кэш очищается перед каждым тестом
+    # (api_qa.tests.runner.QATestRunner).
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
+    QA_CACHE_REQUIRE_SHARED = False
+    TEST_RUNNER = "api_qa.tests.runner.QATestRunner"
+
+# Алиас кэша для ответов API и время жизни кэша GET /questions/<id>/
+QA_CACHE_ALIAS = "default"
+QA_DETAIL_CACHE_TIMEOUT = int(getenv("QA_DETAIL_CACHE_TIMEOUT", "300"))
+
+# max-age ответов GET /questions/ (Cache-Control: public). Ответы несут
+# ETag и Last-Modified по версии списка, которая меняется при любой
+# записи вопросов и ответов; nginx микрокэширует страницы на этот срок
+# и затем перепроверяет их условным запросом (304 без запросов к БД).
+QA_LIST_MAX_AGE = int(getenv("QA_LIST_MAX_AGE", "5"))
 
 
 # Password validation
@@ -144,16 +242,144 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# JSON рендерер и парсер на orjson (api_qa/renderers.py): без установленного
+# orjson или при QA_FAST_JSON=0 используются стандартные классы DRF.
+# Первый рендерер должен выдавать JSON: его используют async views
+QA_FAST_JSON = getenv("QA_FAST_JSON", "1") == "1"
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        (
+            "api_qa.renderers.FastJSONRenderer"
+            if QA_FAST_JSON
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        (
+            "api_qa.renderers.FastJSONParser"
+            if QA_FAST_JSON
+            else "rest_framework.parsers.JSONParser"
+        ),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Сериализация GET эндпоинтов через .values() вместо сериализаторов DRF
+QA_FAST_SERIALIZATION = getenv("QA_FAST_SERIALIZATION", "1") == "1"
+
+# Async views (api_qa/async_views.py) для вопросов и ответов; включается
+# при запуске под ASGI сервером (config.asgi:application)
+QA_ASYNC_VIEWS = getenv("QA_ASYNC_VIEWS", "0") == "1"
+
+# Количество ответов, встраиваемых в GET /questions/<id>/
+QA_DETAIL_ANSWERS_LIMIT = 20
+
+# Ограничения пакетного создания ответов (POST .../answers/bulk/)
+QA_BULK_ANSWERS_MAX = 5000
+QA_BULK_BATCH_SIZE = 1000
+
+# Создание ответа одной командой INSERT ... RETURNING без отдельной
+# проверки существования вопроса (AnswerQuerySet.create_for_question)
+QA_SINGLE_QUERY_WRITES = getenv("QA_SINGLE_QUERY_WRITES", "1") == "1"
+
+# Вопросы, у которых ответов больше порога, удаляются в фоне пачками
+# (DELETE отвечает 202); 0 отключает фоновое удаление
+QA_PURGE_ASYNC_THRESHOLD = int(getenv("QA_PURGE_ASYNC_THRESHOLD", "10000"))
+QA_PURGE_BATCH_SIZE = int(getenv("QA_PURGE_BATCH_SIZE", "5000"))
+
+# Поток новых ответов GET /questions/<id>/answers/stream/ (SSE, под
+# ASGI): комментарий keepalive при простое, закрытие потока для
+# переподключения (секунды), интервал переподключения клиента (мс),
+# максимум пропущенных ответов за одно подключение и размер очереди
+# подписчика, при переполнении которой поток закрывается
+QA_STREAM_KEEPALIVE = float(getenv("QA_STREAM_KEEPALIVE", "15"))
+QA_STREAM_MAX_AGE = float(getenv("QA_STREAM_MAX_AGE", "300"))
+QA_STREAM_RETRY = int(getenv("QA_STREAM_RETRY", "3000"))
+QA_STREAM_BACKLOG = int(getenv("QA_STREAM_BACKLOG", "100"))
+QA_STREAM_QUEUE_SIZE = int(getenv("QA_STREAM_QUEUE_SIZE", "100"))
+
+# Рейтинг GET /questions/trending/: окна в виде "имя=секунды,..." —
+# постоянная затухания вклада ответа (ответ возрастом в окно дает 1/e);
+# после изменения окон нужна команда rebuild_trending. Размер рейтинга
+# по умолчанию и максимальный (?limit=)
+QA_TRENDING_WINDOWS = {
+    name.strip(): float(seconds)
+    for name, _, seconds in (
+        item.partition("=")
+        for item in getenv(
+            "QA_TRENDING_WINDOWS", "hour=3600,day=86400,week=604800"
+        ).split(",")
+    )
+}
+QA_TRENDING_LIMIT = int(getenv("QA_TRENDING_LIMIT", "20"))
+QA_TRENDING_MAX_LIMIT = int(getenv("QA_TRENDING_MAX_LIMIT", "100"))
+
+# Админка на больших таблицах: оценка числа строк без фильтров из
+# pg_class.reltuples (для таблиц больше порога), ограничение COUNT(*) для
+# отфильтрованных списков и число ответов в inline на странице вопроса
+QA_ADMIN_ESTIMATE_THRESHOLD = 100000
+QA_ADMIN_COUNT_LIMIT = 10000
+QA_ADMIN_INLINE_ANSWERS = 20
+
+# Метрики /metrics: каталог для снимков метрик воркеров (нужен при
+# нескольких воркерах gunicorn; снимки завершенных воркеров переносятся
+# в archive.json) и период записи снимка
+QA_METRICS_DIR = getenv("QA_METRICS_DIR", "")
+QA_METRICS_FLUSH_INTERVAL = float(getenv("QA_METRICS_FLUSH_INTERVAL", "1"))
+
+# Бюджет SQL запросов на HTTP запрос по имени маршрута и методу
+# (остальные — QA_QUERY_BUDGET_DEFAULT): превышение пишется в лог, а в
+# тестах с api_qa.tests.budgets.assert_query_budgets — ошибка.
+# QA_QUERY_HEADERS добавляет в ответы заголовки X-Query-Count и X-DB-Time (мс)
+QA_QUERY_HEADERS = getenv("QA_QUERY_HEADERS", "0") == "1"
+QA_QUERY_BUDGET_STRICT = False
+QA_QUERY_BUDGET_DEFAULT = 10
+QA_QUERY_BUDGETS = {
+    ("question-list", "GET"): 2,
+    ("question-list", "POST"): 2,
+    ("question-trending", "GET"): 1,
+    ("question-detail", "GET"): 2,
+    ("question-detail", "DELETE"): 5,
+    ("answer-create", "GET"): 2,
+    ("answer-create", "POST"): 6,
+    ("answer-stream", "GET"): 2,
+    ("answer-bulk-create", "POST"): 6,
+    ("answer-bulk-create-any", "POST"): 8,
+    ("answer-search", "GET"): 2,
+    ("user-answers", "GET"): 2,
+    ("question-export", "GET"): 2,
+    ("answer-detail", "GET"): 1,
+    ("answer-detail", "DELETE"): 6,
+    ("health", "GET"): 0,
+    ("ready", "GET"): 1 + len(QA_DB_REPLICAS),
+    ("metrics", "GET"): 0,
+    ("db-pool", "GET"): 2,
 }
 
-# Logging configuration
+# Logging configuration: записи api_qa пишет в файл (JSON) и консоль
+# фоновый поток (api_qa/log.py). Файл пишут все процессы сервера, поэтому
+# он не ротируется изнутри: WatchedFileHandler переоткрывает его после
+# переименования внешним logrotate. INFO записи маршрутов из
+# QA_LOG_SAMPLE_RATES попадают в лог только для этой доли запросов.
 LOG_DIR = BASE_DIR / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+QA_LOG_SAMPLE_RATES = {
+    "question-list": 0.1,
+    "question-trending": 0.1,
+    "question-detail": 0.1,
+    "answer-detail": 0.1,
+    "answer-search": 0.1,
+    "user-answers": 0.1,
+    "answer-stream": 0.1,
+    "health": 0.01,
+    "ready": 0.01,
+    "metrics": 0.01,
+}
 
-LOGGING = {
+LOGGING: Dict[str, Any] = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
@@ -165,6 +391,17 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "api_qa.log.JsonFormatter",
+        },
+    },
+    "filters": {
+        "request_context": {
+            "()": "api_qa.log.RequestContextFilter",
+        },
+        "sampling": {
+            "()": "api_qa.log.SamplingFilter",
+        },
     },
     "handlers": {
         "console": {
@@ -172,14 +409,24 @@ LOGGING = {
             "formatter": "simple",
         },
         "file": {
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.WatchedFileHandler",
             "filename": LOG_DIR / "api-qa.log",
-            "formatter": "verbose",
+            "encoding": "utf-8",
+            # Файл открывается при первой записи, а не при django.setup().
+            "delay": True,
+            "formatter": "json",
+        },
+        # Имя должно идти после console и file: dictConfig создает
+        # обработчики в алфавитном порядке, а этот ссылается на них.
+        "queue": {
+            "()": "api_qa.log.BackgroundQueueHandler",
+            "handlers": ["cfg://handlers.console", "cfg://handlers.file"],
+            "filters": ["request_context", "sampling"],
         },
     },
     "loggers": {
         "api_qa": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
@@ -190,3 +437,9 @@ LOGGING = {
         },
     },
 }
+
+if "test" in sys.argv:
+    # Тесты не пишут JSON лог в рабочее дерево.
+    LOGGING["handlers"]["file"] = {"class": "logging.NullHandler"}
+else:
+    LOG_DIR.mkdir(exist_ok=True)